@@ -1,17 +1,123 @@
 import os
+import time
+import asyncio
 import httpx
 import logging
-from typing import Optional, List, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, TYPE_CHECKING
 from datetime import datetime
 
-from app.models.linear import LinearProject, LinearIssue
+from app.models.linear import LinearProject, LinearIssue, BulkProjectUpdateItem, BulkProjectUpdateResult
+from app.utils.bulkhead import linear_call_slot
+from app.utils.deadline import DeadlineExceeded, check_deadline, remaining
+from app.utils.history import trace_var
+from app.utils.metrics import metrics
+from app.utils.state import consume_budget, get_state_backend
+
+if TYPE_CHECKING:
+    from app.clients.registry import Workspace
 
 logger = logging.getLogger(__name__)
 
+# Id of the placeholder issue create_or_update_issue returns when Linear fails
+MOCK_ISSUE_ID = "mock-issue-id"
+
+# Project fields selected by every project query and mutation
+_PROJECT_FIELDS = "id name description state createdAt updatedAt targetDate progress"
+
+def _project_update_input(state: Optional[str], progress: Optional[float], description: Optional[str]) -> Dict[str, Any]:
+    """Build a ProjectUpdateInput, only including non-None values"""
+    input_vars = {}
+    if state is not None:
+        input_vars["state"] = state
+    if progress is not None:
+        input_vars["progress"] = progress
+    if description is not None:
+        input_vars["description"] = description
+    return input_vars
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp as returned by Linear"""
+    if not value:
+        return None
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+def project_from_node(node: Dict[str, Any]) -> LinearProject:
+    """Build a LinearProject from a Linear GraphQL or webhook project node"""
+    return LinearProject(
+        id=node["id"],
+        name=node["name"],
+        description=node.get("description"),
+        state=node["state"],
+        created_at=_parse_datetime(node["createdAt"]),
+        updated_at=_parse_datetime(node["updatedAt"]),
+        target_date=_parse_datetime(node.get("targetDate")),
+        progress=node.get("progress")
+    )
+
+def issue_from_node(node: Dict[str, Any]) -> LinearIssue:
+    """
+    Build a LinearIssue from a Linear GraphQL or webhook issue node
+
+    GraphQL nodes nest the project and assignee as objects, while webhook
+    payloads carry flat projectId/assigneeId fields; both shapes are accepted.
+    """
+    state = node.get("state") or {}
+    project = node.get("project") or {}
+    assignee = node.get("assignee") or {}
+    return LinearIssue(
+        id=node["id"],
+        identifier=node.get("identifier"),
+        title=node["title"],
+        description=node.get("description"),
+        state=state.get("name") if isinstance(state, dict) else state,
+        state_type=state.get("type") if isinstance(state, dict) else None,
+        project_id=project.get("id") or node.get("projectId"),
+        assignee_id=assignee.get("id") or node.get("assigneeId"),
+        created_at=_parse_datetime(node["createdAt"]),
+        updated_at=_parse_datetime(node["updatedAt"])
+    )
+
+# Process-wide pooled client, opened by the application lifespan
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+def open_shared_http_client() -> httpx.AsyncClient:
+    """Create the pooled httpx client shared by every LinearClient in this process"""
+    global _shared_http_client
+    if _shared_http_client is None:
+        connections = int(os.getenv("LINEAR_MAX_CONNECTIONS", "20"))
+        _shared_http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+        )
+    return _shared_http_client
+
+def shared_http_client() -> Optional[httpx.AsyncClient]:
+    """Return the shared httpx client, or None if the lifespan has not opened one"""
+    return _shared_http_client
+
+async def close_shared_http_client() -> None:
+    """Close the shared httpx client and its pooled connections"""
+    global _shared_http_client
+    if _shared_http_client is not None:
+        client, _shared_http_client = _shared_http_client, None
+        await client.aclose()
+
 class LinearClient:
-    def __init__(self):
-        self.api_key = os.getenv("LINEAR_API_KEY")
-        self.api_url = os.getenv("LINEAR_API_URL", "https://api.linear.app/graphql")
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        workspace: Optional["Workspace"] = None
+    ):
+        # A shared client reuses pooled connections across calls; without one
+        # every query opens (and closes) its own connection
+        self.http_client = http_client
+        # Set for clients handed out by the workspace registry, which tracks
+        # their rate budget and request stats
+        self.workspace = workspace
+        self.api_key = api_key or os.getenv("LINEAR_API_KEY")
+        self.api_url = api_url or os.getenv("LINEAR_API_URL", "https://api.linear.app/graphql")
         if not self.api_key:
             raise ValueError("LINEAR_API_KEY environment variable is not set")
         
@@ -20,29 +126,152 @@ class LinearClient:
             "Content-Type": "application/json",
         }
 
-    async def _execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute a GraphQL query against the Linear API"""
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.api_url,
-                    headers=self.headers,
-                    json={"query": query, "variables": variables or {}}
-                )
-                response.raise_for_status()
-                result = response.json()
-                
-                # Check for GraphQL errors
-                if "errors" in result:
-                    error_msg = "; ".join([error.get("message", "Unknown error") for error in result["errors"]])
-                    logger.error(f"GraphQL Error: {error_msg}")
-                    raise ValueError(error_msg)
-                
-                return result
-            except httpx.HTTPError as e:
-                logger.error(f"HTTP Error: {str(e)}")
-                logger.error(f"Response content: {e.response.content if hasattr(e, 'response') else 'No response content'}")
-                raise
+    @asynccontextmanager
+    async def _client(self) -> AsyncIterator[httpx.AsyncClient]:
+        if self.http_client is not None:
+            yield self.http_client
+        else:
+            async with httpx.AsyncClient() as client:
+                yield client
+
+    def _timeout(self) -> httpx.Timeout:
+        """Per-phase timeouts from LINEAR_*_TIMEOUT_SECONDS, shrunk to fit the request deadline"""
+        connect = float(os.getenv("LINEAR_CONNECT_TIMEOUT_SECONDS", "5"))
+        read = float(os.getenv("LINEAR_READ_TIMEOUT_SECONDS", "10"))
+        pool = float(os.getenv("LINEAR_POOL_TIMEOUT_SECONDS", "5"))
+        left = remaining()
+        if left is not None:
+            connect, read, pool = min(connect, left), min(read, left), min(pool, left)
+        return httpx.Timeout(read, connect=connect, read=read, write=read, pool=pool)
+
+    async def _take_budget(self) -> None:
+        """
+        Take one request from the Linear request budget shared by every worker
+
+        LINEAR_REQUEST_BUDGET requests (0, the default, disables the budget)
+        are allowed per LINEAR_REQUEST_BUDGET_WINDOW_SECONDS (default 3600)
+        for each workspace, counted in the shared state backend. Once the
+        window is used up the request waits for the next one, unless that is
+        past the request deadline.
+
+        Raises:
+            DeadlineExceeded: If the budget only frees up after the deadline
+        """
+        limit = int(os.getenv("LINEAR_REQUEST_BUDGET", "0"))
+        if limit <= 0:
+            return
+        window = float(os.getenv("LINEAR_REQUEST_BUDGET_WINDOW_SECONDS", "3600"))
+        name = f"linear:{self.workspace.name if self.workspace is not None else 'default'}"
+        while not consume_budget(get_state_backend(), name, limit, window):
+            metrics.incr("linear_budget_exhausted_total")
+            wait = window - time.time() % window
+            left = remaining()
+            if left is not None and wait > left:
+                raise DeadlineExceeded("Request deadline exceeded waiting for the Linear request budget")
+            await asyncio.sleep(wait)
+
+    async def warm_up(self) -> None:
+        """Open a connection to Linear (DNS, TCP and TLS) ahead of the first real query"""
+        await self._execute_query("query { viewer { id } }")
+
+    async def _execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None, raise_on_errors: bool = True) -> Dict[str, Any]:
+        """
+        Execute a GraphQL query against the Linear API
+
+        With raise_on_errors=False, GraphQL errors are returned alongside any
+        partial data instead of raising, so batched mutations can report
+        failures per alias.
+
+        Connection failures, and for read-only queries timeouts and 429/5xx
+        responses, are retried up to LINEAR_MAX_RETRIES times with backoff.
+        The whole call, retries included, is bounded by the request deadline
+        (app.utils.deadline); running out raises DeadlineExceeded. Every
+        attempt takes a unit of the shared request budget (_take_budget).
+        Requests made for a webhook delivery also wait for a Linear call slot of the
+        delivery's bulkhead (app.utils.bulkhead), and requests of a registry
+        client for its workspace's rate budget (app.clients.registry).
+
+        The outcome is counted on the delivery's event trace, if any
+        (app.utils.history), so the event history reflects what Linear
+        actually answered rather than what the handler reported.
+        """
+        is_mutation = query.lstrip().startswith("mutation")
+        trace = trace_var.get()
+        try:
+            result = await self._send_query(query, variables, raise_on_errors, is_mutation)
+        except Exception:
+            if trace is not None:
+                trace.count_linear_call(is_mutation, failed=True)
+            raise
+        if trace is not None:
+            trace.count_linear_call(is_mutation, failed="errors" in result)
+        return result
+
+    async def _send_query(self, query: str, variables: Optional[Dict[str, Any]], raise_on_errors: bool, is_mutation: bool) -> Dict[str, Any]:
+        """Send a query to Linear, retrying as described in _execute_query"""
+        max_retries = int(os.getenv("LINEAR_MAX_RETRIES", "2"))
+        attempt = 0
+        async with self._client() as client:
+            while True:
+                try:
+                    check_deadline()
+                    await self._take_budget()
+                    # Wait for rate tokens before taking a bulkhead Linear slot,
+                    # so a throttled workspace does not hold slots while it sleeps
+                    if self.workspace is not None:
+                        await self.workspace.before_request()
+                    async with linear_call_slot():
+                        metrics.incr("linear_requests_total")
+                        left = remaining()
+                        request = client.post(
+                            self.api_url,
+                            headers=self.headers,
+                            json={"query": query, "variables": variables or {}},
+                            timeout=self._timeout()
+                        )
+                        response = None
+                        started = time.perf_counter()
+                        try:
+                            response = await (request if left is None else asyncio.wait_for(request, left))
+                        except asyncio.TimeoutError:
+                            raise DeadlineExceeded("Request deadline exceeded waiting for Linear")
+                        finally:
+                            if self.workspace is not None:
+                                self.workspace.observe(time.perf_counter() - started, response.status_code if response is not None else None)
+                    response.raise_for_status()
+                    result = response.json()
+
+                    # Check for GraphQL errors
+                    if "errors" in result and raise_on_errors:
+                        error_msg = "; ".join([error.get("message", "Unknown error") for error in result["errors"]])
+                        logger.error("GraphQL Error: %s", error_msg)
+                        raise ValueError(error_msg)
+
+                    return result
+                except DeadlineExceeded:
+                    metrics.incr("linear_deadline_exceeded_total")
+                    raise
+                except httpx.HTTPError as e:
+                    status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                    # A request that never reached Linear is always safe to resend
+                    retryable = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)) or (
+                        not is_mutation and (isinstance(e, httpx.TimeoutException) or status in (429, 502, 503, 504))
+                    )
+                    delay = 0.1 * 2 ** attempt
+                    left = remaining()
+                    if retryable and attempt < max_retries and (left is None or left > delay):
+                        attempt += 1
+                        metrics.incr("linear_retries_total")
+                        logger.warning("Retrying Linear request after %s (status %s), attempt %d", type(e).__name__, status, attempt)
+                        await asyncio.sleep(delay)
+                        continue
+                    if left is not None and left <= 0:
+                        metrics.incr("linear_deadline_exceeded_total")
+                        raise DeadlineExceeded("Request deadline exceeded waiting for Linear") from e
+                    metrics.incr("linear_errors_total")
+                    # Only the status is logged; Linear error bodies can be large and echo request data
+                    logger.error("HTTP Error: %s (status %s)", type(e).__name__, status)
+                    raise
 
     async def get_projects(self) -> List[LinearProject]:
         """Fetch all projects from Linear"""
@@ -64,21 +293,7 @@ class LinearClient:
         """
         
         result = await self._execute_query(query)
-        projects = []
-        for node in result["data"]["projects"]["nodes"]:
-            projects.append(
-                LinearProject(
-                    id=node["id"],
-                    name=node["name"],
-                    description=node["description"],
-                    state=node["state"],
-                    created_at=datetime.fromisoformat(node["createdAt"].replace("Z", "+00:00")),
-                    updated_at=datetime.fromisoformat(node["updatedAt"].replace("Z", "+00:00")),
-                    target_date=datetime.fromisoformat(node["targetDate"].replace("Z", "+00:00")) if node["targetDate"] else None,
-                    progress=node["progress"]
-                )
-            )
-        return projects
+        return [project_from_node(node) for node in result["data"]["projects"]["nodes"]]
 
     async def get_project(self, project_id: str) -> Optional[LinearProject]:
         """Fetch a specific project from Linear"""
@@ -102,16 +317,7 @@ class LinearClient:
         if not project_data:
             return None
             
-        return LinearProject(
-            id=project_data["id"],
-            name=project_data["name"],
-            description=project_data["description"],
-            state=project_data["state"],
-            created_at=datetime.fromisoformat(project_data["createdAt"].replace("Z", "+00:00")),
-            updated_at=datetime.fromisoformat(project_data["updatedAt"].replace("Z", "+00:00")),
-            target_date=datetime.fromisoformat(project_data["targetDate"].replace("Z", "+00:00")) if project_data["targetDate"] else None,
-            progress=project_data["progress"]
-        )
+        return project_from_node(project_data)
 
     async def update_project(self, project_id: str, state: str, progress: Optional[float] = None, description: Optional[str] = None) -> LinearProject:
         """Update a project's status in Linear"""
@@ -139,40 +345,96 @@ class LinearClient:
         }
         """
         
-        # Build input object, only including non-None values
-        input_vars = {}
-        if state is not None:
-            input_vars["state"] = state
-        if progress is not None:
-            input_vars["progress"] = progress
-        if description is not None:
-            input_vars["description"] = description
-        
         variables = {
             "projectId": project_id,
-            "input": input_vars
+            "input": _project_update_input(state, progress, description)
         }
         
         try:
             result = await self._execute_query(query, variables)
             project_data = result["data"]["projectUpdate"]["project"]
             
-            return LinearProject(
-                id=project_data["id"],
-                name=project_data["name"],
-                description=project_data["description"],
-                state=project_data["state"],
-                created_at=datetime.fromisoformat(project_data["createdAt"].replace("Z", "+00:00")),
-                updated_at=datetime.fromisoformat(project_data["updatedAt"].replace("Z", "+00:00")),
-                target_date=datetime.fromisoformat(project_data["targetDate"].replace("Z", "+00:00")) if project_data["targetDate"] else None,
-                progress=project_data["progress"]
-            )
+            return project_from_node(project_data)
         except Exception as e:
-            logger.error(f"Error updating project {project_id}: {str(e)}")
+            logger.error("Error updating project %s: %s", project_id, e)
             raise
 
-    async def create_or_update_issue(self, title: str, description: str, project_id: Optional[str] = None) -> LinearIssue:
-        """Create or update an issue in Linear"""
+    async def update_projects(
+        self,
+        updates: List[BulkProjectUpdateItem],
+        chunk_size: Optional[int] = None,
+        concurrency: Optional[int] = None
+    ) -> List[BulkProjectUpdateResult]:
+        """
+        Update many projects using aliased projectUpdate mutations
+
+        Updates are sent in chunks of chunk_size mutations per request, with at
+        most concurrency chunks in flight. Results are returned in input order;
+        a failure only affects its own item (or its chunk on transport errors).
+        """
+        chunk_size = chunk_size or int(os.getenv("LINEAR_BULK_CHUNK_SIZE", "10"))
+        concurrency = concurrency or int(os.getenv("LINEAR_BULK_CONCURRENCY", "4"))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_chunk(chunk: List[BulkProjectUpdateItem]) -> List[BulkProjectUpdateResult]:
+            async with semaphore:
+                return await self._update_projects_chunk(chunk)
+
+        chunks = [updates[i:i + chunk_size] for i in range(0, len(updates), chunk_size)]
+        chunk_results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        return [result for results in chunk_results for result in results]
+
+    async def _update_projects_chunk(self, chunk: List[BulkProjectUpdateItem]) -> List[BulkProjectUpdateResult]:
+        """Send one chunk of project updates as a single aliased mutation"""
+        declarations = []
+        selections = []
+        variables = {}
+        for index, item in enumerate(chunk):
+            declarations.append(f"$id{index}: String!, $input{index}: ProjectUpdateInput!")
+            selections.append(
+                f"u{index}: projectUpdate(id: $id{index}, input: $input{index}) "
+                f"{{ success project {{ {_PROJECT_FIELDS} }} }}"
+            )
+            variables[f"id{index}"] = item.project_id
+            variables[f"input{index}"] = _project_update_input(item.state, item.progress, item.description)
+        query = f"mutation BulkUpdateProjects({', '.join(declarations)}) {{ {' '.join(selections)} }}"
+
+        try:
+            result = await self._execute_query(query, variables, raise_on_errors=False)
+        except Exception as e:
+            logger.error("Error updating project chunk of %d: %s", len(chunk), e)
+            return [BulkProjectUpdateResult(project_id=item.project_id, success=False, error=str(e)) for item in chunk]
+
+        # Map GraphQL errors back to the alias they belong to; errors without
+        # a path apply to every alias that returned no data
+        alias_errors: Dict[str, str] = {}
+        general_errors = []
+        for error in result.get("errors", []):
+            path = error.get("path") or []
+            message = error.get("message", "Unknown error")
+            if path:
+                alias_errors[str(path[0])] = message
+            else:
+                general_errors.append(message)
+
+        data = result.get("data") or {}
+        results = []
+        for index, item in enumerate(chunk):
+            alias = f"u{index}"
+            node = data.get(alias) or {}
+            if node.get("project"):
+                results.append(BulkProjectUpdateResult(
+                    project_id=item.project_id,
+                    success=True,
+                    data=project_from_node(node["project"])
+                ))
+            else:
+                error = alias_errors.get(alias) or "; ".join(general_errors) or "Update was not applied"
+                results.append(BulkProjectUpdateResult(project_id=item.project_id, success=False, error=error))
+        return results
+
+    async def create_or_update_issue(self, title: str, description: str, project_id: Optional[str] = None, team_id: Optional[str] = None) -> LinearIssue:
+        """Create or update an issue in Linear, in team_id or LINEAR_TEAM_ID"""
         query = """
         mutation IssueCreate(
             $title: String!
@@ -191,10 +453,12 @@ class LinearClient:
                 success
                 issue {
                     id
+                    identifier
                     title
                     description
                     state {
                         name
+                        type
                     }
                     project {
                         id
@@ -209,14 +473,14 @@ class LinearClient:
         }
         """
         
-        # For now, we'll use a default team ID (you'll need to get this from Linear)
+        # Routes usually supply the team; LINEAR_TEAM_ID is the fallback
         # You can get team IDs by querying: query { teams { nodes { id name } } }
-        default_team_id = "team_default"  # This needs to be replaced with actual team ID
+        default_team_id = (self.workspace.team_id if self.workspace is not None else None) or os.getenv("LINEAR_TEAM_ID", "team_default")
         
         variables = {
             "title": title,
             "description": description,
-            "teamId": default_team_id,
+            "teamId": team_id or default_team_id,
             "projectId": project_id
         }
         
@@ -224,21 +488,14 @@ class LinearClient:
             result = await self._execute_query(query, variables)
             issue_data = result["data"]["issueCreate"]["issue"]
             
-            return LinearIssue(
-                id=issue_data["id"],
-                title=issue_data["title"],
-                description=issue_data["description"],
-                state=issue_data["state"]["name"],
-                project_id=issue_data["project"]["id"] if issue_data["project"] else None,
-                assignee_id=issue_data["assignee"]["id"] if issue_data["assignee"] else None,
-                created_at=datetime.fromisoformat(issue_data["createdAt"].replace("Z", "+00:00")),
-                updated_at=datetime.fromisoformat(issue_data["updatedAt"].replace("Z", "+00:00"))
-            )
+            return issue_from_node(issue_data)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             # For demo purposes, return a mock issue when Linear API fails
-            logger.warning(f"Linear API call failed, returning mock issue: {str(e)}")
+            logger.warning("Linear API call failed, returning mock issue: %s", e)
             return LinearIssue(
-                id="mock-issue-id",
+                id=MOCK_ISSUE_ID,
                 title=title,
                 description=description,
                 state="todo",
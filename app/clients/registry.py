@@ -0,0 +1,316 @@
+import os
+import re
+import json
+import time
+import asyncio
+import fnmatch
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Pattern, Tuple
+
+import httpx
+
+from app.clients.linear import LinearClient, shared_http_client
+from app.utils.cache import LinearCache, linear_cache
+from app.utils.deadline import DeadlineExceeded, remaining
+from app.utils.github import WebhookVerifier
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKSPACE = "default"
+
+class RateBudget:
+    """
+    Token bucket for one workspace's Linear requests
+
+    Refills at per_hour / 3600 tokens a second and holds up to a minute's
+    worth. A request that finds the bucket empty reserves the next token and
+    sleeps until it is due, unless that is past the request deadline, in
+    which case it fails at once with DeadlineExceeded.
+    """
+
+    def __init__(self, per_hour: float):
+        self.rate = per_hour / 3600
+        self.capacity = max(1.0, per_hour / 60)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self) -> float:
+        """Take a token, waiting for it if needed; returns the seconds waited"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        wait = (1 - self.tokens) / self.rate
+        left = remaining()
+        if left is not None and wait > left:
+            raise DeadlineExceeded("Request deadline exceeded waiting for the workspace's Linear rate budget")
+        self.tokens -= 1
+        await asyncio.sleep(wait)
+        return wait
+
+class WorkspaceStats:
+    """Request counts, recent throughput and latency of one workspace's Linear calls"""
+
+    # Seconds of history behind requests_per_second
+    WINDOW = 60.0
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self.budget_waits = 0
+        self._latencies: Deque[float] = deque(maxlen=1024)
+        self._times: Deque[float] = deque(maxlen=100000)
+
+    def observe(self, seconds: float, status: Optional[int]) -> None:
+        """Record one request to Linear and its HTTP status (None if it never got a response)"""
+        self.requests += 1
+        self._latencies.append(seconds)
+        self._times.append(time.monotonic())
+        metrics.incr(f"linear_workspace_{self.name}_requests_total")
+        if status is None or status >= 400:
+            self.errors += 1
+            metrics.incr(f"linear_workspace_{self.name}_errors_total")
+        if status == 429:
+            self.throttled += 1
+            metrics.incr(f"linear_workspace_{self.name}_throttled_total")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters, requests per second over the last WINDOW seconds and latency percentiles"""
+        cutoff = time.monotonic() - self.WINDOW
+        while self._times and self._times[0] < cutoff:
+            self._times.popleft()
+        latencies = sorted(self._latencies)
+
+        def percentile(fraction: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * fraction))] * 1000, 2)
+
+        return {
+            "requests_total": self.requests,
+            "errors_total": self.errors,
+            "throttled_total": self.throttled,
+            "budget_waits_total": self.budget_waits,
+            "requests_per_second": round(len(self._times) / self.WINDOW, 3),
+            "latency_ms": {"p50": percentile(0.5), "p95": percentile(0.95), "p99": percentile(0.99)}
+        }
+
+class Workspace:
+    """
+    One Linear workspace: its API key, connection pool, cache partition and rate budget
+
+    The default workspace is configured from LINEAR_API_KEY / LINEAR_API_URL /
+    LINEAR_TEAM_ID, uses the process-wide connection pool opened by the
+    lifespan and the shared linear_cache. Every other workspace gets its own
+    pool of max_connections connections and its own cache namespace, so a busy
+    tenant can neither starve another's connections nor evict its cache.
+    A workspace with webhook_secrets verifies its GitHub deliveries against
+    those alone, and one with a linear_webhook_secret its Linear webhooks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        api_key: Optional[str] = None,
+        api_url: Optional[str] = None,
+        team_id: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        rate_limit_per_hour: Optional[float] = None,
+        cache: Optional[LinearCache] = None,
+        webhook_secrets: Optional[List[str]] = None,
+        linear_webhook_secret: Optional[str] = None
+    ):
+        self.name = name
+        self.api_key = api_key
+        self.api_url = api_url
+        self.team_id = team_id
+        self.max_connections = max_connections or int(os.getenv("LINEAR_MAX_CONNECTIONS", "20"))
+        if rate_limit_per_hour is None:
+            rate_limit_per_hour = float(os.getenv("LINEAR_RATE_LIMIT_PER_HOUR", "0"))
+        self.budget = RateBudget(rate_limit_per_hour) if rate_limit_per_hour > 0 else None
+        # Tenant keys live outside the default "linear:" namespace, so a tenant
+        # named e.g. "issue" cannot share keys with the default cache
+        self.cache = cache or LinearCache(namespace=f"ws:{name}")
+        self.stats = WorkspaceStats(name)
+        self._verifier = WebhookVerifier(secrets=webhook_secrets) if webhook_secrets else None
+        self.linear_webhook_secret = linear_webhook_secret
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def is_default(self) -> bool:
+        return self.name == DEFAULT_WORKSPACE
+
+    def http_client(self) -> Optional[httpx.AsyncClient]:
+        """This workspace's connection pool, opened on first use"""
+        if self.is_default:
+            return shared_http_client()
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+            )
+        return self._http_client
+
+    def verifier(self) -> Optional[WebhookVerifier]:
+        """Verifier for this workspace's own GitHub webhook secrets, if it has any"""
+        return self._verifier
+
+    def client(self) -> LinearClient:
+        """A LinearClient bound to this workspace"""
+        return LinearClient(http_client=self.http_client(), api_key=self.api_key, api_url=self.api_url, workspace=self)
+
+    async def before_request(self) -> None:
+        """Wait for the workspace's rate budget before a request to Linear"""
+        if self.budget is not None and await self.budget.acquire():
+            self.stats.budget_waits += 1
+
+    def observe(self, seconds: float, status: Optional[int]) -> None:
+        """Record the outcome of a request to Linear"""
+        self.stats.observe(seconds, status)
+
+    async def close(self) -> None:
+        """Close this workspace's own connection pool"""
+        if self._http_client is not None:
+            client, self._http_client = self._http_client, None
+            await client.aclose()
+
+class WorkspaceRegistry:
+    """
+    Linear workspaces served by this deployment, and how events map to them
+
+    LINEAR_WORKSPACES_FILE names a JSON file {"workspaces": [...]} (a bare list
+    is accepted too) where each workspace has a name and may set api_key (or
+    api_key_env, the name of an environment variable holding it), api_url,
+    team_id, max_connections, rate_limit_per_hour, repositories (exact names
+    or globs such as org/*), webhook_secrets (GitHub webhook secrets of that
+    tenant's webhooks, which point at /api/github/webhook?workspace=<name>)
+    and linear_webhook_secret (signing secret of the tenant's Linear webhook,
+    which points at /api/linear/webhook?workspace=<name>).
+
+    A GitHub delivery belongs to the workspace named in its URL, else to the
+    first workspace with a matching repository, else to the default
+    workspace. The file is read once at startup.
+    """
+
+    def __init__(self, workspaces_file: Optional[str] = None, workspaces: Optional[List[Dict[str, Any]]] = None):
+        self.workspaces_file = workspaces_file
+        self.default = Workspace(
+            DEFAULT_WORKSPACE,
+            team_id=os.getenv("LINEAR_TEAM_ID") or None,
+            cache=linear_cache
+        )
+        self._by_name: Dict[str, Workspace] = {DEFAULT_WORKSPACE: self.default}
+        self._exact_repositories: Dict[str, Workspace] = {}
+        self._repository_globs: List[Tuple[Pattern, Workspace]] = []
+        if workspaces is None and workspaces_file:
+            workspaces = self._read(workspaces_file)
+        for spec in workspaces or []:
+            try:
+                self._add(spec)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error("Skipping Linear workspace %s: %s", spec.get("name") if isinstance(spec, dict) else spec, e)
+
+    @classmethod
+    def from_env(cls) -> "WorkspaceRegistry":
+        """Build a registry from the file named by LINEAR_WORKSPACES_FILE, if any"""
+        return cls(workspaces_file=os.getenv("LINEAR_WORKSPACES_FILE") or None)
+
+    @staticmethod
+    def _read(workspaces_file: str) -> List[Dict[str, Any]]:
+        try:
+            with open(workspaces_file, encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error("Could not load Linear workspaces from %s: %s", workspaces_file, e)
+            return []
+        return config["workspaces"] if isinstance(config, dict) else config
+
+    def _add(self, spec: Dict[str, Any]) -> None:
+        name = spec["name"]
+        if not re.fullmatch(r"[A-Za-z0-9_]+", name) or name in self._by_name:
+            raise ValueError(f"Invalid or duplicate workspace name {name!r}")
+        api_key = spec.get("api_key") or (os.getenv(spec["api_key_env"]) if spec.get("api_key_env") else None)
+        if not api_key:
+            raise ValueError(f"Workspace {name} has no API key")
+        if not isinstance(spec.get("webhook_secrets", []), list):
+            raise ValueError(f"Workspace {name} webhook_secrets must be a list")
+        workspace = Workspace(
+            name,
+            api_key=api_key,
+            api_url=spec.get("api_url"),
+            team_id=spec.get("team_id"),
+            max_connections=spec.get("max_connections"),
+            rate_limit_per_hour=spec.get("rate_limit_per_hour"),
+            webhook_secrets=spec.get("webhook_secrets"),
+            linear_webhook_secret=spec.get("linear_webhook_secret")
+        )
+        self._by_name[name] = workspace
+        for repository in spec.get("repositories", []):
+            if any(c in repository for c in "*?["):
+                self._repository_globs.append((re.compile(fnmatch.translate(repository)), workspace))
+            else:
+                self._exact_repositories.setdefault(repository, workspace)
+
+    def __len__(self) -> int:
+        return len(self._by_name)
+
+    def get(self, name: str) -> Optional[Workspace]:
+        """Look up a workspace by name"""
+        return self._by_name.get(name)
+
+    def for_repository(self, repository: Optional[str]) -> Optional[Workspace]:
+        """The workspace configured for a repository, if any"""
+        if not repository:
+            return None
+        workspace = self._exact_repositories.get(repository)
+        if workspace is not None:
+            return workspace
+        for pattern, workspace in self._repository_globs:
+            if pattern.match(repository):
+                return workspace
+        return None
+
+    def resolve(self, repository: Optional[str] = None) -> Workspace:
+        """
+        Pick the workspace for a GitHub delivery that does not name one
+
+        Args:
+            repository: Repository full name from the payload
+
+        Returns:
+            Workspace: The repository's workspace, else the default
+        """
+        return self.for_repository(repository) or self.default
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Throughput and latency of every workspace"""
+        return {name: workspace.stats.snapshot() for name, workspace in self._by_name.items()}
+
+    async def close(self) -> None:
+        """Close every workspace's own connection pool"""
+        for workspace in self._by_name.values():
+            await workspace.close()
+
+_registry: Optional[WorkspaceRegistry] = None
+
+def get_workspace_registry() -> WorkspaceRegistry:
+    """Return the process-wide workspace registry, building it on first use"""
+    global _registry
+    if _registry is None:
+        _registry = WorkspaceRegistry.from_env()
+    return _registry
+
+async def close_workspace_registry() -> None:
+    """Close the connection pools of the process-wide registry, if it was built"""
+    if _registry is not None:
+        await _registry.close()
+
+def cache_for(client: LinearClient) -> LinearCache:
+    """The cache partition of the workspace a client is bound to"""
+    workspace = getattr(client, "workspace", None)
+    return workspace.cache if workspace is not None else linear_cache
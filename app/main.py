@@ -1,29 +1,50 @@
-from fastapi import FastAPI, HTTPException, Depends, Header
+# Imported first so startup timing covers the rest of the application import
+from app.utils.startup import startup, warm_up
+
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager, suppress
 from dotenv import load_dotenv
 import os
+import asyncio
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=os.getenv("LOG_LEVEL", "INFO"),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-logger = logging.getLogger(__name__)
+from app.clients.linear import open_shared_http_client, close_shared_http_client
+from app.clients.registry import close_workspace_registry
+from app.utils.offload import shutdown_offload_pool
+from app.utils.log import configure_logging, RequestContextMiddleware
+from app.utils.metrics import metrics
 
 # Load environment variables
 load_dotenv()
 
-# Debug: Print environment variables (without sensitive values)
-logger.info("Environment variables loaded:")
-logger.info(f"LINEAR_API_KEY set: {'Yes' if os.getenv('LINEAR_API_KEY') else 'No'}")
-logger.info(f"LINEAR_API_URL set: {'Yes' if os.getenv('LINEAR_API_URL') else 'No'}")
-logger.info(f"GITHUB_WEBHOOK_SECRET set: {'Yes' if os.getenv('GITHUB_WEBHOOK_SECRET') else 'No'}")
+# Configure logging (queued, off the event loop; see app/utils/log.py)
+configure_logging()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources and warm up in the background; /ready reports when done"""
+    # Debug: Print environment variables (without sensitive values)
+    for name in ("LINEAR_API_KEY", "LINEAR_API_URL", "GITHUB_WEBHOOK_SECRET", "LINEAR_WEBHOOK_SECRET"):
+        logger.info("%s set: %s", name, "Yes" if os.getenv(name) else "No")
+    open_shared_http_client()
+    warmup_task = asyncio.create_task(warm_up())
+    yield
+    # Let a warm-up still in flight unwind before the clients it uses are closed
+    warmup_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await warmup_task
+    await close_shared_http_client()
+    await close_workspace_registry()
+    shutdown_offload_pool()
 
 app = FastAPI(
     title="Launch Readiness Agent",
     description="API for synchronizing GitHub events with Linear projects",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -34,17 +55,34 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(RequestContextMiddleware)
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until the startup warm-up has finished, then startup timings"""
+    if not startup.ready:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **startup.as_dict()})
+    return {"status": "ready", **startup.as_dict()}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Process-local counters (Linear requests, retries, errors, deadline-exceeded, ...)"""
+    return metrics.snapshot()
+
 # Import and include routers
-from app.routers import github, linear
+from app.routers import admin, github, linear, linear_webhook
 
 app.include_router(github.router, prefix="/api/github", tags=["github"])
 app.include_router(linear.router, prefix="/api/linear", tags=["linear"])
+app.include_router(linear_webhook.router, prefix="/api/linear", tags=["linear"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
+
+startup.mark_imported()
 
 if __name__ == "__main__":
     import uvicorn
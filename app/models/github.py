@@ -50,6 +50,7 @@ class PullRequest(BaseModel):
     created_at: datetime
     updated_at: datetime
     merged_at: Optional[datetime]
+    html_url: Optional[str] = None
     head: Dict[str, Any]
     base: Dict[str, Any]
 
@@ -0,0 +1,24 @@
+from pydantic import BaseModel
+from typing import Optional, List, Dict
+from datetime import datetime
+
+class ProcessedEvent(BaseModel):
+    """A webhook delivery recorded in the event history"""
+    delivery_id: Optional[str] = None
+    event_type: str
+    repository: Optional[str] = None
+    issue_keys: List[str]
+    outcome: str
+    status_code: int
+    linear_updates: int
+    linear_failures: int
+    received_at: datetime
+    timings_ms: Dict[str, float]
+
+class EventHistoryResponse(BaseModel):
+    """Response model for event history queries"""
+    success: bool
+    message: str
+    size: int
+    capacity: int
+    data: List[ProcessedEvent]
@@ -26,9 +26,11 @@ class LinearProject(BaseModel):
 class LinearIssue(BaseModel):
     """Model representing a Linear issue"""
     id: str
+    identifier: Optional[str] = None  # Human-readable key, e.g. ABC-123
     title: str
     description: Optional[str] = None
     state: str
+    state_type: Optional[str] = None  # Workflow state category, e.g. started, completed
     project_id: Optional[str] = None
     assignee_id: Optional[str] = None
     created_at: datetime
@@ -40,6 +42,21 @@ class ProjectUpdateRequest(BaseModel):
     progress: Optional[float] = Field(None, ge=0, le=100)
     description: Optional[str] = None
 
+class BulkProjectUpdateItem(ProjectUpdateRequest):
+    """A single project update within a bulk request"""
+    project_id: str
+
+class BulkProjectUpdateRequest(BaseModel):
+    """Request model for updating many projects at once"""
+    updates: List[BulkProjectUpdateItem] = Field(..., min_length=1, max_length=500)
+
+class BulkProjectUpdateResult(BaseModel):
+    """Outcome of a single update within a bulk request"""
+    project_id: str
+    success: bool
+    error: Optional[str] = None
+    data: Optional[LinearProject] = None
+
 class ProjectResponse(BaseModel):
     """Response model for project operations"""
     success: bool
@@ -50,4 +67,10 @@ class ProjectListResponse(BaseModel):
     """Response model for listing projects"""
     success: bool
     message: str
-    data: List[LinearProject] 
\ No newline at end of file
+    data: List[LinearProject] 
+
+class BulkProjectUpdateResponse(BaseModel):
+    """Response model for bulk project updates"""
+    success: bool
+    message: str
+    data: List[BulkProjectUpdateResult]
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class BranchCIStatus(BaseModel):
+    """Latest CI result for one branch, in Linear project status terms"""
+    branch: str
+    status: str
+    progress: Optional[float] = None
+    head_sha: Optional[str] = None
+    updated_at: datetime
+
+class ProjectReadiness(BaseModel):
+    """Launch readiness rollup for a Linear project"""
+    project_id: str
+    ready: bool
+    blockers: List[str]
+    open_issues: int
+    open_pull_requests: int
+    merged_pull_requests: int
+    ci: List[BranchCIStatus]
+    updated_at: datetime
+
+class ReadinessResponse(BaseModel):
+    """Response model for project readiness"""
+    success: bool
+    message: str
+    data: Optional[ProjectReadiness] = None
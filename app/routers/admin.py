@@ -0,0 +1,59 @@
+from fastapi import APIRouter, HTTPException, Header, Depends, Query
+import os
+import hmac
+from datetime import datetime
+from typing import Optional
+
+from app.clients.registry import get_workspace_registry
+from app.models.history import EventHistoryResponse
+from app.utils.history import OUTCOMES, get_event_history
+
+router = APIRouter()
+
+async def require_admin_token(authorization: Optional[str] = Header(None, description="Bearer <ADMIN_API_TOKEN>")):
+    """Dependency that checks the admin bearer token; the admin API is off unless ADMIN_API_TOKEN is set"""
+    token = os.getenv("ADMIN_API_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    scheme, _, supplied = (authorization or "").partition(" ")
+    if scheme.lower() != "bearer" or not hmac.compare_digest(supplied.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token", headers={"WWW-Authenticate": "Bearer"})
+
+@router.get("/events", response_model=EventHistoryResponse, dependencies=[Depends(require_admin_token)])
+async def list_events(
+    delivery_id: Optional[str] = Query(None, description="X-GitHub-Delivery id"),
+    event_type: Optional[str] = Query(None, description="X-GitHub-Event type"),
+    repository: Optional[str] = Query(None, description="Repository full name (owner/name)"),
+    issue_key: Optional[str] = Query(None, description="Linear issue key mentioned by the event"),
+    outcome: Optional[str] = Query(None, description=f"One of: {', '.join(OUTCOMES)}"),
+    since: Optional[datetime] = Query(None, description="Only deliveries received at or after this time"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """List recently processed GitHub deliveries held by this worker, newest first"""
+    if outcome and outcome not in OUTCOMES:
+        raise HTTPException(status_code=400, detail=f"Unknown outcome {outcome}")
+    history = get_event_history()
+    events = history.query(
+        delivery_id=delivery_id,
+        event_type=event_type,
+        repository=repository,
+        issue_key=issue_key,
+        outcome=outcome,
+        since=since,
+        limit=limit
+    )
+    message = f"{len(events)} events found"
+    if not delivery_id and len(events) < limit and history.size > history.scan_limit:
+        message += f" in the newest {history.scan_limit} entries"
+    return EventHistoryResponse(
+        success=True,
+        message=message,
+        size=history.size,
+        capacity=history.capacity,
+        data=events
+    )
+
+@router.get("/workspaces", dependencies=[Depends(require_admin_token)])
+async def workspace_stats():
+    """Linear request throughput, errors and latency per workspace, for this worker"""
+    return get_workspace_registry().stats()
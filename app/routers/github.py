@@ -1,26 +1,56 @@
-from fastapi import APIRouter, HTTPException, Header, Request, Depends, Body
+from fastapi import APIRouter, HTTPException, Header, Query, Request, Depends
+import os
 import logging
-import json
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Type, Union
 from pydantic import BaseModel
 
 from app.models.github import PushEvent, PullRequestEvent, WorkflowRunEvent
-from app.utils.github import verify_github_webhook, extract_linear_issue_id, parse_workflow_status
-from app.clients.linear import LinearClient
+from app.utils.github import get_webhook_verifier, extract_linear_issue_id
+from app.clients.linear import LinearClient, MOCK_ISSUE_ID
+from app.clients.registry import Workspace, cache_for, get_workspace_registry
+from app.utils.intake import read_webhook_body
+from app.utils.offload import EVENT_MODELS, parse_webhook_body
+from app.utils.state import get_state_backend
+from app.utils.readiness import readiness_tracker
+from app.utils.ci import ci_aggregator
+from app.utils.routing import get_project_router
+from app.utils.log import delivery_id_var
+from app.utils.deadline import DeadlineExceeded, deadline, budget
+from app.utils.metrics import metrics
+from app.utils.admission import AdmissionTicket, event_priority, get_admission_limiter
+from app.utils.bulkhead import bulkhead_var, get_bulkhead
+from app.utils.history import EventTrace, get_event_history, note_issue_key, repository_of, trace_var
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
-async def get_linear_client() -> LinearClient:
-    """Dependency to get Linear client instance"""
-    return LinearClient()
+async def get_webhook_workspace(
+    workspace: Optional[str] = Query(None, description="Linear workspace from LINEAR_WORKSPACES_FILE whose webhook this is")
+) -> Optional[Workspace]:
+    """Dependency to resolve the workspace named in a tenant's webhook URL, if any"""
+    if workspace is None:
+        return None
+    found = get_workspace_registry().get(workspace)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Unknown workspace {workspace}")
+    return found
 
-@router.post("/webhook")
+@router.post(
+    "/webhook",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "description": "GitHub webhook payload",
+            "content": {"application/json": {"schema": {"type": "object"}}}
+        }
+    }
+)
 async def github_webhook(
-    payload: Dict[str, Any] = Body(..., description="GitHub webhook payload"),
+    request: Request,
     x_hub_signature_256: str = Header(..., description="GitHub webhook signature (sha256=...)"),
     x_github_event: str = Header(..., description="GitHub event type (push, pull_request, workflow_run)"),
-    client: LinearClient = Depends(get_linear_client)
+    x_github_delivery: Optional[str] = Header(None, description="Unique delivery id, used to drop redeliveries"),
+    workspace: Optional[Workspace] = Depends(get_webhook_workspace)
 ):
     """
     Handle GitHub webhook events
@@ -31,53 +61,190 @@ async def github_webhook(
     - For pull requests: Updates Linear issues based on PR status
     - For workflow runs: Updates Linear issues based on workflow status
     
-    Note: For signature verification, we'll use a simplified approach for testing.
-    In production, you would verify the signature against the raw request body.
+    The raw body is streamed and hashed as it arrives and is only parsed once
+    the signature has been verified. Bodies larger than GITHUB_WEBHOOK_MAX_BYTES
+    are rejected with 413 as soon as the limit is crossed. A delivery id that
+    was already processed by any worker is acknowledged without reprocessing.
+
+    Each event type runs in its own bulkhead (concurrency limit, queue and
+    share of Linear calls), so a flood of one type cannot starve the others.
+    Deliveries are then admitted against an adaptive concurrency limit with
+    per-event priorities; when overloaded they are refused at once with 503
+    and Retry-After rather than left to time out.
+
+    A tenant's webhooks point at ?workspace=<name> and are verified against
+    that workspace's webhook_secrets only; other deliveries are verified
+    against the deployment's secrets and go to the workspace configured for
+    their repository, else to the default one.
+
+    The webhook deadline starts here, so time spent queued in the bulkhead
+    and reading the body counts against it along with the handler.
+
+    Every delivery, including refused ones, is recorded in the in-memory
+    event history served by /api/admin/events.
     """
+    delivery_id_var.set(x_github_delivery)
+    trace = EventTrace(x_github_delivery, x_github_event)
+    trace_var.set(trace)
+    try:
+        with deadline(budget("webhook")):
+            result = await run_in_bulkhead(request, x_hub_signature_256, x_github_event, x_github_delivery, workspace, trace)
+        trace.finish(200)
+        return result
+    except HTTPException as e:
+        trace.finish(e.status_code)
+        raise
+    except Exception:
+        trace.finish(500)
+        raise
+    finally:
+        if trace.status_code is None:
+            # The client went away before a response (nginx's 499)
+            trace.finish(499)
+        get_event_history().record(trace)
+
+async def run_in_bulkhead(
+    request: Request,
+    signature: str,
+    event_type: str,
+    delivery_id: Optional[str],
+    workspace: Optional[Workspace],
+    trace: EventTrace
+) -> Dict[str, Any]:
+    """Take the event type's bulkhead slot and an admission ticket, then process the delivery"""
+    bulkhead = get_bulkhead(event_type)
+    if not await bulkhead.acquire():
+        raise overloaded(bulkhead.retry_after())
+    bulkhead_var.set(bulkhead)
+    try:
+        limiter = get_admission_limiter()
+        ticket = limiter.try_acquire(event_priority(event_type))
+        if ticket is None:
+            raise overloaded(limiter.retry_after())
+        trace.mark("wait")
+        try:
+            return await process_webhook(request, signature, event_type, delivery_id, workspace, ticket, trace)
+        finally:
+            ticket.release()
+    finally:
+        bulkhead.release()
+
+def overloaded(retry_after: int) -> HTTPException:
+    """503 telling GitHub (or a load balancer) to come back later"""
+    return HTTPException(
+        status_code=503,
+        detail="Server is overloaded, retry later",
+        headers={"Retry-After": str(retry_after)}
+    )
+
+async def process_webhook(
+    request: Request,
+    signature: str,
+    event_type: str,
+    delivery_id: Optional[str],
+    workspace: Optional[Workspace],
+    ticket: AdmissionTicket,
+    trace: EventTrace
+) -> Dict[str, Any]:
+    """Authenticate, deduplicate and dispatch an admitted webhook delivery"""
+    verifier = workspace.verifier() if workspace is not None else None
+    body = await read_webhook_body(request, signature, verifier or get_webhook_verifier())
+    trace.mark("intake")
+    try:
+        parsed = await parse_webhook_body(event_type, body)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    finally:
+        body.close()
+    trace.repository = repository_of(parsed.payload)
+    # A client is only built for the resolved workspace, and only for events
+    # that reach Linear, so a deployment serving tenants alone needs no
+    # LINEAR_API_KEY for the default workspace
+    if workspace is None:
+        workspace = get_workspace_registry().resolve(repository=trace.repository)
+    client = workspace.client() if event_type in EVENT_MODELS else None
+    trace.mark("parse")
+
+    # The action is only known once the body is parsed; shed low-value events now
+    if not ticket.reprioritize(event_priority(event_type, parsed.action)):
+        raise overloaded(get_admission_limiter().retry_after())
     
-    # For testing purposes, we'll generate the signature from the payload
-    # In production, this would be done against the raw request body
-    payload_str = json.dumps(payload, separators=(',', ':'))
-    payload_bytes = payload_str.encode('utf-8')
-    
-    # Verify signature (simplified for testing)
-    if not verify_github_webhook(x_hub_signature_256, payload_bytes):
-        # Try with pretty formatting
-        payload_str_pretty = json.dumps(payload, indent=2)
-        payload_bytes_pretty = payload_str_pretty.encode('utf-8')
-        if not verify_github_webhook(x_hub_signature_256, payload_bytes_pretty):
-            raise HTTPException(status_code=401, detail="Invalid signature")
-    
+    dedup_key = f"github:delivery:{delivery_id}" if delivery_id else None
+    if dedup_key:
+        dedup_ttl = float(os.getenv("GITHUB_DELIVERY_DEDUP_SECONDS", "86400"))
+        if not get_state_backend().add(dedup_key, 1, ttl=dedup_ttl):
+            trace.outcome = "duplicate"
+            return {"message": "Duplicate delivery ignored", "delivery_id": delivery_id}
+
     try:
-        if x_github_event == "push":
-            return await handle_push_event(PushEvent(**payload), client)
-        elif x_github_event == "pull_request":
-            return await handle_pull_request_event(PullRequestEvent(**payload), client)
-        elif x_github_event == "workflow_run":
-            return await handle_workflow_run_event(WorkflowRunEvent(**payload), client)
-        else:
-            logger.warning(f"Unhandled GitHub event type: {x_github_event}")
-            return {"message": f"Event type {x_github_event} not handled"}
+        if parsed.error:
+            raise ValueError(parsed.error)
+        result = await dispatch_event(event_type, parsed.payload, client)
+        trace.mark("handle")
+        if dedup_key and (trace.linear_failures or "error" in result):
+            # Handlers answer 200 when Linear or the state backend fails; a
+            # redelivery should still retry the work
+            get_state_backend().delete(dedup_key)
+        return result
+    except DeadlineExceeded as e:
+        metrics.incr("webhook_deadline_exceeded_total")
+        logger.error("Webhook ran out of time: %s", e)
+        if dedup_key:
+            get_state_backend().delete(dedup_key)
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}")
+        logger.error("Error processing webhook: %s", e)
+        if dedup_key:
+            # Let GitHub's redelivery of a failed event through
+            get_state_backend().delete(dedup_key)
         raise HTTPException(status_code=500, detail=str(e))
 
+async def dispatch_event(event_type: str, payload: Union[Dict[str, Any], BaseModel], client: LinearClient) -> Dict[str, Any]:
+    """
+    Validate a GitHub event payload and run its handler
+
+    Shared by the webhook endpoint and offline replay, which feeds archived
+    deliveries through the same handlers without going over HTTP. Payloads
+    already validated in the parsing pool are passed through as models.
+    """
+    if event_type == "push":
+        return await handle_push_event(_as_event(PushEvent, payload), client)
+    elif event_type == "pull_request":
+        return await handle_pull_request_event(_as_event(PullRequestEvent, payload), client)
+    elif event_type == "workflow_run":
+        return await handle_workflow_run_event(_as_event(WorkflowRunEvent, payload), client)
+    else:
+        logger.warning("Unhandled GitHub event type: %s", event_type)
+        return {"message": f"Event type {event_type} not handled"}
+
+def _as_event(model: Type[BaseModel], payload: Union[Dict[str, Any], BaseModel]) -> BaseModel:
+    """Validate a raw payload, or return an event that was validated already"""
+    return payload if isinstance(payload, model) else model(**payload)
+
 async def handle_push_event(event: PushEvent, client: LinearClient):
     """Handle GitHub push events"""
     updates = []
+    router = get_project_router()
+    branch = event.ref[len("refs/heads/"):] if event.ref.startswith("refs/heads/") else event.ref
     
     for commit in event.commits:
         issue_id = extract_linear_issue_id(commit.message)
         if issue_id:
+            note_issue_key(issue_id)
             try:
+                route = router.match(event.repository.full_name, branch, issue_id)
                 message_title = commit.message.split('\n')[0]
                 issue = await client.create_or_update_issue(
                     title=f"Commit: {message_title}",
                     description=f"Commit Message:\n{commit.message}\n\nCommit URL: {commit.url}",
+                    project_id=route.project_id if route else None,
+                    team_id=route.team_id if route else None
                 )
                 updates.append({"issue_id": issue.id, "status": "success"})
+            except DeadlineExceeded:
+                raise
             except Exception as e:
-                logger.error(f"Error updating Linear issue {issue_id}: {str(e)}")
+                logger.error("Error updating Linear issue %s: %s", issue_id, e)
                 updates.append({"issue_id": issue_id, "status": "error", "error": str(e)})
     
     return {"message": "Push event processed", "updates": updates}
@@ -90,8 +257,18 @@ async def handle_pull_request_event(event: PullRequestEvent, client: LinearClien
     
     if not issue_id:
         return {"message": "No Linear issue ID found in PR"}
+    note_issue_key(issue_id)
     
     try:
+        route = get_project_router().match(event.repository.full_name, event.pull_request.head.get("ref"), issue_id)
+        project_id = cache_for(client).project_for_issue_key(issue_id) or (route.project_id if route else None)
+        if project_id:
+            pr_state = "merged" if event.pull_request.merged_at else event.pull_request.state
+            readiness_tracker.apply_pull_request(
+                project_id, event.repository.full_name, event.pull_request.number, pr_state,
+                branch=event.pull_request.head.get("ref")
+            )
+
         state_mapping = {
             "opened": "in_progress",
             "closed": "completed" if event.pull_request.merged_at else "canceled",
@@ -102,6 +279,8 @@ async def handle_pull_request_event(event: PullRequestEvent, client: LinearClien
             issue = await client.create_or_update_issue(
                 title=event.pull_request.title,
                 description=f"PR Description:\n{event.pull_request.body or 'No description'}\n\nPR URL: {event.pull_request.html_url}",
+                project_id=route.project_id if route else None,
+                team_id=route.team_id if route else None
             )
             return {
                 "message": "Pull request event processed",
@@ -110,8 +289,10 @@ async def handle_pull_request_event(event: PullRequestEvent, client: LinearClien
             }
         
         return {"message": f"Pull request action {event.action} not handled"}
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Error processing pull request event: {str(e)}")
+        logger.error("Error processing pull request event: %s", e)
         return {"message": "Error processing pull request", "error": str(e)}
 
 async def handle_workflow_run_event(event: WorkflowRunEvent, client: LinearClient):
@@ -120,24 +301,57 @@ async def handle_workflow_run_event(event: WorkflowRunEvent, client: LinearClien
     
     if not issue_id:
         return {"message": "No Linear issue ID found in workflow"}
+    note_issue_key(issue_id)
     
     try:
-        status, progress = parse_workflow_status(
-            event.workflow_run.status,
-            event.workflow_run.conclusion
-        )
+        # Combine every workflow of the commit; most runs do not move the aggregate
+        commit, changed = ci_aggregator.record(event.repository.full_name, event.workflow_run)
+        if not changed:
+            return {
+                "message": "Workflow run recorded, commit status unchanged",
+                "status": commit.status,
+                "progress": commit.progress
+            }
         
+        route = get_project_router().match(event.repository.full_name, commit.head_branch, issue_id)
+        project_id = cache_for(client).project_for_issue_key(issue_id) or (route.project_id if route else None)
+        if project_id:
+            readiness_tracker.apply_workflow_run(
+                project_id,
+                commit.head_branch,
+                commit.status,
+                commit.progress,
+                commit.head_sha,
+                commit.updated_at
+            )
+        
+        workflow_lines = "\n".join(
+            f"- {commit.names[workflow_id]}: {conclusion or status}"
+            for workflow_id, (status, conclusion, _) in sorted(commit.workflows.items())
+        )
         issue = await client.create_or_update_issue(
             title=f"Workflow: {event.workflow_run.name}",
-            description=f"Workflow Status: {status}\nWorkflow URL: {event.workflow_run.url}",
+            description=(
+                f"Workflow Status: {commit.status}\n"
+                f"Commit: {commit.head_sha}\n"
+                f"Workflows:\n{workflow_lines}\n"
+                f"Workflow URL: {event.workflow_run.url}"
+            ),
+            project_id=route.project_id if route else None,
+            team_id=route.team_id if route else None
         )
+        if issue.id != MOCK_ISSUE_ID:
+            # Only a status Linear has accepted counts as reported
+            ci_aggregator.mark_reported(commit)
         
         return {
             "message": "Workflow run event processed",
             "issue_id": issue.id,
-            "status": status,
-            "progress": progress
+            "status": commit.status,
+            "progress": commit.progress
         }
+    except DeadlineExceeded:
+        raise
     except Exception as e:
-        logger.error(f"Error processing workflow run event: {str(e)}")
+        logger.error("Error processing workflow run event: %s", e)
         return {"message": "Error processing workflow run", "error": str(e)}
@@ -1,53 +1,116 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import List, Optional
 
 from app.models.linear import (
     LinearProject,
     ProjectUpdateRequest,
     ProjectResponse,
-    ProjectListResponse
+    ProjectListResponse,
+    BulkProjectUpdateRequest,
+    BulkProjectUpdateResponse
 )
+from app.models.readiness import ReadinessResponse
 from app.clients.linear import LinearClient
+from app.clients.registry import Workspace, cache_for, get_workspace_registry
+from app.utils.http import conditional_json_response, projects_etag, projects_last_modified
+from app.utils.readiness import readiness_tracker
+from app.utils.deadline import DeadlineExceeded, deadline, budget
 
 router = APIRouter()
 
-async def get_linear_client() -> LinearClient:
-    """Dependency to get Linear client instance"""
-    return LinearClient()
+DEADLINE_DETAIL = "Linear did not respond within the request deadline"
+
+async def get_workspace(
+    workspace: Optional[str] = Query(None, description="Linear workspace from LINEAR_WORKSPACES_FILE (default workspace if omitted)")
+) -> Workspace:
+    """Dependency to resolve the Linear workspace a request is for"""
+    registry = get_workspace_registry()
+    if workspace is None:
+        return registry.default
+    found = registry.get(workspace)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"Unknown workspace {workspace}")
+    return found
+
+async def get_linear_client(workspace: Workspace = Depends(get_workspace)) -> LinearClient:
+    """Dependency to get a Linear client for the requested workspace, on its connection pool"""
+    return workspace.client()
 
 @router.get("/projects", response_model=ProjectListResponse)
-async def list_projects(client: LinearClient = Depends(get_linear_client)):
-    """List all projects from Linear"""
+async def list_projects(request: Request, client: LinearClient = Depends(get_linear_client)):
+    """List all projects from Linear (supports If-None-Match / If-Modified-Since)"""
+    cache = cache_for(client)
     try:
-        projects = await client.get_projects()
-        return ProjectListResponse(
-            success=True,
-            message="Projects retrieved successfully",
-            data=projects
+        projects = cache.get_projects()
+        if projects is None:
+            version = cache.version
+            with deadline(budget("interactive")):
+                projects = await client.get_projects()
+            cache.set_projects(projects, version)
+        return conditional_json_response(
+            request,
+            ProjectListResponse(
+                success=True,
+                message="Projects retrieved successfully",
+                data=projects
+            ),
+            etag=projects_etag(projects),
+            last_modified=projects_last_modified(projects)
         )
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail=DEADLINE_DETAIL)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/projects/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
+    request: Request,
     client: LinearClient = Depends(get_linear_client)
 ):
-    """Get a specific project from Linear"""
+    """Get a specific project from Linear (supports If-None-Match / If-Modified-Since)"""
+    cache = cache_for(client)
     try:
-        project = await client.get_project(project_id)
-        if not project:
-            raise HTTPException(status_code=404, detail="Project not found")
+        project = cache.get_project(project_id)
+        if project is None:
+            version = cache.version
+            with deadline(budget("interactive")):
+                project = await client.get_project(project_id)
+            if not project:
+                raise HTTPException(status_code=404, detail="Project not found")
+            cache.fill_project(project, version)
         
-        return ProjectResponse(
-            success=True,
-            message="Project retrieved successfully",
-            data=project
+        return conditional_json_response(
+            request,
+            ProjectResponse(
+                success=True,
+                message="Project retrieved successfully",
+                data=project
+            ),
+            etag=projects_etag([project]),
+            last_modified=projects_last_modified([project])
         )
     except HTTPException as e:
         raise e
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail=DEADLINE_DETAIL)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/projects/{project_id}/readiness", response_model=ReadinessResponse)
+async def get_project_readiness(project_id: str):
+    """Get a project's launch readiness, maintained incrementally from webhook events"""
+    try:
+        readiness = readiness_tracker.get(project_id)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if readiness is None:
+        raise HTTPException(status_code=404, detail="No readiness data for project")
+    return ReadinessResponse(
+        success=True,
+        message="Project readiness retrieved successfully",
+        data=readiness
+    )
 
 @router.patch("/projects/{project_id}", response_model=ProjectResponse)
 async def update_project(
@@ -57,17 +120,46 @@ async def update_project(
 ):
     """Update a project's status in Linear"""
     try:
-        project = await client.update_project(
-            project_id=project_id,
-            state=update_data.state,
-            progress=update_data.progress,
-            description=update_data.description
-        )
+        with deadline(budget("write")):
+            project = await client.update_project(
+                project_id=project_id,
+                state=update_data.state,
+                progress=update_data.progress,
+                description=update_data.description
+            )
+        cache_for(client).put_project(project)
         
         return ProjectResponse(
             success=True,
             message="Project updated successfully",
             data=project
         )
+    except DeadlineExceeded:
+        raise HTTPException(status_code=504, detail=DEADLINE_DETAIL)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e)) 
+
+@router.patch("/projects", response_model=BulkProjectUpdateResponse)
+async def update_projects(
+    update_data: BulkProjectUpdateRequest,
+    client: LinearClient = Depends(get_linear_client)
+):
+    """Update many projects in Linear using batched mutations"""
+    try:
+        # Chunks that run out of time report their own failures
+        with deadline(budget("bulk")):
+            results = await client.update_projects(update_data.updates)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    cache = cache_for(client)
+    for result in results:
+        if result.success:
+            cache.put_project(result.data)
+    failed = sum(1 for result in results if not result.success)
+
+    return BulkProjectUpdateResponse(
+        success=failed == 0,
+        message=f"{len(results) - failed} of {len(results)} projects updated successfully",
+        data=results
+    )
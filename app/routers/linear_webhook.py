@@ -0,0 +1,119 @@
+from fastapi import APIRouter, Depends, HTTPException, Header, Request
+import logging
+import json
+from typing import Dict, Any
+
+from pydantic import ValidationError
+
+from app.clients.linear import project_from_node, issue_from_node
+from app.clients.registry import Workspace
+from app.routers.linear import get_workspace
+from app.utils.cache import LinearCache, linear_cache
+from app.utils.readiness import readiness_tracker
+from app.utils.linear import verify_linear_webhook, is_fresh_linear_webhook
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+@router.post("/webhook")
+async def linear_webhook(
+    request: Request,
+    linear_signature: str = Header(..., description="Linear webhook signature (hex HMAC-SHA256 of the body)"),
+    linear_event: str = Header(None, description="Linear entity type (Project, Issue, ...)"),
+    workspace: Workspace = Depends(get_workspace)
+):
+    """
+    Handle Linear webhook events
+
+    Linear pushes entity changes here so the local project and issue cache
+    stays current without polling the Linear API.
+
+    - For projects: Creates, updates or removes the cached project
+    - For issues: Creates, updates or removes the cached issue and updates
+      the owning project's readiness
+
+    Entities that cannot be parsed are invalidated so the next read goes
+    back to Linear. A tenant's webhook points at ?workspace=<name>, is
+    verified against that workspace's linear_webhook_secret only (or
+    LINEAR_WEBHOOK_SECRET if it has none) and updates its cache partition.
+    """
+    payload_bytes = await request.body()
+    try:
+        verified = verify_linear_webhook(linear_signature, payload_bytes, secret=workspace.linear_webhook_secret)
+    except ValueError as e:
+        logger.error("Cannot verify Linear webhook for workspace %s: %s", workspace.name, e)
+        raise HTTPException(status_code=401, detail="Linear webhook secret is not configured")
+    if not verified:
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    cache = workspace.cache
+
+    try:
+        payload = json.loads(payload_bytes)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON payload")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Payload must be a JSON object")
+
+    webhook_timestamp = payload.get("webhookTimestamp")
+    if webhook_timestamp is not None and (isinstance(webhook_timestamp, bool) or not isinstance(webhook_timestamp, (int, float))):
+        raise HTTPException(status_code=400, detail="webhookTimestamp must be a number")
+    if not is_fresh_linear_webhook(webhook_timestamp):
+        raise HTTPException(status_code=401, detail="Stale webhook timestamp")
+
+    entity_type = payload.get("type") or linear_event
+    if entity_type == "Project":
+        return handle_project_event(payload, cache)
+    elif entity_type == "Issue":
+        return handle_issue_event(payload, cache)
+    else:
+        logger.debug("Unhandled Linear entity type: %s", entity_type)
+        return {"message": f"Entity type {entity_type} not handled"}
+
+def handle_project_event(payload: Dict[str, Any], cache: LinearCache = linear_cache):
+    """Apply a Linear project create/update/remove to the cache"""
+    action = payload.get("action")
+    data = payload.get("data") or {}
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Payload data must be a JSON object")
+    project_id = data.get("id")
+    if not project_id:
+        raise HTTPException(status_code=400, detail="Project payload has no id")
+
+    if action == "remove":
+        cache.remove_project(project_id)
+        return {"message": "Project removed from cache", "project_id": project_id}
+
+    try:
+        cache.put_project(project_from_node(data))
+    except (KeyError, ValueError, ValidationError) as e:
+        logger.warning("Invalidating project %s, payload could not be parsed: %s", project_id, e)
+        cache.remove_project(project_id)
+        return {"message": "Project invalidated", "project_id": project_id}
+
+    return {"message": "Project cache updated", "project_id": project_id}
+
+def handle_issue_event(payload: Dict[str, Any], cache: LinearCache = linear_cache):
+    """Apply a Linear issue create/update/remove to the cache"""
+    action = payload.get("action")
+    data = payload.get("data") or {}
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Payload data must be a JSON object")
+    issue_id = data.get("id")
+    if not issue_id:
+        raise HTTPException(status_code=400, detail="Issue payload has no id")
+
+    if action == "remove":
+        cache.remove_issue(issue_id)
+        readiness_tracker.remove_issue(issue_id)
+        return {"message": "Issue removed from cache", "issue_id": issue_id}
+
+    try:
+        issue = issue_from_node(data)
+    except (KeyError, ValueError, ValidationError) as e:
+        logger.warning("Invalidating issue %s, payload could not be parsed: %s", issue_id, e)
+        cache.remove_issue(issue_id)
+        return {"message": "Issue invalidated", "issue_id": issue_id}
+
+    cache.put_issue(issue)
+    readiness_tracker.apply_issue(issue)
+    return {"message": "Issue cache updated", "issue_id": issue_id}
@@ -0,0 +1,146 @@
+import os
+import math
+import time
+from typing import Optional
+
+from app.utils.metrics import metrics
+
+# Share of the concurrency limit each priority may fill. Lower priorities are
+# turned away first, leaving headroom for the more important events.
+PRIORITY_SHARES = {
+    "high": 1.0,
+    "normal": 0.8,
+    "low": 0.6,
+    "background": 0.4
+}
+
+def event_priority(event_type: str, action: Optional[str] = None) -> str:
+    """
+    Priority of a GitHub event for admission control
+
+    Pull requests drive issue state and come first, pushes next, then
+    workflow runs; workflow runs that were merely requested carry no result
+    and are the first to be shed.
+    """
+    if event_type == "pull_request":
+        return "high"
+    if event_type == "workflow_run":
+        return "background" if action == "requested" else "low"
+    return "normal"
+
+class AdmissionTicket:
+    """An admitted request; release() must be called exactly once when it finishes"""
+
+    def __init__(self, limiter: "AdaptiveLimiter", priority: str):
+        self._limiter = limiter
+        self.priority = priority
+        self.started = time.monotonic()
+        self._released = False
+
+    def reprioritize(self, priority: str) -> bool:
+        """
+        Move to another priority once more is known about the request
+
+        Returns False (and releases the ticket) if the request would not have
+        been admitted at its new, lower priority.
+        """
+        if PRIORITY_SHARES[priority] >= PRIORITY_SHARES[self.priority]:
+            self.priority = priority
+            return True
+        # This request is already counted in in_flight, hence the - 1
+        if self._limiter.in_flight - 1 >= self._limiter.limit * PRIORITY_SHARES[priority]:
+            self._limiter._reject(priority)
+            self.release(shed=True)
+            return False
+        self.priority = priority
+        return True
+
+    def release(self, shed: bool = False) -> None:
+        """Finish the request, feeding its latency to the limiter unless it was shed"""
+        if self._released:
+            return
+        self._released = True
+        self._limiter._release(None if shed else time.monotonic() - self.started)
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit for webhook processing, adapted from observed latency
+
+    Requests are admitted while the number in flight is below the limit times
+    their priority's share. The limit follows AIMD: every completion faster
+    than the target latency grows it by 1/limit (about +1 per limit
+    requests), and a completion slower than the target shrinks it by
+    DECREASE_FACTOR, at most once per target latency so a burst of slow
+    completions counts as one signal. Excess requests are refused at once so
+    they can be retried elsewhere or later instead of queueing into timeouts.
+
+    Configured by ADMISSION_INITIAL_LIMIT (default 20), ADMISSION_MIN_LIMIT
+    (2), ADMISSION_MAX_LIMIT (200) and ADMISSION_TARGET_LATENCY_SECONDS (2.0).
+    State is per process and is only touched from the event loop.
+    """
+
+    DECREASE_FACTOR = 0.9
+    # Weight of the newest sample in the smoothed latency
+    SMOOTHING = 0.1
+
+    def __init__(
+        self,
+        initial_limit: Optional[float] = None,
+        min_limit: Optional[float] = None,
+        max_limit: Optional[float] = None,
+        target_latency: Optional[float] = None
+    ):
+        self.limit = initial_limit or float(os.getenv("ADMISSION_INITIAL_LIMIT", "20"))
+        self.min_limit = min_limit or float(os.getenv("ADMISSION_MIN_LIMIT", "2"))
+        self.max_limit = max_limit or float(os.getenv("ADMISSION_MAX_LIMIT", "200"))
+        self.target_latency = target_latency or float(os.getenv("ADMISSION_TARGET_LATENCY_SECONDS", "2.0"))
+        self.in_flight = 0
+        self.smoothed_latency: Optional[float] = None
+        self._last_decrease = 0.0
+        self._publish()
+
+    def try_acquire(self, priority: str) -> Optional[AdmissionTicket]:
+        """Admit a request of the given priority, or return None if it should be refused"""
+        if self.in_flight >= self.limit * PRIORITY_SHARES[priority]:
+            self._reject(priority)
+            return None
+        self.in_flight += 1
+        metrics.set("admission_in_flight", self.in_flight)
+        return AdmissionTicket(self, priority)
+
+    def retry_after(self) -> int:
+        """Seconds a refused client should wait before retrying"""
+        latency = self.smoothed_latency or self.target_latency
+        return max(1, math.ceil(latency))
+
+    def _reject(self, priority: str) -> None:
+        metrics.incr("admission_rejected_total")
+        metrics.incr(f"admission_rejected_{priority}_total")
+
+    def _release(self, latency: Optional[float]) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self.smoothed_latency = latency if self.smoothed_latency is None else (
+                self.SMOOTHING * latency + (1 - self.SMOOTHING) * self.smoothed_latency
+            )
+            now = time.monotonic()
+            if latency > self.target_latency:
+                if now - self._last_decrease >= self.target_latency:
+                    self._last_decrease = now
+                    self.limit = max(self.min_limit, self.limit * self.DECREASE_FACTOR)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set("admission_limit", round(self.limit, 2))
+        metrics.set("admission_in_flight", self.in_flight)
+
+_limiter: Optional[AdaptiveLimiter] = None
+
+def get_admission_limiter() -> AdaptiveLimiter:
+    """Return the process-wide webhook admission limiter, building it on first use"""
+    global _limiter
+    if _limiter is None:
+        _limiter = AdaptiveLimiter()
+    return _limiter
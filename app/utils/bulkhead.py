@@ -0,0 +1,199 @@
+import os
+import math
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, Optional, Tuple
+
+from app.utils.deadline import DeadlineExceeded, remaining
+from app.utils.metrics import metrics
+
+# Default (concurrency, queue size, concurrent Linear calls) per GitHub event
+# type, overridable with BULKHEAD_<EVENT>_CONCURRENCY, BULKHEAD_<EVENT>_QUEUE
+# and BULKHEAD_<EVENT>_LINEAR_CALLS. Unlisted event types share "default".
+DEFAULTS: Dict[str, Tuple[int, int, int]] = {
+    "pull_request": (10, 50, 8),
+    "push": (10, 50, 6),
+    "workflow_run": (4, 20, 3),
+    "default": (4, 20, 2)
+}
+
+class BulkheadFull(Exception):
+    """Raised when a bulkhead's queue is full or a queued request waited too long"""
+
+class _Gate:
+    """
+    FIFO counting semaphore with an optional bound on waiters
+
+    Unlike asyncio.Semaphore it is not bound to an event loop, so process-wide
+    instances work across the loops of test clients. A released slot is handed
+    straight to the oldest waiter, so newcomers cannot overtake the queue.
+    """
+
+    def __init__(self, limit: int, queue_size: Optional[int] = None):
+        self.limit = limit
+        self.queue_size = queue_size
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, timeout: Optional[float]) -> bool:
+        """Take a slot, waiting up to timeout seconds; False if the queue is full or the wait timed out"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        if self.queue_size is not None and len(self._waiters) >= self.queue_size:
+            return False
+        if timeout is not None and timeout <= 0:
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as the wait ended; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                return False
+            raise
+
+    def release(self) -> None:
+        """Give the slot to the oldest waiter, or free it"""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+class Bulkhead:
+    """
+    Isolated capacity for one GitHub event type
+
+    Each bulkhead admits up to concurrency deliveries at once and queues up to
+    queue_size more for at most queue_timeout seconds, or until the request
+    deadline if that comes first; anything beyond that is refused straight
+    away. Deliveries running in the bulkhead may have at most
+    linear_calls requests to Linear in flight, so one event type cannot take
+    the whole shared connection pool. A flood of workflow runs from a matrix
+    build then only fills its own queue while pull requests keep flowing.
+
+    Utilization is published on /metrics as bulkhead_<name>_in_flight,
+    _queued, _linear_in_flight and _utilization (in flight / concurrency),
+    with refusals counted in bulkhead_<name>_rejected_total.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue_size: int, linear_calls: int, queue_timeout: float):
+        self.name = name
+        self.queue_timeout = queue_timeout
+        self._slots = _Gate(concurrency, queue_size)
+        self._linear = _Gate(linear_calls)
+        self._publish()
+
+    @property
+    def concurrency(self) -> int:
+        return self._slots.limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._slots.active
+
+    @property
+    def queued(self) -> int:
+        return self._slots.queued
+
+    async def acquire(self) -> bool:
+        """Take a delivery slot, queueing if needed; False if the delivery should be refused"""
+        timeout = self.queue_timeout
+        left = remaining()
+        if left is not None:
+            timeout = min(timeout, left)
+        acquired = await self._slots.acquire(timeout)
+        if not acquired:
+            metrics.incr(f"bulkhead_{self.name}_rejected_total")
+        self._publish()
+        return acquired
+
+    def release(self) -> None:
+        """Return a delivery slot taken with acquire()"""
+        self._slots.release()
+        self._publish()
+
+    def retry_after(self) -> int:
+        """Seconds a refused client should wait before retrying"""
+        return max(1, math.ceil(self.queue_timeout))
+
+    @asynccontextmanager
+    async def linear_call(self) -> AsyncIterator[None]:
+        """
+        Hold one of this bulkhead's Linear call slots
+
+        The wait is bounded by the request deadline.
+
+        Raises:
+            DeadlineExceeded: If no slot frees up before the deadline
+        """
+        if not await self._linear.acquire(remaining()):
+            raise DeadlineExceeded(f"Request deadline exceeded waiting for a Linear slot in bulkhead {self.name}")
+        self._publish()
+        try:
+            yield
+        finally:
+            self._linear.release()
+            self._publish()
+
+    def stats(self) -> Dict[str, float]:
+        """Current usage of the bulkhead"""
+        return {
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "linear_in_flight": self._linear.active,
+            "utilization": round(self.in_flight / self.concurrency, 3) if self.concurrency else 0.0
+        }
+
+    def _publish(self) -> None:
+        for name, value in self.stats().items():
+            metrics.set(f"bulkhead_{self.name}_{name}", value)
+
+# Bulkhead of the delivery being processed, read by the Linear client
+bulkhead_var: ContextVar[Optional[Bulkhead]] = ContextVar("bulkhead", default=None)
+
+@asynccontextmanager
+async def linear_call_slot() -> AsyncIterator[None]:
+    """Hold a Linear call slot of the current bulkhead, if the request runs in one"""
+    bulkhead = bulkhead_var.get()
+    if bulkhead is None:
+        yield
+        return
+    async with bulkhead.linear_call():
+        yield
+
+def build_bulkhead(name: str) -> Bulkhead:
+    """Create the bulkhead for an event type from its defaults and environment overrides"""
+    concurrency, queue_size, linear_calls = DEFAULTS.get(name, DEFAULTS["default"])
+    prefix = f"BULKHEAD_{name.upper()}_"
+    return Bulkhead(
+        name,
+        concurrency=int(os.getenv(prefix + "CONCURRENCY", str(concurrency))),
+        queue_size=int(os.getenv(prefix + "QUEUE", str(queue_size))),
+        linear_calls=int(os.getenv(prefix + "LINEAR_CALLS", str(linear_calls))),
+        queue_timeout=float(os.getenv("BULKHEAD_QUEUE_TIMEOUT_SECONDS", "5.0"))
+    )
+
+_bulkheads: Dict[str, Bulkhead] = {}
+
+def get_bulkhead(event_type: str) -> Bulkhead:
+    """Return the process-wide bulkhead for a GitHub event type, building it on first use"""
+    name = event_type if event_type in DEFAULTS else "default"
+    if name not in _bulkheads:
+        _bulkheads[name] = build_bulkhead(name)
+    return _bulkheads[name]
@@ -0,0 +1,176 @@
+import os
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.models.linear import LinearProject, LinearIssue
+from app.utils.state import StateBackend, get_state_backend
+
+class LinearCache:
+    """
+    Local copy of Linear project and issue state
+
+    The cache is filled on demand by the project endpoints and kept current by
+    the inbound Linear webhook receiver, which pushes creates, updates and
+    removals as they happen. Every mutation bumps ``version`` so that a slow
+    read-through fill started before a webhook arrived cannot overwrite the
+    newer state with its stale snapshot.
+
+    Entries live in a StateBackend, so with a shared backend a webhook
+    received by one worker is visible to all of them. Each project is its own
+    key, stamped with the version that wrote it (removals leave a tombstone),
+    so reading or writing one project touches one small value; a separate key
+    marks the full listing as cached. Projects and the listing marker expire
+    after max_age. Decoded models are memoized per process and reused while
+    their updated_at is unchanged.
+    """
+
+    def __init__(self, max_age: Optional[float] = None, backend: Optional[StateBackend] = None, namespace: str = "linear"):
+        # Safety net for missed webhooks; 0 disables expiry entirely
+        if max_age is None:
+            max_age = float(os.getenv("LINEAR_CACHE_MAX_AGE_SECONDS", "3600"))
+        self.max_age = max_age
+        self._backend = backend
+        self._project_prefix = f"{namespace}:project:"
+        self._version_key = f"{namespace}:projects:version"
+        self._listing_key = f"{namespace}:projects:listing"
+        self._issue_prefix = f"{namespace}:issue:"
+        self._issue_key_prefix = f"{namespace}:issue_key:"
+        self._decoded: Dict[str, Tuple[str, LinearProject]] = {}
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_state_backend()
+        return self._backend
+
+    @property
+    def _ttl(self) -> Optional[float]:
+        return self.max_age or None
+
+    def _decode(self, item: Dict[str, Any]) -> LinearProject:
+        cached = self._decoded.get(item["id"])
+        if cached is not None and cached[0] == item["updated_at"]:
+            return cached[1]
+        project = LinearProject.model_validate(item)
+        self._decoded[item["id"]] = (item["updated_at"], project)
+        return project
+
+    @property
+    def version(self) -> int:
+        """Current version of the project state"""
+        return self.backend.get(self._version_key) or 0
+
+    def _bump(self) -> int:
+        return self.backend.incr(self._version_key)
+
+    def get_projects(self) -> Optional[List[LinearProject]]:
+        """Return all cached projects, or None if the full list is not cached"""
+        listing = self.backend.get(self._listing_key)
+        if listing is None:
+            return None
+        entries = {key[len(self._project_prefix):]: entry for key, entry in self.backend.get_prefix(self._project_prefix).items()}
+        if any(project_id not in entries for project_id in listing):
+            # A listed project expired; removed ones leave a tombstone instead
+            return None
+        items = {project_id: entry["item"] for project_id, entry in entries.items() if entry["item"] is not None}
+        # Linear's order for listed projects, then those created since
+        ordered = [items.pop(project_id) for project_id in listing if project_id in items]
+        ordered += sorted(items.values(), key=lambda item: item["created_at"])
+        return [self._decode(item) for item in ordered]
+
+    def get_project(self, project_id: str) -> Optional[LinearProject]:
+        """Return a cached project, or None on a miss"""
+        entry = self.backend.get(self._project_prefix + project_id)
+        return self._decode(entry["item"]) if entry is not None and entry["item"] is not None else None
+
+    def _fill(self, project: LinearProject, version: int) -> bool:
+        """Store a fetched project unless a webhook touched it after version was read"""
+        def fill(current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if current is not None and current["version"] > version:
+                stored["value"] = False
+                return current
+            return {"version": version, "item": project.model_dump(mode="json")}
+        stored = {"value": True}
+        self.backend.update(self._project_prefix + project.id, fill, ttl=self._ttl)
+        return stored["value"]
+
+    def set_projects(self, projects: List[LinearProject], version: int) -> bool:
+        """
+        Store a full project listing fetched from Linear
+
+        Args:
+            projects: Projects returned by Linear
+            version: Cache version observed before the fetch was started
+
+        Returns:
+            bool: True if stored, False if a webhook changed the cache meanwhile
+        """
+        if self.version != version:
+            return False
+        listed = {project.id for project in projects}
+        for project in projects:
+            self._fill(project, version)
+        # Projects Linear no longer lists, unless a webhook wrote them since
+        for key, entry in self.backend.get_prefix(self._project_prefix).items():
+            if key[len(self._project_prefix):] not in listed and entry["version"] <= version:
+                self.backend.delete(key)
+        self.backend.set(self._listing_key, [project.id for project in projects], ttl=self._ttl)
+        return True
+
+    def fill_project(self, project: LinearProject, version: int) -> bool:
+        """Store a single project fetched from Linear unless the cache changed meanwhile"""
+        return self._fill(project, version)
+
+    def put_project(self, project: LinearProject) -> None:
+        """Insert or replace a project pushed by Linear or written by us"""
+        version = self._bump()
+
+        def put(current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if current is not None and current["item"] is not None and self._decode(current["item"]).updated_at > project.updated_at:
+                return {"version": version, "item": current["item"]}
+            return {"version": version, "item": project.model_dump(mode="json")}
+        self.backend.update(self._project_prefix + project.id, put, ttl=self._ttl)
+
+    def remove_project(self, project_id: str) -> None:
+        """Drop a project that was removed or could not be parsed"""
+        # A tombstone, so that a fill started earlier cannot bring it back
+        self.backend.set(self._project_prefix + project_id, {"version": self._bump(), "item": None}, ttl=self._ttl)
+
+    def get_issue(self, issue_id: str) -> Optional[LinearIssue]:
+        """Return a cached issue, or None on a miss"""
+        item = self.backend.get(self._issue_prefix + issue_id)
+        return LinearIssue.model_validate(item) if item is not None else None
+
+    def project_for_issue_key(self, issue_key: str) -> Optional[str]:
+        """Return the project id of the issue with the given key (e.g. ABC-123), if known"""
+        issue_id = self.backend.get(self._issue_key_prefix + issue_key)
+        item = self.backend.get(self._issue_prefix + issue_id) if issue_id else None
+        return item.get("project_id") if item else None
+
+    def put_issue(self, issue: LinearIssue) -> None:
+        """Insert or replace an issue pushed by Linear"""
+        def put(current: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            if current is not None and LinearIssue.model_validate(current).updated_at > issue.updated_at:
+                return current
+            return issue.model_dump(mode="json")
+        stored = self.backend.update(self._issue_prefix + issue.id, put)
+        if issue.identifier and stored.get("identifier") == issue.identifier:
+            self.backend.set(self._issue_key_prefix + issue.identifier, issue.id)
+
+    def remove_issue(self, issue_id: str) -> None:
+        """Drop an issue that was removed or could not be parsed"""
+        item = self.backend.get(self._issue_prefix + issue_id)
+        self.backend.delete(self._issue_prefix + issue_id)
+        if item is not None and item.get("identifier"):
+            self.backend.delete(self._issue_key_prefix + item["identifier"])
+
+    def clear(self) -> None:
+        """Invalidate everything"""
+        self._bump()
+        self.backend.delete(self._listing_key)
+        self.backend.delete_prefix(self._project_prefix)
+        self.backend.delete_prefix(self._issue_prefix)
+        self.backend.delete_prefix(self._issue_key_prefix)
+        self._decoded.clear()
+
+# Process-wide cache shared by the Linear routers
+linear_cache = LinearCache()
@@ -0,0 +1,160 @@
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.github import WorkflowRun
+from app.utils.github import parse_workflow_status
+from app.utils.state import StateBackend, get_state_backend
+
+@dataclass
+class CommitStatus:
+    """Latest run of every workflow for one commit, and their combined status"""
+    repository: str
+    head_sha: str
+    head_branch: str
+    # workflow_id -> (status, conclusion, run updated_at)
+    workflows: Dict[int, Tuple[str, Optional[str], datetime]] = field(default_factory=dict)
+    names: Dict[int, str] = field(default_factory=dict)
+    status: Optional[str] = None
+    progress: Optional[float] = None
+
+    @property
+    def updated_at(self) -> datetime:
+        return max(updated_at for _, _, updated_at in self.workflows.values())
+
+def combine_workflow_statuses(workflows: Dict[int, Tuple[str, Optional[str], datetime]]) -> Tuple[str, Optional[float]]:
+    """
+    Combine the latest status of each workflow of a commit into one Linear status
+
+    Args:
+        workflows: workflow_id -> (GitHub status, conclusion, updated_at)
+
+    Returns:
+        Tuple[str, Optional[float]]: Linear project status and the percentage of workflows finished
+    """
+    statuses = [parse_workflow_status(status, conclusion)[0] for status, conclusion, _ in workflows.values()]
+    finished = sum(1 for status, _, _ in workflows.values() if status == "completed")
+    progress = round(finished / len(statuses) * 100, 1)
+    if "blocked" in statuses:
+        return "blocked", progress
+    if "in_progress" in statuses or "backlog" in statuses:
+        return "in_progress", progress
+    if "paused" in statuses:
+        return "paused", progress
+    return "completed", 100.0
+
+class CIAggregator:
+    """
+    Per-commit CI status across every workflow run of a (repository, head_sha)
+
+    Each workflow_run event replaces the latest run of its workflow and the
+    combined status is recomputed from that commit's runs only. Commits are
+    kept in the shared StateBackend, so runs of one commit handled by
+    different workers are combined, and expire CI_AGGREGATOR_TTL_SECONDS
+    (default 7 days) after their last run. An index of commits in the order
+    they were first seen bounds them to CI_AGGREGATOR_MAX_COMMITS (default
+    10000); the oldest are deleted past that.
+
+    record() reports whether the combined status or progress differs from
+    the last one reported to Linear; callers call mark_reported() once their
+    Linear update has gone through, so an update that failed is sent again
+    with the next event or redelivery instead of being considered done.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[StateBackend] = None,
+        namespace: str = "ci",
+        ttl: Optional[float] = None,
+        max_commits: Optional[int] = None
+    ):
+        self._backend = backend
+        self._prefix = f"{namespace}:commit:"
+        self._index_key = f"{namespace}:commits"
+        self.ttl = ttl if ttl is not None else float(os.getenv("CI_AGGREGATOR_TTL_SECONDS", str(7 * 24 * 3600)))
+        if max_commits is None:
+            max_commits = int(os.getenv("CI_AGGREGATOR_MAX_COMMITS", "10000"))
+        self.max_commits = max_commits
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_state_backend()
+        return self._backend
+
+    def _key(self, repository: str, head_sha: str) -> str:
+        return f"{self._prefix}{repository}:{head_sha}"
+
+    def _commit(self, repository: str, head_sha: str, record: Dict[str, Any]) -> CommitStatus:
+        commit = CommitStatus(repository=repository, head_sha=head_sha, head_branch=record["head_branch"])
+        for workflow_id, (status, conclusion, updated_at, name) in record["workflows"].items():
+            commit.workflows[int(workflow_id)] = (status, conclusion, datetime.fromisoformat(updated_at))
+            commit.names[int(workflow_id)] = name
+        commit.status, commit.progress = combine_workflow_statuses(commit.workflows)
+        return commit
+
+    def get(self, repository: str, head_sha: str) -> Optional[CommitStatus]:
+        """Return the tracked status of a commit, if any"""
+        record = self.backend.get(self._key(repository, head_sha))
+        return self._commit(repository, head_sha, record) if record else None
+
+    def record(self, repository: str, run: WorkflowRun) -> Tuple[CommitStatus, bool]:
+        """
+        Record a workflow run and recompute its commit's combined status
+
+        Runs older than the one already held for the same workflow (late or
+        redelivered events) are ignored.
+
+        Args:
+            repository: Repository full name
+            run: The workflow run from the event
+
+        Returns:
+            Tuple[CommitStatus, bool]: The commit's status and whether it differs from the last one reported
+        """
+        created = False
+
+        def apply(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            nonlocal created
+            created = record is None
+            record = record or {"head_branch": run.head_branch, "workflows": {}, "reported": None}
+            workflows = dict(record["workflows"])
+            current = workflows.get(str(run.workflow_id))
+            if current is None or datetime.fromisoformat(current[2]) <= run.updated_at:
+                workflows[str(run.workflow_id)] = [run.status, run.conclusion, run.updated_at.isoformat(), run.name]
+            return {**record, "workflows": workflows}
+
+        record = self.backend.update(self._key(repository, run.head_sha), apply, ttl=self.ttl)
+        if created:
+            self._index(self._key(repository, run.head_sha))
+        commit = self._commit(repository, run.head_sha, record)
+        reported = tuple(record["reported"]) if record["reported"] else None
+        return commit, (commit.status, commit.progress) != reported
+
+    def _index(self, key: str) -> None:
+        """Append a new commit to the index and delete the oldest ones past max_commits"""
+        evicted: List[str] = []
+
+        def apply(index: Optional[List[str]]) -> List[str]:
+            nonlocal evicted
+            index = [k for k in index or [] if k != key] + [key]
+            excess = max(len(index) - self.max_commits, 0)
+            evicted = index[:excess]
+            return index[excess:]
+
+        self.backend.update(self._index_key, apply, ttl=self.ttl)
+        for stale in evicted:
+            self.backend.delete(stale)
+
+    def mark_reported(self, commit: CommitStatus) -> None:
+        """Remember that Linear now shows the commit's combined status and progress"""
+        def apply(record: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+            if record is None:
+                return None
+            return {**record, "reported": [commit.status, commit.progress]}
+
+        self.backend.update(self._key(commit.repository, commit.head_sha), apply, ttl=self.ttl)
+
+# Process-wide aggregator fed by the GitHub webhook router
+ci_aggregator = CIAggregator()
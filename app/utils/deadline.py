@@ -0,0 +1,53 @@
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+# Absolute time.monotonic() by which the current request must be answered
+_deadline: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+# Default time budgets (seconds) by kind of caller, overridable per environment variable
+BUDGETS = {
+    "interactive": ("LINEAR_INTERACTIVE_DEADLINE_SECONDS", 5.0),
+    "write": ("LINEAR_WRITE_DEADLINE_SECONDS", 15.0),
+    "bulk": ("LINEAR_BULK_DEADLINE_SECONDS", 60.0),
+    # GitHub gives up on a delivery after 10 seconds
+    "webhook": ("GITHUB_WEBHOOK_DEADLINE_SECONDS", 9.0),
+    "startup": ("STARTUP_BUDGET_SECONDS", 10.0),
+}
+
+class DeadlineExceeded(Exception):
+    """The request's deadline passed before the work could complete"""
+
+def budget(kind: str) -> float:
+    """Return the time budget in seconds for a kind of caller (see BUDGETS)"""
+    env_var, default = BUDGETS[kind]
+    return float(os.getenv(env_var, str(default)))
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound everything run inside the block, including nested tasks, to seconds from now
+
+    A deadline already in effect is never extended, so an inner block can
+    only shorten the remaining budget.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None if there is none"""
+    expires = _deadline.get()
+    return None if expires is None else expires - time.monotonic()
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the current deadline has passed"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded("Request deadline exceeded")
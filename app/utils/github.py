@@ -2,7 +2,11 @@ import os
 import hmac
 import hashlib
 import re
-from typing import Optional, Tuple
+import time
+import logging
+from typing import Optional, Tuple, List, Iterable
+
+logger = logging.getLogger(__name__)
 
 def verify_github_webhook(signature: str, payload: bytes) -> bool:
     """
@@ -30,6 +34,172 @@ def verify_github_webhook(signature: str, payload: bytes) -> bool:
 
     return hmac.compare_digest(signature, expected_signature)
 
+class WebhookVerifier:
+    """
+    GitHub webhook signature verifier with precomputed keys and secret rotation
+
+    Each active secret is turned into a keyed HMAC object once; verifying a
+    request clones that state instead of re-running the key schedule. Several
+    secrets can be active at once so a new secret can be rolled out before the
+    old one is retired. The secret that verified most recently is tried first.
+
+    Secrets are read from GITHUB_WEBHOOK_SECRET, the comma-separated
+    GITHUB_WEBHOOK_SECRETS and the file named by GITHUB_WEBHOOK_SECRETS_FILE
+    (one secret per line). The file is re-read when its modification time
+    changes, so rotation needs no restart.
+    """
+
+    # Minimum seconds between checks of the secrets file after a failed verify
+    RELOAD_CHECK_INTERVAL = 1.0
+
+    def __init__(self, secrets: Optional[Iterable[str]] = None, secrets_file: Optional[str] = None):
+        self._static_secrets = list(secrets) if secrets is not None else None
+        self.secrets_file = secrets_file
+        self._keys: List[Tuple[str, "hmac.HMAC"]] = []
+        self._file_mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+        self.reload()
+
+    @classmethod
+    def from_env(cls) -> "WebhookVerifier":
+        """Build a verifier whose secrets come from the environment and secrets file"""
+        return cls(secrets_file=os.getenv("GITHUB_WEBHOOK_SECRETS_FILE") or None)
+
+    def _read_secrets(self) -> List[str]:
+        if self._static_secrets is not None:
+            secrets = list(self._static_secrets)
+        else:
+            secrets = [os.getenv("GITHUB_WEBHOOK_SECRET", "")]
+            secrets += os.getenv("GITHUB_WEBHOOK_SECRETS", "").split(",")
+        if self.secrets_file:
+            try:
+                with open(self.secrets_file, encoding='utf-8') as f:
+                    secrets += f.read().splitlines()
+                self._file_mtime = os.stat(self.secrets_file).st_mtime
+            except OSError as e:
+                logger.error("Could not read webhook secrets file %s: %s", self.secrets_file, e)
+        # Preserve order but drop blanks and duplicates
+        return list(dict.fromkeys(secret.strip() for secret in secrets if secret.strip()))
+
+    def reload(self) -> None:
+        """Re-read the active secrets, keeping the current try order for secrets still active"""
+        current = {secret: (position, mac) for position, (secret, mac) in enumerate(self._keys)}
+        keys = [
+            (secret, current[secret][1] if secret in current else hmac.new(secret.encode('utf-8'), digestmod=hashlib.sha256))
+            for secret in self._read_secrets()
+        ]
+        keys.sort(key=lambda key: current[key[0]][0] if key[0] in current else len(current))
+        self._keys = keys
+
+    def start(self) -> "SignatureCheck":
+        """
+        Begin incremental verification of a body that arrives in chunks
+
+        Returns:
+            SignatureCheck: Per-request clones of every active keyed HMAC
+        """
+        if not self._keys:
+            self.reload_if_changed()
+            if not self._keys:
+                raise ValueError("GITHUB_WEBHOOK_SECRET environment variable is not set")
+        return SignatureCheck(self, [(secret, mac.copy()) for secret, mac in self._keys])
+
+    def _promote(self, secret: str) -> None:
+        keys = self._keys
+        for position, key in enumerate(keys):
+            if key[0] == secret:
+                if position:
+                    self._keys = [key] + keys[:position] + keys[position + 1:]
+                return
+
+    def verify(self, signature: str, payload: bytes) -> bool:
+        """
+        Verify a GitHub webhook signature
+
+        Args:
+            signature: The signature from X-Hub-Signature-256 header
+            payload: Raw request body bytes
+
+        Returns:
+            bool: True if signature is valid, False otherwise
+        """
+        if not signature or not signature.startswith("sha256="):
+            return False
+        if not self._keys:
+            self.reload_if_changed()
+            if not self._keys:
+                raise ValueError("GITHUB_WEBHOOK_SECRET environment variable is not set")
+
+        if self._check(signature, payload):
+            return True
+        # A failure may mean the secret was rotated on disk; pick it up and retry
+        if self.reload_if_changed():
+            return self._check(signature, payload)
+        return False
+
+    def _check(self, signature: str, payload: bytes) -> bool:
+        check = SignatureCheck(self, [(secret, mac.copy()) for secret, mac in self._keys])
+        check.update(payload)
+        return check.verify(signature)
+
+    def reload_if_changed(self) -> bool:
+        """Reload secrets if the secrets file changed, checking at most once per interval"""
+        if not self.secrets_file:
+            return False
+        now = time.monotonic()
+        if now - self._last_reload_check < self.RELOAD_CHECK_INTERVAL:
+            return False
+        self._last_reload_check = now
+        try:
+            mtime = os.stat(self.secrets_file).st_mtime
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        logger.info("Webhook secrets file changed, reloading secrets")
+        self.reload()
+        return True
+
+class SignatureCheck:
+    """Incremental HMAC state for one webhook body, fed chunk by chunk"""
+
+    def __init__(self, verifier: WebhookVerifier, macs: List[Tuple[str, "hmac.HMAC"]]):
+        self._verifier = verifier
+        self._macs = macs
+
+    def update(self, chunk: bytes) -> None:
+        """Feed the next chunk of the raw body"""
+        for _, mac in self._macs:
+            mac.update(chunk)
+
+    def verify(self, signature: str) -> bool:
+        """
+        Check the signature against everything fed so far
+
+        Args:
+            signature: The signature from X-Hub-Signature-256 header
+
+        Returns:
+            bool: True if signature is valid, False otherwise
+        """
+        if not signature or not signature.startswith("sha256="):
+            return False
+        digest = signature[len("sha256="):]
+        for secret, mac in self._macs:
+            if hmac.compare_digest(mac.hexdigest(), digest):
+                self._verifier._promote(secret)
+                return True
+        return False
+
+_verifier: Optional[WebhookVerifier] = None
+
+def get_webhook_verifier() -> WebhookVerifier:
+    """Return the process-wide webhook verifier, building it on first use"""
+    global _verifier
+    if _verifier is None:
+        _verifier = WebhookVerifier.from_env()
+    return _verifier
+
 def extract_linear_issue_id(text: str) -> Optional[str]:
     """
     Extract Linear issue ID from text (commit message or PR title/description)
@@ -0,0 +1,312 @@
+import os
+import sys
+import time
+import uuid
+from array import array
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+# Stages timed for every delivery, in the order they happen
+STAGES = ("wait", "intake", "parse", "handle", "total")
+
+# Outcome codes stored per entry (index into this tuple)
+OUTCOMES = (
+    "updated",       # Every Linear update succeeded
+    "partial",       # Some Linear updates failed
+    "linear_error",  # Every Linear update failed
+    "skipped",       # Processed without touching Linear
+    "duplicate",     # Redelivery of an already processed delivery
+    "rejected",      # Refused before processing (bad signature or body, overload)
+    "error"          # Processing failed with a 500
+)
+_OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+
+class EventTrace:
+    """What happened to one webhook delivery, filled in as it is processed"""
+
+    __slots__ = (
+        "delivery_id", "event_type", "repository", "issue_keys", "outcome",
+        "status_code", "linear_updates", "linear_failures", "received_at",
+        "timings", "_started", "_last"
+    )
+
+    def __init__(self, delivery_id: Optional[str], event_type: str):
+        self.delivery_id = delivery_id
+        self.event_type = event_type
+        self.repository: Optional[str] = None
+        self.issue_keys: List[str] = []
+        self.outcome = "skipped"
+        self.status_code: Optional[int] = None
+        self.linear_updates = 0
+        self.linear_failures = 0
+        self.received_at = time.time()
+        self.timings = [0.0] * len(STAGES)
+        self._started = self._last = time.perf_counter()
+
+    def mark(self, stage: str) -> None:
+        """Close a stage, timing it from the end of the previous one"""
+        now = time.perf_counter()
+        self.timings[STAGES.index(stage)] = now - self._last
+        self._last = now
+
+    def finish(self, status_code: int) -> None:
+        """Set the final status and derive the outcome from the Linear calls counted so far"""
+        self.timings[-1] = time.perf_counter() - self._started
+        self.status_code = status_code
+        if status_code >= 500 and status_code != 503:
+            self.outcome = "error"
+        elif status_code >= 400:
+            self.outcome = "rejected"
+        elif self.outcome != "duplicate":
+            if self.linear_failures:
+                self.outcome = "partial" if self.linear_updates else "linear_error"
+            elif self.linear_updates:
+                self.outcome = "updated"
+
+    def count_linear_call(self, mutation: bool, failed: bool) -> None:
+        """Count one call to Linear made for this delivery; reads only count when they fail"""
+        if failed:
+            self.linear_failures += 1
+        elif mutation:
+            self.linear_updates += 1
+
+trace_var: ContextVar[Optional[EventTrace]] = ContextVar("event_trace", default=None)
+
+def note_issue_key(issue_key: str) -> None:
+    """Add an extracted Linear issue key to the current delivery's trace, if any"""
+    trace = trace_var.get()
+    if trace is not None and issue_key not in trace.issue_keys:
+        trace.issue_keys.append(issue_key)
+
+def repository_of(payload: Any) -> Optional[str]:
+    """Full name of the repository in a raw or validated GitHub payload"""
+    if isinstance(payload, dict):
+        repository = payload.get("repository")
+        return repository.get("full_name") if isinstance(repository, dict) else None
+    repository = getattr(payload, "repository", None)
+    return getattr(repository, "full_name", None)
+
+class EventHistory:
+    """
+    Ring buffer of recently processed webhook deliveries
+
+    Entries are stored column-wise in preallocated arrays rather than as
+    objects: delivery ids as 16 raw UUID bytes, event types and repositories
+    as indexes into a table of interned strings, timings as float32
+    milliseconds. An entry takes about 70 bytes plus its issue keys (shared
+    between entries with the same keys), so the default EVENT_HISTORY_SIZE of
+    200000 entries fits in roughly 15 MB. Recording overwrites the oldest
+    slot in place and allocates nothing but the trace itself.
+
+    UUID delivery ids are also indexed in an open-addressing hash table of
+    slot numbers (4 bytes per bucket, two buckets per entry), so a lookup by
+    delivery id does not scan. Other queries scan newest first and stop after
+    EVENT_HISTORY_SCAN_LIMIT entries (default 50000), which bounds the time
+    one query can hold the event loop.
+
+    Only touched from the event loop; not thread-safe.
+    """
+
+    # Event types and repositories beyond this many distinct values are recorded as "?"
+    MAX_STRINGS = 65535
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.capacity = capacity or int(os.getenv("EVENT_HISTORY_SIZE", "200000"))
+        self._next = 0
+        self.size = 0
+        self._received_at = array("d", [0.0]) * self.capacity
+        self._delivery_ids = bytearray(16 * self.capacity)
+        # Delivery ids that are not UUIDs (rare; e.g. from replays), by slot
+        self._other_ids: Dict[int, Optional[str]] = {}
+        self._event_types = array("H", [0]) * self.capacity
+        self._repositories = array("H", [0]) * self.capacity
+        self._issue_keys: List[Optional[str]] = [None] * self.capacity
+        self._outcomes = bytearray(self.capacity)
+        self._status_codes = array("H", [0]) * self.capacity
+        self._linear_updates = array("H", [0]) * self.capacity
+        self._linear_failures = array("H", [0]) * self.capacity
+        self._timings = array("f", [0.0]) * (self.capacity * len(STAGES))
+        self._strings: List[str] = ["?"]
+        self._string_ids: Dict[str, int] = {"?": 0}
+        self.scan_limit = int(os.getenv("EVENT_HISTORY_SCAN_LIMIT", "50000"))
+        buckets = 1 << (2 * self.capacity - 1).bit_length()
+        self._mask = buckets - 1
+        self._index = array("i", [-1]) * buckets
+
+    def _bucket(self, delivery_bytes: bytes) -> int:
+        # Version 4 UUIDs are random, so their leading bytes hash well enough
+        return int.from_bytes(delivery_bytes[:8], "little") & self._mask
+
+    def _index_add(self, slot: int) -> None:
+        bucket = self._bucket(self._delivery_ids[slot * 16:slot * 16 + 16])
+        while self._index[bucket] != -1:
+            bucket = (bucket + 1) & self._mask
+        self._index[bucket] = slot
+
+    def _index_remove(self, slot: int) -> None:
+        bucket = self._bucket(self._delivery_ids[slot * 16:slot * 16 + 16])
+        while self._index[bucket] != slot:
+            bucket = (bucket + 1) & self._mask
+        # Shift later members of the probe run back so lookups never stop early
+        hole, probe = bucket, bucket
+        while True:
+            probe = (probe + 1) & self._mask
+            moved = self._index[probe]
+            if moved == -1:
+                break
+            home = self._bucket(self._delivery_ids[moved * 16:moved * 16 + 16])
+            if (probe - home) & self._mask >= (probe - hole) & self._mask:
+                self._index[hole] = moved
+                hole = probe
+        self._index[hole] = -1
+
+    def _slots_for(self, delivery_id: str) -> List[int]:
+        """Slots holding a delivery id, newest first"""
+        try:
+            delivery_bytes = uuid.UUID(delivery_id).bytes
+        except ValueError:
+            slots = [slot for slot, other in self._other_ids.items() if other == delivery_id]
+        else:
+            slots = []
+            bucket = self._bucket(delivery_bytes)
+            while self._index[bucket] != -1:
+                slot = self._index[bucket]
+                if self._delivery_ids[slot * 16:slot * 16 + 16] == delivery_bytes:
+                    slots.append(slot)
+                bucket = (bucket + 1) & self._mask
+        return sorted(slots, key=lambda slot: (self._next - 1 - slot) % self.capacity)
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        index = self._string_ids.get(value)
+        if index is None:
+            if len(self._strings) >= self.MAX_STRINGS:
+                return 0
+            index = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = index
+        return index
+
+    def record(self, trace: EventTrace) -> None:
+        """Store a finished trace, overwriting the oldest entry once full"""
+        slot = self._next
+        if self.size == self.capacity and slot not in self._other_ids:
+            self._index_remove(slot)
+        self._next = (slot + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+        self._received_at[slot] = trace.received_at
+        self._other_ids.pop(slot, None)
+        try:
+            self._delivery_ids[slot * 16:slot * 16 + 16] = uuid.UUID(trace.delivery_id).bytes
+            self._index_add(slot)
+        except (TypeError, ValueError):
+            self._delivery_ids[slot * 16:slot * 16 + 16] = bytes(16)
+            self._other_ids[slot] = trace.delivery_id
+        self._event_types[slot] = self._intern(trace.event_type)
+        self._repositories[slot] = self._intern(trace.repository)
+        self._issue_keys[slot] = sys.intern(",".join(trace.issue_keys)) if trace.issue_keys else None
+        self._outcomes[slot] = _OUTCOME_CODES[trace.outcome]
+        self._status_codes[slot] = trace.status_code
+        self._linear_updates[slot] = min(trace.linear_updates, 65535)
+        self._linear_failures[slot] = min(trace.linear_failures, 65535)
+        base = slot * len(STAGES)
+        for offset, seconds in enumerate(trace.timings):
+            self._timings[base + offset] = seconds * 1000
+
+    def _delivery_id(self, slot: int) -> Optional[str]:
+        if slot in self._other_ids:
+            return self._other_ids[slot]
+        return str(uuid.UUID(bytes=bytes(self._delivery_ids[slot * 16:slot * 16 + 16])))
+
+    def _entry(self, slot: int) -> Dict[str, Any]:
+        keys = self._issue_keys[slot]
+        base = slot * len(STAGES)
+        return {
+            "delivery_id": self._delivery_id(slot),
+            "event_type": self._strings[self._event_types[slot]],
+            "repository": self._strings[self._repositories[slot]] if self._repositories[slot] else None,
+            "issue_keys": keys.split(",") if keys else [],
+            "outcome": OUTCOMES[self._outcomes[slot]],
+            "status_code": self._status_codes[slot],
+            "linear_updates": self._linear_updates[slot],
+            "linear_failures": self._linear_failures[slot],
+            "received_at": datetime.fromtimestamp(self._received_at[slot], tz=timezone.utc),
+            "timings_ms": {stage: round(self._timings[base + offset], 3) for offset, stage in enumerate(STAGES)}
+        }
+
+    def query(
+        self,
+        delivery_id: Optional[str] = None,
+        event_type: Optional[str] = None,
+        repository: Optional[str] = None,
+        issue_key: Optional[str] = None,
+        outcome: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Find recorded deliveries, newest first
+
+        A delivery_id is looked up directly; without one, only the newest
+        scan_limit entries are searched.
+
+        Args:
+            delivery_id: Only the delivery with this X-GitHub-Delivery id
+            event_type: Only this X-GitHub-Event type
+            repository: Only events for this repository (owner/name)
+            issue_key: Only events that mentioned this Linear issue key
+            outcome: Only entries with this outcome (see OUTCOMES)
+            since: Only deliveries received at or after this time
+            limit: Maximum number of entries returned
+
+        Returns:
+            List[Dict[str, Any]]: Matching entries
+        """
+        # Filters on interned columns compare integers; unknown values match nothing
+        event_type_id = self._string_ids.get(event_type, -1) if event_type else None
+        repository_id = self._string_ids.get(repository, -1) if repository else None
+        outcome_code = _OUTCOME_CODES.get(outcome, -1) if outcome else None
+        since_ts = since.timestamp() if since else None
+        if delivery_id:
+            slots = self._slots_for(delivery_id)
+        else:
+            slots = ((self._next - 1 - age) % self.capacity for age in range(min(self.size, self.scan_limit)))
+
+        matches = []
+        for slot in slots:
+            if since_ts is not None and self._received_at[slot] < since_ts:
+                continue
+            if event_type_id is not None and self._event_types[slot] != event_type_id:
+                continue
+            if repository_id is not None and self._repositories[slot] != repository_id:
+                continue
+            if outcome_code is not None and self._outcomes[slot] != outcome_code:
+                continue
+            if issue_key and issue_key not in (self._issue_keys[slot] or "").split(","):
+                continue
+            matches.append(self._entry(slot))
+            if len(matches) >= limit:
+                break
+        return matches
+
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the buffer's columns"""
+        columns = (
+            self._received_at, self._event_types, self._repositories, self._status_codes,
+            self._linear_updates, self._linear_failures, self._timings, self._index
+        )
+        total = sum(column.itemsize * len(column) for column in columns)
+        total += len(self._delivery_ids) + len(self._outcomes) + sys.getsizeof(self._issue_keys)
+        return total + sum(sys.getsizeof(keys) for keys in set(self._issue_keys) if keys)
+
+_history: Optional[EventHistory] = None
+
+def get_event_history() -> EventHistory:
+    """Return the process-wide event history, building it on first use"""
+    global _history
+    if _history is None:
+        _history = EventHistory()
+    return _history
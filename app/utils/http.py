@@ -0,0 +1,167 @@
+import os
+import gzip
+import hashlib
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Iterable, Tuple
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.models.linear import LinearProject
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Recently encoded bodies keyed by (path, etag, accepted encoding), so
+# unconditional polls of unchanged state skip serialization and compression
+_BODY_CACHE_SIZE = 32
+_body_cache: "OrderedDict[Tuple[str, str, str], Tuple[str, bytes]]" = OrderedDict()
+
+def projects_etag(projects: Iterable[LinearProject]) -> str:
+    """
+    Build a strong ETag for a set of projects
+
+    Args:
+        projects: Projects included in the response
+
+    Returns:
+        str: Quoted ETag derived from project ids and updated_at values
+    """
+    digest = hashlib.sha256()
+    for project_id, updated_at in sorted((p.id, p.updated_at.isoformat()) for p in projects):
+        digest.update(f"{project_id}:{updated_at}\n".encode('utf-8'))
+    return f'"{digest.hexdigest()[:32]}"'
+
+def projects_last_modified(projects: Iterable[LinearProject]) -> Optional[datetime]:
+    """
+    Return the most recent updated_at of a set of projects
+
+    Removals do not move this value, so list clients should prefer If-None-Match.
+    """
+    timestamps = [p.updated_at for p in projects]
+    if not timestamps:
+        return None
+    latest = max(timestamps)
+    if latest.tzinfo is None:
+        latest = latest.replace(tzinfo=timezone.utc)
+    return latest.astimezone(timezone.utc).replace(microsecond=0)
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current representation
+
+    If-None-Match takes precedence over If-Modified-Since (RFC 9110 section 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return _strip_encoding(etag) in {_strip_encoding(tag) for tag in candidates}
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+def _strip_encoding(etag: str) -> str:
+    for suffix in ('-gzip"', '-br"'):
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+def _negotiate_encoding(accept_encoding: str) -> str:
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return "identity"
+
+def _encode(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+def _encoded_body(request: Request, model: BaseModel, etag: str, requested: str) -> Tuple[str, bytes]:
+    """Serialize and compress a model for the negotiated encoding, through the body cache"""
+    key = (request.url.path, etag, requested)
+    cached = _body_cache.get(key)
+    if cached is not None:
+        _body_cache.move_to_end(key)
+        return cached
+    min_bytes = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+    body = model.model_dump_json().encode('utf-8')
+    encoding = requested if len(body) >= min_bytes else "identity"
+    cached = _body_cache[key] = (encoding, _encode(body, encoding))
+    if len(_body_cache) > _BODY_CACHE_SIZE:
+        _body_cache.popitem(last=False)
+    return cached
+
+def conditional_json_response(
+    request: Request,
+    model: BaseModel,
+    etag: str,
+    last_modified: Optional[datetime] = None
+) -> Response:
+    """
+    Build a JSON response honouring conditional request headers
+
+    Unchanged state is answered with an empty 304. Otherwise the model is
+    serialized and, when larger than RESPONSE_COMPRESS_MIN_BYTES, compressed
+    with brotli (if installed) or gzip according to Accept-Encoding. A 304
+    carries the same encoding-specific ETag as the 200 it stands in for.
+
+    Args:
+        request: Incoming request carrying the conditional headers
+        model: Response model to serialize
+        etag: Strong ETag of the identity representation
+        last_modified: Last modification time of the represented state
+
+    Returns:
+        Response: 304 or 200 response with validators set
+    """
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+
+    requested = _negotiate_encoding(request.headers.get("accept-encoding", ""))
+    not_modified = is_not_modified(request, etag, last_modified)
+    if not_modified and requested == "identity":
+        headers["ETag"] = etag
+        return Response(status_code=304, headers=headers)
+
+    # Whether the body is compressed depends on its size, so a 304 for a
+    # compressing client needs the (usually cached) encoded body too
+    encoding, body = _encoded_body(request, model, etag, requested)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+        etag = f'{etag[:-1]}-{encoding}"'
+    headers["ETag"] = etag
+    if not_modified:
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
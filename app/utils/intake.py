@@ -0,0 +1,99 @@
+import os
+import json
+import tempfile
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request
+
+from app.utils.github import WebhookVerifier
+
+class WebhookBody:
+    """
+    Authenticated raw webhook body
+
+    Small bodies stay in memory; bodies past the spool threshold live in a
+    temporary file that is removed on close().
+    """
+
+    def __init__(self, spool: "tempfile.SpooledTemporaryFile", size: int):
+        self._spool = spool
+        self.size = size
+
+    @property
+    def spilled(self) -> bool:
+        """True if the body was written to disk"""
+        return bool(getattr(self._spool, "_rolled", False))
+
+    def read(self) -> bytes:
+        """Return the full body"""
+        self._spool.seek(0)
+        return self._spool.read()
+
+    def json(self) -> Any:
+        """Decode the body as JSON"""
+        self._spool.seek(0)
+        return json.load(self._spool)
+
+    def close(self) -> None:
+        """Release the in-memory buffer or temporary file"""
+        self._spool.close()
+
+async def read_webhook_body(
+    request: Request,
+    signature: str,
+    verifier: WebhookVerifier,
+    max_bytes: Optional[int] = None,
+    spool_bytes: Optional[int] = None
+) -> WebhookBody:
+    """
+    Stream a webhook body from the ASGI receive channel while verifying it
+
+    Every chunk is fed to the HMAC as it arrives, so the signature is known as
+    soon as the last byte is read and nothing is parsed before then.
+
+    Args:
+        request: Incoming webhook request; its body must not have been read yet
+        signature: The signature from X-Hub-Signature-256 header
+        verifier: Verifier holding the active webhook secrets
+        max_bytes: Maximum accepted body size (GITHUB_WEBHOOK_MAX_BYTES)
+        spool_bytes: Size past which the body is spilled to a temporary file (GITHUB_WEBHOOK_SPOOL_BYTES)
+
+    Returns:
+        WebhookBody: The authenticated body
+
+    Raises:
+        HTTPException: 413 once the body exceeds max_bytes, 401 on a bad signature
+    """
+    if max_bytes is None:
+        max_bytes = int(os.getenv("GITHUB_WEBHOOK_MAX_BYTES", str(25 * 1024 * 1024)))
+    if spool_bytes is None:
+        spool_bytes = int(os.getenv("GITHUB_WEBHOOK_SPOOL_BYTES", str(1024 * 1024)))
+
+    if not signature or not signature.startswith("sha256="):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(status_code=413, detail="Payload too large")
+
+    check = verifier.start()
+    spool = tempfile.SpooledTemporaryFile(max_size=spool_bytes)
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(status_code=413, detail="Payload too large")
+            check.update(chunk)
+            spool.write(chunk)
+
+        body = WebhookBody(spool, size)
+        if not check.verify(signature):
+            # The secret may have been rotated on disk since this request started
+            if not (verifier.reload_if_changed() and verifier.verify(signature, body.read())):
+                raise HTTPException(status_code=401, detail="Invalid signature")
+        spool.seek(0)
+        return body
+    except BaseException:
+        spool.close()
+        raise
@@ -0,0 +1,54 @@
+import os
+import hmac
+import hashlib
+import time
+from typing import Optional
+
+def verify_linear_webhook(signature: str, payload: bytes, secret: Optional[str] = None) -> bool:
+    """
+    Verify Linear webhook signature
+
+    Args:
+        signature: The hex HMAC-SHA256 digest from the Linear-Signature header
+        payload: Raw request body bytes
+        secret: Signing secret of the webhook (LINEAR_WEBHOOK_SECRET if omitted)
+
+    Returns:
+        bool: True if signature is valid, False otherwise
+
+    Raises:
+        ValueError: If no secret is given and LINEAR_WEBHOOK_SECRET is not set
+    """
+    if not signature:
+        return False
+
+    secret = (secret or os.getenv("LINEAR_WEBHOOK_SECRET", "")).encode('utf-8')
+    if not secret:
+        raise ValueError("LINEAR_WEBHOOK_SECRET environment variable is not set")
+
+    expected_signature = hmac.new(
+        secret,
+        payload,
+        hashlib.sha256
+    ).hexdigest()
+
+    return hmac.compare_digest(signature, expected_signature)
+
+def is_fresh_linear_webhook(webhook_timestamp: Optional[int], tolerance: Optional[float] = None) -> bool:
+    """
+    Check that a Linear webhook was sent recently, to reject replayed deliveries
+
+    Args:
+        webhook_timestamp: The webhookTimestamp field of the payload (UNIX milliseconds)
+        tolerance: Maximum accepted age in seconds (LINEAR_WEBHOOK_TOLERANCE_SECONDS, 0 disables)
+
+    Returns:
+        bool: True if the delivery is within tolerance, False otherwise
+    """
+    if tolerance is None:
+        tolerance = float(os.getenv("LINEAR_WEBHOOK_TOLERANCE_SECONDS", "60"))
+    if not tolerance:
+        return True
+    if webhook_timestamp is None:
+        return False
+    return abs(time.time() - webhook_timestamp / 1000) <= tolerance
@@ -0,0 +1,215 @@
+import os
+import sys
+import copy
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+
+# Correlation ids of the request being handled, attached to every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+delivery_id_var: ContextVar[Optional[str]] = ContextVar("delivery_id", default=None)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+class ContextFilter(logging.Filter):
+    """Copy the current request and delivery ids onto each record"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        record.delivery_id = delivery_id_var.get()
+        return True
+
+class SamplingFilter(logging.Filter):
+    """
+    Rate-limit repetitive warnings and errors
+
+    Records are grouped by logger, level and message template (the format
+    string before arguments are applied), so "Error updating Linear issue %s"
+    is one group whatever the issue. Each group passes at most burst records
+    per window; the first record let through after a suppressed stretch
+    carries the number of records dropped. Records below min_level are never
+    sampled. Safe to use from several threads.
+    """
+
+    def __init__(self, burst: int = 5, window: float = 10.0, min_level: int = logging.WARNING):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self.min_level = min_level
+        # (logger, level, template) -> [window start, passed, suppressed]
+        self._groups: Dict[Tuple[str, int, str], list] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self.min_level or self.burst <= 0:
+            return True
+        key = (record.name, record.levelno, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            group = self._groups.get(key)
+            if group is None or now - group[0] >= self.window:
+                suppressed = group[2] if group else 0
+                if len(self._groups) > 10000:
+                    self._groups.clear()
+                self._groups[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if group[1] < self.burst:
+                group[1] += 1
+                return True
+            group[2] += 1
+            return False
+
+class TextFormatter(logging.Formatter):
+    """The classic text format, with correlation ids and sampling counts appended when present"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        extras = []
+        if getattr(record, "request_id", None):
+            extras.append(f"request_id={record.request_id}")
+        if getattr(record, "delivery_id", None):
+            extras.append(f"delivery_id={record.delivery_id}")
+        if getattr(record, "suppressed", None):
+            extras.append(f"suppressed={record.suppressed}")
+        return f"{message} [{' '.join(extras)}]" if extras else message
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for name in ("request_id", "delivery_id", "suppressed"):
+            value = getattr(record, name, None)
+            if value:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that never blocks the caller
+
+    The message is merged with its arguments in the calling thread (so
+    mutable arguments are captured as they were), on a copy of the record so
+    other handlers still see the original; the formatter and the write to the
+    stream run in the listener thread. When the queue is full the record is
+    dropped and counted instead of waiting for the writer.
+    """
+
+    def __init__(self, log_queue: "queue.Queue"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_atexit_registered = False
+
+def configure_logging() -> None:
+    """
+    Configure the root logger for the service
+
+    LOG_LEVEL sets the level, LOG_FORMAT selects text (default) or json, and
+    LOG_ASYNC (default true) moves formatting and writing to a background
+    thread behind a queue of LOG_QUEUE_SIZE records (default 10000).
+    LOG_SAMPLE_BURST warnings/errors per message (default 5) are kept every
+    LOG_SAMPLE_WINDOW_SECONDS (default 10); 0 disables sampling.
+    """
+    global _listener, _atexit_registered
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+    formatter = JsonFormatter() if os.getenv("LOG_FORMAT", "text").lower() == "json" else TextFormatter(TEXT_FORMAT)
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    if os.getenv("LOG_ASYNC", "true").lower() in ("1", "true", "yes"):
+        handler = DroppingQueueHandler(queue.Queue(int(os.getenv("LOG_QUEUE_SIZE", "10000"))))
+        _listener = logging.handlers.QueueListener(handler.queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        if not _atexit_registered:
+            atexit.register(shutdown_logging)
+            _atexit_registered = True
+    else:
+        handler = stream_handler
+
+    handler.addFilter(ContextFilter())
+    handler.addFilter(SamplingFilter(
+        burst=int(os.getenv("LOG_SAMPLE_BURST", "5")),
+        window=float(os.getenv("LOG_SAMPLE_WINDOW_SECONDS", "10"))
+    ))
+    root.addHandler(handler)
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that gives every request a request id for log correlation
+
+    The id is taken from an incoming X-Request-ID header or generated, set in
+    request_id_var for the duration of the request and echoed in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+        header = (b"x-request-id", request_id.encode("latin-1"))
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [header]
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,48 @@
+import threading
+from collections import Counter
+from typing import Dict, Union
+
+class Metrics:
+    """
+    In-process counters and gauges exposed on /metrics
+
+    Counter names follow Prometheus conventions (linear_requests_total, ...);
+    gauges hold the last value set (admission_limit, ...). Each worker process
+    keeps its own values.
+    """
+
+    def __init__(self):
+        self._counters: Counter = Counter()
+        self._gauges: Dict[str, Union[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        """Add amount to a counter"""
+        with self._lock:
+            self._counters[name] += amount
+
+    def set(self, name: str, value: Union[int, float]) -> None:
+        """Set a gauge"""
+        self._gauges[name] = value
+
+    def get(self, name: str) -> Union[int, float]:
+        """Return the current value of a counter or gauge"""
+        if name in self._gauges:
+            return self._gauges[name]
+        return self._counters[name]
+
+    def snapshot(self) -> Dict[str, Union[int, float]]:
+        """Return a copy of every counter and gauge"""
+        with self._lock:
+            values = dict(self._counters)
+        values.update(self._gauges)
+        return values
+
+    def reset(self) -> None:
+        """Zero every counter and drop every gauge"""
+        with self._lock:
+            self._counters.clear()
+        self._gauges.clear()
+
+# Process-wide metrics registry
+metrics = Metrics()
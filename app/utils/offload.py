@@ -0,0 +1,150 @@
+import os
+import json
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type, TYPE_CHECKING
+
+from pydantic import BaseModel, ValidationError
+
+from app.models.github import PushEvent, PullRequestEvent, WorkflowRunEvent
+from app.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from app.utils.intake import WebhookBody
+
+logger = logging.getLogger(__name__)
+
+EVENT_MODELS: Dict[str, Type[BaseModel]] = {
+    "push": PushEvent,
+    "pull_request": PullRequestEvent,
+    "workflow_run": WorkflowRunEvent
+}
+
+@dataclass
+class ParsedPayload:
+    """
+    A decoded webhook body
+
+    payload is the raw dict for bodies parsed on the event loop, and the
+    validated event model for bodies parsed in the process pool (only the
+    fields the handlers use are sent back). error holds the validation error
+    of an offloaded body, to be reported like any other processing error.
+    """
+    action: Optional[str]
+    payload: Any
+    error: Optional[str] = None
+
+def parse_payload(event_type: str, raw: bytes) -> ParsedPayload:
+    """
+    Decode and validate a webhook body; runs in a pool worker process
+
+    Args:
+        event_type: The X-GitHub-Event header
+        raw: The authenticated request body
+
+    Returns:
+        ParsedPayload: The action and the validated event model
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        # JSONDecodeError pickles the whole document; send back a plain error
+        raise ValueError("Invalid JSON payload") from None
+
+    action = payload.get("action") if isinstance(payload, dict) else None
+    model = EVENT_MODELS.get(event_type)
+    if model is None:
+        return ParsedPayload(action, {})
+    try:
+        return ParsedPayload(action, model.model_validate(payload))
+    except ValidationError as e:
+        return ParsedPayload(action, None, error=str(e))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+def offload_threshold() -> int:
+    """Body size in bytes from which parsing moves to the process pool (0 disables)"""
+    return int(os.getenv("WEBHOOK_OFFLOAD_BYTES", str(256 * 1024)))
+
+def get_offload_pool() -> ProcessPoolExecutor:
+    """
+    Get the process pool that parses large webhook bodies
+
+    WEBHOOK_OFFLOAD_WORKERS sets its size (default 2, at most the number of
+    CPUs). Every uvicorn worker has its own pool, so the default stays small
+    rather than multiplying a per-CPU pool by the worker count. The pool is
+    created on the first oversized body, not at startup, so workers that
+    never see one never spawn it. Workers are spawned rather than forked,
+    since the server process already runs the event loop and the logging
+    thread.
+    """
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = int(os.getenv("WEBHOOK_OFFLOAD_WORKERS", "0")) or min(2, os.cpu_count() or 1)
+        _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+def shutdown_offload_pool() -> None:
+    """Stop the pool's worker processes"""
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+async def warm_offload_pool() -> None:
+    """Start every pool worker and import the event models in it, for benchmarks"""
+    if offload_threshold() <= 0:
+        return
+    pool = get_offload_pool()
+    loop = asyncio.get_running_loop()
+    sample = json.dumps({"action": "warmup"}).encode()
+    await asyncio.gather(*(
+        loop.run_in_executor(pool, parse_payload, "ping", sample)
+        for _ in range(_pool_workers)
+    ))
+
+async def parse_webhook_body(event_type: str, body: "WebhookBody") -> ParsedPayload:
+    """
+    Decode a webhook body, in the process pool if it is large
+
+    Bodies smaller than WEBHOOK_OFFLOAD_BYTES (default 256 KiB) are decoded on
+    the event loop and validated later by the handler, as the IPC round trip
+    would cost more than it saves. Larger bodies are decoded and validated in
+    a worker process so the loop keeps serving other requests; if the pool has
+    broken, the body is parsed in a thread and a fresh pool is started next
+    time.
+
+    Args:
+        event_type: The X-GitHub-Event header
+        body: The authenticated request body
+
+    Returns:
+        ParsedPayload: The action and the payload dict or validated event
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    threshold = offload_threshold()
+    if threshold <= 0 or body.size < threshold:
+        payload = body.json()
+        action = payload.get("action") if isinstance(payload, dict) else None
+        return ParsedPayload(action, payload)
+
+    raw = body.read()
+    try:
+        parsed = await asyncio.get_running_loop().run_in_executor(get_offload_pool(), parse_payload, event_type, raw)
+    except BrokenProcessPool:
+        logger.warning("Webhook parsing pool is broken, parsing in a thread")
+        metrics.incr("webhook_offload_failures_total")
+        shutdown_offload_pool()
+        return await asyncio.to_thread(parse_payload, event_type, raw)
+    metrics.incr("webhook_offloaded_total")
+    return parsed
@@ -0,0 +1,142 @@
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any
+
+from app.models.linear import LinearIssue
+from app.models.readiness import ProjectReadiness
+from app.utils.state import StateBackend, get_state_backend
+
+# Linear workflow state types (and names, for payloads without a type) that close an issue
+CLOSED_ISSUE_STATES = {"completed", "canceled", "cancelled", "done"}
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def _summarize(project_id: str, record: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the readiness snapshot from a project's raw state"""
+    open_issues = len(record["open_issues"])
+    pull_requests = record["pull_requests"].values()
+    open_pull_requests = sum(1 for state in pull_requests if state == "open")
+    merged_pull_requests = sum(1 for state in pull_requests if state == "merged")
+
+    blockers = []
+    if open_issues:
+        blockers.append(f"{open_issues} open issue{'s' if open_issues != 1 else ''}")
+    if open_pull_requests:
+        blockers.append(f"{open_pull_requests} open pull request{'s' if open_pull_requests != 1 else ''}")
+    for branch, ci in sorted(record["ci"].items()):
+        if ci["status"] != "completed":
+            blockers.append(f"CI {ci['status']} on {branch}")
+
+    return ProjectReadiness(
+        project_id=project_id,
+        ready=not blockers,
+        blockers=blockers,
+        open_issues=open_issues,
+        open_pull_requests=open_pull_requests,
+        merged_pull_requests=merged_pull_requests,
+        ci=sorted(record["ci"].values(), key=lambda ci: ci["branch"]),
+        updated_at=record["updated_at"]
+    ).model_dump(mode="json")
+
+class ReadinessTracker:
+    """
+    Incrementally maintained launch readiness per Linear project
+
+    Linear issue webhooks, pull request events and workflow runs each update
+    only the project they belong to, and the readiness snapshot is recomputed
+    from that project's small state record at write time. Reads are a single
+    backend lookup. State lives in the shared StateBackend so every worker
+    contributes to and serves the same rollup.
+    """
+
+    def __init__(self, backend: Optional[StateBackend] = None, namespace: str = "readiness"):
+        self._backend = backend
+        self._project_prefix = f"{namespace}:project:"
+        self._issue_prefix = f"{namespace}:issue:"
+
+    @property
+    def backend(self) -> StateBackend:
+        if self._backend is None:
+            self._backend = get_state_backend()
+        return self._backend
+
+    def _update(self, project_id: str, func) -> None:
+        def apply(record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+            record = record or {}
+            record = {
+                "open_issues": dict(record.get("open_issues", {})),
+                "pull_requests": dict(record.get("pull_requests", {})),
+                "ci": dict(record.get("ci", {}))
+            }
+            func(record)
+            record["updated_at"] = _now()
+            record["summary"] = _summarize(project_id, record)
+            return record
+        self.backend.update(self._project_prefix + project_id, apply)
+
+    def get(self, project_id: str) -> Optional[ProjectReadiness]:
+        """Return the readiness snapshot of a project, or None if nothing is known about it"""
+        record = self.backend.get(self._project_prefix + project_id)
+        return ProjectReadiness.model_validate(record["summary"]) if record else None
+
+    def apply_issue(self, issue: LinearIssue) -> None:
+        """Account for a created or updated Linear issue"""
+        state = (issue.state_type or issue.state or "").lower()
+        is_open = state not in CLOSED_ISSUE_STATES
+        previous = self.backend.get(self._issue_prefix + issue.id)
+        if previous and previous["project_id"] and previous["project_id"] != issue.project_id:
+            self._update(previous["project_id"], lambda record: record["open_issues"].pop(issue.id, None))
+        if issue.project_id:
+            def track(record: Dict[str, Any]) -> None:
+                if is_open:
+                    record["open_issues"][issue.id] = 1
+                else:
+                    record["open_issues"].pop(issue.id, None)
+            self._update(issue.project_id, track)
+        self.backend.set(self._issue_prefix + issue.id, {"project_id": issue.project_id, "open": is_open})
+
+    def remove_issue(self, issue_id: str) -> None:
+        """Account for a deleted Linear issue"""
+        previous = self.backend.get(self._issue_prefix + issue_id)
+        if previous and previous["project_id"]:
+            self._update(previous["project_id"], lambda record: record["open_issues"].pop(issue_id, None))
+        self.backend.delete(self._issue_prefix + issue_id)
+
+    def apply_pull_request(self, project_id: str, repository: str, number: int, state: str, branch: Optional[str] = None) -> None:
+        """
+        Record the merge state of a pull request
+
+        Once a pull request is merged or closed its head branch's CI status
+        no longer matters and is dropped, so the per-branch map only holds
+        branches with open work.
+
+        Args:
+            project_id: Linear project the pull request belongs to
+            repository: Repository full name
+            number: Pull request number
+            state: open, merged or closed
+            branch: Head branch of the pull request
+        """
+        def track(record: Dict[str, Any]) -> None:
+            record["pull_requests"][f"{repository}#{number}"] = state
+            if branch and state != "open":
+                record["ci"].pop(branch, None)
+        self._update(project_id, track)
+
+    def apply_workflow_run(self, project_id: str, branch: str, status: str, progress: Optional[float], head_sha: Optional[str], updated_at: datetime) -> None:
+        """Record the latest combined CI status of a branch, ignoring results older than the one held"""
+        def track(record: Dict[str, Any]) -> None:
+            current = record["ci"].get(branch)
+            if current and datetime.fromisoformat(current["updated_at"]) > updated_at:
+                return
+            record["ci"][branch] = {
+                "branch": branch,
+                "status": status,
+                "progress": progress,
+                "head_sha": head_sha,
+                "updated_at": updated_at.isoformat()
+            }
+        self._update(project_id, track)
+
+# Process-wide tracker fed by the GitHub and Linear webhook routers
+readiness_tracker = ReadinessTracker()
@@ -0,0 +1,210 @@
+import os
+import re
+import json
+import time
+import fnmatch
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True)
+class Route:
+    """Linear destination for GitHub activity"""
+    project_id: Optional[str] = None
+    team_id: Optional[str] = None
+
+@dataclass
+class _Rule:
+    order: int
+    route: Route
+    repository: Optional[str]
+    repository_glob: Optional[Pattern]
+    branch: Optional[Pattern]
+    issue_prefix: Optional[str]
+
+    def matches(self, repository: Optional[str], branch: Optional[str], issue_prefix: Optional[str]) -> bool:
+        if self.repository_glob is not None and not (repository and self.repository_glob.match(repository)):
+            return False
+        if self.branch is not None and not (branch and self.branch.match(branch)):
+            return False
+        if self.issue_prefix is not None and self.issue_prefix != issue_prefix:
+            return False
+        return True
+
+class RoutingTable:
+    """
+    Compiled repository / branch / issue-key routing to Linear projects and teams
+
+    Routes are tried in file order and the first match wins. Each route may
+    set any of:
+
+    - repository: an exact full name (org/repo), a prefix ending in * (org/*),
+      or any other glob
+    - branch: a glob over the branch name (release/*)
+    - issue_prefix: the team key of a Linear issue id (ABC for ABC-123)
+
+    Exact repositories and issue prefixes are dict lookups and * prefixes live
+    in a character trie, so only the handful of routes that can apply to an
+    event are ever tested; routing cost does not grow with the number of
+    repositories configured.
+    """
+
+    def __init__(self, routes: List[Dict[str, Any]]):
+        self._exact: Dict[str, List[_Rule]] = {}
+        self._trie: Dict[str, Any] = {}
+        self._issue_prefixes: Dict[str, List[_Rule]] = {}
+        self._scan: List[_Rule] = []
+        self._size = 0
+        for order, spec in enumerate(routes):
+            self._add(order, spec)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _add(self, order: int, spec: Dict[str, Any]) -> None:
+        repository = spec.get("repository")
+        branch = spec.get("branch")
+        issue_prefix = spec.get("issue_prefix")
+        route = Route(project_id=spec.get("project_id"), team_id=spec.get("team_id"))
+        if route.project_id is None and route.team_id is None:
+            raise ValueError(f"Route {order} has neither project_id nor team_id")
+
+        prefix = None
+        repository_glob = None
+        if repository and repository.endswith("*") and not any(c in repository[:-1] for c in "*?["):
+            prefix = repository[:-1]
+        elif repository and any(c in repository for c in "*?["):
+            repository_glob = re.compile(fnmatch.translate(repository))
+
+        rule = _Rule(
+            order=order,
+            route=route,
+            repository=repository,
+            repository_glob=repository_glob,
+            branch=re.compile(fnmatch.translate(branch)) if branch else None,
+            issue_prefix=issue_prefix
+        )
+        if prefix is not None:
+            node = self._trie
+            for char in prefix:
+                node = node.setdefault(char, {})
+            node.setdefault("", []).append(rule)
+        elif repository and repository_glob is None:
+            self._exact.setdefault(repository, []).append(rule)
+        elif repository_glob is None and issue_prefix:
+            self._issue_prefixes.setdefault(issue_prefix, []).append(rule)
+        else:
+            # Globs and branch-only routes cannot be indexed
+            self._scan.append(rule)
+        self._size += 1
+
+    def match(self, repository: Optional[str] = None, branch: Optional[str] = None, issue_key: Optional[str] = None) -> Optional[Route]:
+        """
+        Find the route for a GitHub event
+
+        Args:
+            repository: Repository full name
+            branch: Branch name, without refs/heads/
+            issue_key: Linear issue id referenced by the event (ABC-123)
+
+        Returns:
+            Optional[Route]: The first matching route, or None
+        """
+        issue_prefix = issue_key.split("-", 1)[0] if issue_key else None
+        best: Optional[_Rule] = None
+
+        def consider(rules: List[_Rule]) -> None:
+            nonlocal best
+            for rule in rules:
+                if best is not None and rule.order >= best.order:
+                    return
+                if rule.matches(repository, branch, issue_prefix):
+                    best = rule
+                    return
+
+        if repository:
+            consider(self._exact.get(repository, ()))
+            node = self._trie
+            consider(node.get("", ()))
+            for char in repository:
+                node = node.get(char)
+                if node is None:
+                    break
+                consider(node.get("", ()))
+        if issue_prefix:
+            consider(self._issue_prefixes.get(issue_prefix, ()))
+        consider(self._scan)
+        return best.route if best else None
+
+class ProjectRouter:
+    """
+    Routing table loaded from PROJECT_ROUTES_FILE and reloaded when it changes
+
+    The file is JSON: {"routes": [{"repository": "org/api", "project_id": "...",
+    "team_id": "..."}, ...]} (a bare list of routes is accepted too). A file
+    that fails to parse is logged and the previous table is kept.
+    """
+
+    # Minimum seconds between modification time checks of the routes file
+    RELOAD_CHECK_INTERVAL = 1.0
+
+    def __init__(self, routes_file: Optional[str] = None, routes: Optional[List[Dict[str, Any]]] = None):
+        self.routes_file = routes_file
+        self.table = RoutingTable(routes or [])
+        self._file_mtime: Optional[float] = None
+        self._last_reload_check = 0.0
+        if routes_file:
+            self.reload()
+
+    @classmethod
+    def from_env(cls) -> "ProjectRouter":
+        """Build a router from the file named by PROJECT_ROUTES_FILE, if any"""
+        return cls(routes_file=os.getenv("PROJECT_ROUTES_FILE") or None)
+
+    def reload(self) -> bool:
+        """Re-read and compile the routes file; returns False and keeps the current table on error"""
+        try:
+            mtime = os.stat(self.routes_file).st_mtime
+            with open(self.routes_file, encoding='utf-8') as f:
+                config = json.load(f)
+            routes = config["routes"] if isinstance(config, dict) else config
+            table = RoutingTable(routes)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Could not load project routes from %s: %s", self.routes_file, e)
+            return False
+        self.table = table
+        self._file_mtime = mtime
+        logger.info("Loaded %d project routes from %s", len(table), self.routes_file)
+        return True
+
+    def reload_if_changed(self) -> bool:
+        """Reload the routes file if it changed, checking at most once per interval"""
+        if not self.routes_file:
+            return False
+        now = time.monotonic()
+        if now - self._last_reload_check < self.RELOAD_CHECK_INTERVAL:
+            return False
+        self._last_reload_check = now
+        try:
+            mtime = os.stat(self.routes_file).st_mtime
+        except OSError:
+            return False
+        if mtime == self._file_mtime:
+            return False
+        return self.reload()
+
+    def match(self, repository: Optional[str] = None, branch: Optional[str] = None, issue_key: Optional[str] = None) -> Optional[Route]:
+        """Route a GitHub event, picking up routes file changes first"""
+        self.reload_if_changed()
+        return self.table.match(repository, branch, issue_key)
+
+_router: Optional[ProjectRouter] = None
+
+def get_project_router() -> ProjectRouter:
+    """Return the process-wide project router, building it on first use"""
+    global _router
+    if _router is None:
+        _router = ProjectRouter.from_env()
+    return _router
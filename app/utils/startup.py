@@ -0,0 +1,146 @@
+import os
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from app.utils.deadline import deadline, budget, remaining
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+def _process_age() -> Optional[float]:
+    """Seconds since this process was started, from /proc where available"""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 is the start time in clock ticks since boot; the command
+            # name (field 2) may contain spaces, so split after its closing paren
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+class StartupState:
+    """
+    Timing and outcome of the startup path, reported on /ready
+
+    Records how long the interpreter took to reach the application import,
+    the import itself, and each warm-up step. The process only reports ready
+    once warm-up has finished.
+    """
+
+    def __init__(self):
+        self.import_started = time.perf_counter()
+        # Interpreter start and server imports before the application module
+        self.before_import = _process_age()
+        self.imported: Optional[float] = None
+        self.warmup_started: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.ready_at is not None
+
+    def mark_imported(self) -> None:
+        self.imported = time.perf_counter()
+        metrics.set("startup_import_seconds", round(self.imported - self.import_started, 4))
+
+    def as_dict(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"ready": self.ready}
+        if self.before_import is not None:
+            report["before_import_seconds"] = round(self.before_import, 4)
+        if self.imported is not None:
+            report["import_seconds"] = round(self.imported - self.import_started, 4)
+        if self.ready_at is not None and self.warmup_started is not None:
+            report["warmup_seconds"] = round(self.ready_at - self.warmup_started, 4)
+            report["total_seconds"] = round(self.ready_at - self.import_started + (self.before_import or 0.0), 4)
+        report["steps"] = {name: round(seconds, 4) for name, seconds in self.steps.items()}
+        if self.errors:
+            report["errors"] = dict(self.errors)
+        return report
+
+# Created when app.main is imported, so import timing starts there
+startup = StartupState()
+
+def _warm_validators() -> None:
+    """Build and exercise the validators and serializers used on the request path"""
+    from app.clients.linear import issue_from_node, project_from_node
+    from app.models.github import PushEvent, PullRequestEvent, WorkflowRunEvent
+    from app.models.linear import ProjectListResponse
+    from app.utils.webhook_test import SAMPLE_PUSH_EVENT, SAMPLE_PR_EVENT, SAMPLE_WORKFLOW_EVENT
+
+    PushEvent.model_validate(SAMPLE_PUSH_EVENT)
+    PullRequestEvent.model_validate(SAMPLE_PR_EVENT)
+    WorkflowRunEvent.model_validate(SAMPLE_WORKFLOW_EVENT)
+    node = {
+        "id": "warmup",
+        "name": "Warm-up",
+        "description": None,
+        "state": "planned",
+        "createdAt": "2024-01-01T00:00:00Z",
+        "updatedAt": "2024-01-01T00:00:00Z",
+        "targetDate": None,
+        "progress": 0.0
+    }
+    project = project_from_node(node)
+    issue_from_node({**node, "title": "Warm-up", "state": {"name": "Todo", "type": "unstarted"}})
+    ProjectListResponse(success=True, message="", data=[project]).model_dump_json()
+
+async def warm_up() -> None:
+    """
+    Prepare everything the first request would otherwise pay for
+
+    Builds the webhook verifier, routing table and state backend, exercises
+    the pydantic validators and serializers and opens a pooled connection to Linear. The whole warm-up runs under the STARTUP_BUDGET_SECONDS deadline
+    (default 10); a step that fails is recorded and logged, and the process
+    still becomes ready, falling back to doing that work on first use.
+    """
+    from app.clients.linear import LinearClient, open_shared_http_client
+    from app.clients.registry import get_workspace_registry
+    from app.utils.github import get_webhook_verifier
+    from app.utils.history import get_event_history
+    from app.utils.routing import get_project_router
+    from app.utils.state import get_state_backend
+
+    async def open_linear_connection() -> None:
+        if not os.getenv("LINEAR_API_KEY"):
+            raise ValueError("LINEAR_API_KEY is not set")
+        await LinearClient(http_client=open_shared_http_client()).warm_up()
+
+    steps = [
+        ("workspaces", get_workspace_registry),
+        ("webhook_verifier", get_webhook_verifier),
+        ("project_routes", get_project_router),
+        ("state_backend", get_state_backend),
+        ("event_history", get_event_history),
+        ("validators", _warm_validators),
+        ("linear_connection", open_linear_connection),
+    ]
+
+    startup.warmup_started = time.perf_counter()
+    with deadline(budget("startup")):
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                result = step()
+                if hasattr(result, "__await__"):
+                    await result
+            except Exception as e:
+                startup.errors[name] = f"{type(e).__name__}: {e}"
+                logger.warning("Warm-up step %s failed: %s", name, e)
+            startup.steps[name] = time.perf_counter() - started
+        over_budget = (remaining() or 0.0) <= 0
+
+    startup.ready_at = time.perf_counter()
+    report = startup.as_dict()
+    metrics.set("startup_warmup_seconds", report["warmup_seconds"])
+    metrics.set("startup_total_seconds", report["total_seconds"])
+    logger.info(
+        "Ready in %.3fs (before import %.3fs, import %.3fs, warm-up %.3fs)",
+        report["total_seconds"], report.get("before_import_seconds", 0.0), report.get("import_seconds", 0.0), report["warmup_seconds"]
+    )
+    if over_budget:
+        logger.warning("Warm-up exceeded its %.1fs startup budget", budget("startup"))
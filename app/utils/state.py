@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class StateBackend(ABC):
+    """
+    Key/value store for state that should be shared by every worker
+
+    Used for cache entries, dedup keys and rate-limit budgets. Values must be
+    JSON-serializable. A ttl (seconds) makes an entry expire; None keeps it
+    until it is overwritten or deleted.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored under key, or None"""
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove key if present"""
+
+    @abstractmethod
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store value only if key is absent; returns True if it was stored"""
+
+    @abstractmethod
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """Atomically add amount to an integer counter and return the new value; ttl applies on creation"""
+
+    @abstractmethod
+    def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        """Atomically replace the value of key with func(current value) and return it"""
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> None:
+        """Remove every key starting with prefix"""
+
+    @abstractmethod
+    def get_prefix(self, prefix: str) -> Dict[str, Any]:
+        """Return every live key starting with prefix and its value"""
+
+class MemoryStateBackend(StateBackend):
+    """Per-process backend; each worker has its own copy. Not thread-safe."""
+
+    # Sweep out expired entries roughly once per this many writes; entries
+    # that are never read again (e.g. dedup keys) would otherwise stay forever
+    PURGE_EVERY = 1000
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Any, Optional[float]]] = {}
+        self._writes = 0
+
+    def _live(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._live(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, time.time() + ttl if ttl else None)
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._purge()
+
+    def _purge(self) -> None:
+        now = time.time()
+        for key in [key for key, (_, expires) in self._data.items() if expires is not None and expires <= now]:
+            del self._data[key]
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        self.set(key, value, ttl)
+        return True
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        entry = self._live(key)
+        if entry is None:
+            self.set(key, amount, ttl)
+            return amount
+        value = entry[0] + amount
+        self._data[key] = (value, entry[1])
+        return value
+
+    def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        entry = self._live(key)
+        value = func(entry[0] if entry else None)
+        self.set(key, value, ttl)
+        return value
+
+    def delete_prefix(self, prefix: str) -> None:
+        for key in [key for key in self._data if key.startswith(prefix)]:
+            self._data.pop(key, None)
+
+    def get_prefix(self, prefix: str) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            key: value for key, (value, expires) in self._data.items()
+            if key.startswith(prefix) and (expires is None or expires > now)
+        }
+
+class SQLiteStateBackend(StateBackend):
+    """
+    Backend shared by all worker processes on a host through one SQLite file
+
+    The database runs in WAL mode so readers never block the writer. Each
+    process (and thread) opens its own connection; read-modify-write
+    operations run in an IMMEDIATE transaction so they are atomic across
+    workers. Calls are synchronous and take tens of microseconds on a local
+    disk, which is cheap enough to make from the event loop. So that a lock
+    held by another worker cannot stall this worker's loop, a call waits at
+    most busy_timeout seconds (STATE_SQLITE_BUSY_TIMEOUT_SECONDS, default
+    0.1) for it and then raises sqlite3.OperationalError.
+    """
+
+    # Purge expired rows roughly once per this many writes
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str, busy_timeout: Optional[float] = None):
+        self.path = path
+        if busy_timeout is None:
+            busy_timeout = float(os.getenv("STATE_SQLITE_BUSY_TIMEOUT_SECONDS", "0.1"))
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def _read(self, connection: sqlite3.Connection, key: str) -> Optional[Any]:
+        row = connection.execute(
+            "SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write(self, connection: sqlite3.Connection, key: str, value: Any, ttl: Optional[float]) -> None:
+        connection.execute(
+            "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value), time.time() + ttl if ttl else None)
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            connection.execute("DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+
+    def _transaction(self, func: Callable[[sqlite3.Connection], Any]) -> Any:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(connection)
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        return result
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._read(self._connection(), key)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self._write(self._connection(), key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def add(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        def add_if_absent(connection: sqlite3.Connection) -> bool:
+            if self._read(connection, key) is not None:
+                return False
+            self._write(connection, key, value, ttl)
+            return True
+        return self._transaction(add_if_absent)
+
+    def incr(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        def increment(connection: sqlite3.Connection) -> int:
+            row = connection.execute(
+                "SELECT value, expires_at FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                self._write(connection, key, amount, ttl)
+                return amount
+            value = json.loads(row[0]) + amount
+            connection.execute("UPDATE state SET value = ? WHERE key = ?", (json.dumps(value), key))
+            return value
+        return self._transaction(increment)
+
+    def update(self, key: str, func: Callable[[Optional[Any]], Any], ttl: Optional[float] = None) -> Any:
+        def read_modify_write(connection: sqlite3.Connection) -> Any:
+            value = func(self._read(connection, key))
+            self._write(connection, key, value, ttl)
+            return value
+        return self._transaction(read_modify_write)
+
+    # LIKE narrows the scan but ignores ASCII case; substr() makes the match exact
+    _PREFIX_MATCH = "key LIKE ? ESCAPE '\\' AND substr(key, 1, ?) = ?"
+
+    @staticmethod
+    def _prefix_args(prefix: str) -> Tuple[str, int, str]:
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return like, len(prefix), prefix
+
+    def delete_prefix(self, prefix: str) -> None:
+        self._connection().execute(f"DELETE FROM state WHERE {self._PREFIX_MATCH}", self._prefix_args(prefix))
+
+    def get_prefix(self, prefix: str) -> Dict[str, Any]:
+        rows = self._connection().execute(
+            f"SELECT key, value FROM state WHERE {self._PREFIX_MATCH} AND (expires_at IS NULL OR expires_at > ?)",
+            (*self._prefix_args(prefix), time.time())
+        ).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+def consume_budget(backend: StateBackend, name: str, limit: int, window: float, cost: int = 1) -> bool:
+    """
+    Take cost units from a fixed-window budget shared by all workers
+
+    Args:
+        backend: Backend holding the counters
+        name: Budget name, e.g. linear:requests
+        limit: Units available per window
+        window: Window length in seconds
+        cost: Units to take
+
+    Returns:
+        bool: True if the units were available, False if the window is exhausted
+    """
+    window_start = int(time.time() // window)
+    used = backend.incr(f"budget:{name}:{window_start}", cost, ttl=window * 2)
+    return used <= limit
+
+_backend: Optional[StateBackend] = None
+
+def create_state_backend() -> StateBackend:
+    """Build the backend selected by STATE_BACKEND (memory or sqlite)"""
+    kind = os.getenv("STATE_BACKEND", "memory").lower()
+    if kind == "sqlite":
+        path = os.getenv("STATE_SQLITE_PATH") or os.path.join(tempfile.gettempdir(), "launch_readiness_state.sqlite3")
+        logger.info("Using SQLite state backend at %s", path)
+        return SQLiteStateBackend(path)
+    if kind != "memory":
+        raise ValueError(f"Unknown STATE_BACKEND: {kind}")
+    return MemoryStateBackend()
+
+def get_state_backend() -> StateBackend:
+    """Return the process-wide state backend, building it on first use"""
+    global _backend
+    if _backend is None:
+        _backend = create_state_backend()
+    return _backend
@@ -1,6 +1,10 @@
 import hmac
 import hashlib
 import json
+import bisect
+import random
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
 
 def generate_github_signature(payload: dict, secret: str) -> str:
     """
@@ -21,6 +25,8 @@ def generate_github_signature(payload: dict, secret: str) -> str:
 # Example payloads for testing
 SAMPLE_PUSH_EVENT = {
     "ref": "refs/heads/main",
+    "before": "0000000000000000000000000000000000000000",
+    "after": "abc123def456abc123def456abc123def456abc1",
     "repository": {
         "id": 123,
         "name": "test-repo",
@@ -127,4 +133,132 @@ SAMPLE_WORKFLOW_EVENT = {
         "id": 456,
         "type": "User"
     }
-} 
\ No newline at end of file
+} 
+
+class IssueKeySampler:
+    """
+    Draws Linear issue keys (e.g. ABC-123) with a Zipf-like popularity skew
+
+    Args:
+        prefixes: Team key prefixes to draw from
+        keys_per_prefix: Number of distinct issue numbers per prefix
+        skew: Zipf exponent; 0 is uniform, larger values concentrate on hot issues
+        key_probability: Probability that a text references an issue at all
+    """
+
+    def __init__(self, prefixes: Sequence[str] = ("ABC", "XYZ"), keys_per_prefix: int = 500, skew: float = 1.1, key_probability: float = 0.8):
+        self.keys = [f"{prefix}-{number}" for prefix in prefixes for number in range(1, keys_per_prefix + 1)]
+        self.key_probability = key_probability
+        ranks = list(range(1, len(self.keys) + 1))
+        random.Random(0).shuffle(ranks)
+        weights = [1.0 / rank ** skew for rank in ranks]
+        total = sum(weights)
+        self._cumulative = []
+        running = 0.0
+        for weight in weights:
+            running += weight / total
+            self._cumulative.append(running)
+
+    def sample(self, rng: random.Random) -> Optional[str]:
+        """Return an issue key, or None for text without one"""
+        if rng.random() >= self.key_probability:
+            return None
+        index = bisect.bisect_left(self._cumulative, rng.random())
+        return self.keys[min(index, len(self.keys) - 1)]
+
+def _sha(rng: random.Random) -> str:
+    return "%040x" % rng.getrandbits(160)
+
+def _user(rng: random.Random) -> dict:
+    user_id = rng.randint(1, 5000)
+    return {"login": f"user{user_id}", "id": user_id, "type": "User"}
+
+def _repository(rng: random.Random, repositories: int) -> dict:
+    repo_id = rng.randint(1, repositories)
+    owner = {"login": "org", "id": 1, "type": "Organization"}
+    return {"id": repo_id, "name": f"repo-{repo_id}", "full_name": f"org/repo-{repo_id}", "private": True, "owner": owner}
+
+def _timestamp() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _with_key(text: str, key: Optional[str]) -> str:
+    return f"{text} {key}" if key else text
+
+def build_push_event(rng: random.Random, issue_keys: IssueKeySampler, commits: int = 3, repositories: int = 50) -> dict:
+    """Build a push event payload with the given number of commits"""
+    repository = _repository(rng, repositories)
+    after = _sha(rng)
+    commit_list: List[dict] = []
+    for _ in range(commits):
+        sha = _sha(rng)
+        message = _with_key(f"feat: change {sha[:7]}", issue_keys.sample(rng))
+        commit_list.append({
+            "id": sha,
+            "message": f"{message}\n\nDetailed description of the change.",
+            "timestamp": _timestamp(),
+            "url": f"https://github.com/{repository['full_name']}/commit/{sha}",
+            "author": _user(rng)
+        })
+    return {
+        "ref": f"refs/heads/{rng.choice(['main', 'develop', 'release/1.0'])}",
+        "before": _sha(rng),
+        "after": after,
+        "repository": repository,
+        "commits": commit_list,
+        "sender": _user(rng)
+    }
+
+def build_pull_request_event(rng: random.Random, issue_keys: IssueKeySampler, repositories: int = 50) -> dict:
+    """Build a pull request event payload"""
+    repository = _repository(rng, repositories)
+    number = rng.randint(1, 10000)
+    action = rng.choice(["opened", "synchronize", "closed", "reopened", "edited"])
+    merged = action == "closed" and rng.random() < 0.8
+    key = issue_keys.sample(rng)
+    return {
+        "action": action,
+        "pull_request": {
+            "id": rng.randint(1, 10 ** 9),
+            "number": number,
+            "state": "closed" if action == "closed" else "open",
+            "title": _with_key(f"Change #{number}", key),
+            "body": f"Implements {key}" if key else "No linked issue",
+            "html_url": f"https://github.com/{repository['full_name']}/pull/{number}",
+            "user": _user(rng),
+            "created_at": _timestamp(),
+            "updated_at": _timestamp(),
+            "merged_at": _timestamp() if merged else None,
+            "head": {"ref": _with_key("feature/change", key).replace(" ", "-").lower(), "sha": _sha(rng)},
+            "base": {"ref": "main", "sha": _sha(rng)}
+        },
+        "repository": repository,
+        "sender": _user(rng)
+    }
+
+def build_workflow_run_event(rng: random.Random, issue_keys: IssueKeySampler, repositories: int = 50) -> dict:
+    """Build a workflow_run event payload in a random lifecycle stage"""
+    repository = _repository(rng, repositories)
+    action = rng.choice(["requested", "in_progress", "completed"])
+    status = {"requested": "queued", "in_progress": "in_progress", "completed": "completed"}[action]
+    conclusion = rng.choice(["success", "success", "success", "failure", "cancelled"]) if action == "completed" else None
+    run_id = rng.randint(1, 10 ** 9)
+    key = issue_keys.sample(rng)
+    return {
+        "action": action,
+        "workflow_run": {
+            "id": run_id,
+            "name": rng.choice(["CI", "Lint", "Integration Tests", "Deploy Preview"]),
+            "status": status,
+            "conclusion": conclusion,
+            "workflow_id": rng.randint(1, 20),
+            "head_branch": f"feature/{key.lower()}" if key else "main",
+            "head_sha": _sha(rng),
+            "run_number": rng.randint(1, 5000),
+            "event": "push",
+            "url": f"https://github.com/{repository['full_name']}/actions/runs/{run_id}",
+            "created_at": _timestamp(),
+            "updated_at": _timestamp()
+        },
+        "repository": repository,
+        "sender": _user(rng)
+    }
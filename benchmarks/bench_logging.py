@@ -0,0 +1,88 @@
+"""
+Event-loop stall caused by logging under an error burst
+
+Runs a probe coroutine that sleeps 1 ms at a time and records how late it
+wakes up, while handler coroutines emit bursts of error logs to a slow sink
+(a stream whose writes take --write-latency, like a blocked stderr pipe or a
+slow terminal). Compares the stdlib synchronous StreamHandler with the queued
+pipeline from app/utils/log.py, with and without sampling.
+
+Usage:
+    python -m benchmarks.bench_logging [--records N] [--write-latency SECONDS]
+"""
+import os
+import io
+import time
+import asyncio
+import logging
+import argparse
+import statistics
+
+from app.utils import log
+
+class SlowStream(io.TextIOBase):
+    """Text stream whose every write blocks for a fixed time"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.writes = 0
+
+    def write(self, text: str) -> int:
+        time.sleep(self.latency)
+        self.writes += 1
+        return len(text)
+
+async def run_burst(records: int, concurrency: int) -> list:
+    logger = logging.getLogger("bench.handler")
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def handler(worker: int):
+        for i in range(records // concurrency):
+            logger.error("Error updating Linear issue %s: %s", f"ABC-{worker}-{i}", "HTTP 502")
+            await asyncio.sleep(0)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.gather(*(handler(worker) for worker in range(concurrency)))
+    done.set()
+    await probe_task
+    return lags
+
+def configure(mode: str, stream: SlowStream) -> None:
+    os.environ["LOG_ASYNC"] = "false" if mode == "sync" else "true"
+    os.environ["LOG_SAMPLE_BURST"] = "5" if mode == "queued+sampled" else "0"
+    log.configure_logging()
+    # Point the (possibly queued) stream handler at the slow sink
+    handlers = log._listener.handlers if log._listener else logging.getLogger().handlers
+    for stream_handler in handlers:
+        stream_handler.setStream(stream)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=2000, help="Error records per burst")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent handler coroutines")
+    parser.add_argument("--write-latency", type=float, default=0.0002, help="Seconds each write to the sink blocks")
+    args = parser.parse_args()
+
+    print(f"{'mode':>16} {'burst (ms)':>11} {'lag p50 (ms)':>13} {'lag p99 (ms)':>13} {'lag max (ms)':>13} {'writes':>7}")
+    for mode in ("sync", "queued", "queued+sampled"):
+        stream = SlowStream(args.write_latency)
+        configure(mode, stream)
+        start = time.perf_counter()
+        lags = sorted(asyncio.run(run_burst(args.records, args.concurrency)))
+        elapsed = time.perf_counter() - start
+        log.shutdown_logging()
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        print(
+            f"{mode:>16} {elapsed * 1000:>11.1f} {statistics.median(lags) * 1000:>13.2f} "
+            f"{p99 * 1000:>13.2f} {lags[-1] * 1000:>13.2f} {stream.writes:>7}"
+        )
+
+if __name__ == "__main__":
+    main()
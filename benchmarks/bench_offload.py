@@ -0,0 +1,103 @@
+"""
+Event-loop stall and throughput when parsing large webhook bodies
+
+Parses a batch of multi-megabyte push payloads concurrently through
+app.utils.offload.parse_webhook_body while a probe coroutine measures how
+late the loop wakes up. Compares inline parsing (offload disabled) with the
+process pool at the configured threshold.
+
+Usage:
+    python -m benchmarks.bench_offload [--bodies N] [--commits N] [--workers N]
+"""
+import os
+import copy
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+
+from app.utils import offload
+from app.utils.intake import WebhookBody
+from app.utils.webhook_test import SAMPLE_PUSH_EVENT
+
+def build_body(commits: int) -> bytes:
+    payload = copy.deepcopy(SAMPLE_PUSH_EVENT)
+    template = payload["commits"][0]
+    payload["commits"] = []
+    for i in range(commits):
+        commit = copy.deepcopy(template)
+        commit["id"] = f"{i:040x}"
+        commit["message"] = f"ABC-{i} Change {i}"
+        # File lists make up most of a large push payload; the model drops them
+        commit["modified"] = [f"src/package_{i % 50}/module_{j}.py" for j in range(200)]
+        commit["added"] = commit["modified"][:50]
+        payload["commits"].append(commit)
+    return json.dumps(payload).encode()
+
+def make_body(raw: bytes) -> WebhookBody:
+    spool = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    spool.write(raw)
+    spool.seek(0)
+    return WebhookBody(spool, len(raw))
+
+async def run(raw: bytes, bodies: int, concurrency: int) -> tuple:
+    lags = []
+    done = asyncio.Event()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(time.perf_counter() - start - 0.001)
+
+    async def parse_one():
+        async with semaphore:
+            body = make_body(raw)
+            try:
+                await offload.parse_webhook_body("push", body)
+            finally:
+                body.close()
+        # Let the probe (standing in for other requests) run between bodies
+        await asyncio.sleep(0)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(parse_one() for _ in range(bodies)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    return elapsed, sorted(lags)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bodies", type=int, default=40, help="Bodies to parse per mode")
+    parser.add_argument("--commits", type=int, default=500, help="Commits per push payload")
+    parser.add_argument("--concurrency", type=int, default=16, help="Bodies parsed at once")
+    parser.add_argument("--workers", type=int, default=0, help="Pool workers (default: WEBHOOK_OFFLOAD_WORKERS default)")
+    args = parser.parse_args()
+
+    raw = build_body(args.commits)
+    os.environ["WEBHOOK_OFFLOAD_WORKERS"] = str(args.workers)
+    print(f"body size {len(raw) / 1024 / 1024:.1f} MiB, {os.cpu_count()} CPUs")
+    print(f"{'mode':>8} {'bodies/s':>9} {'lag p50 (ms)':>13} {'lag p99 (ms)':>13} {'lag max (ms)':>13}")
+    for mode, threshold in (("inline", "0"), ("pool", str(256 * 1024))):
+        os.environ["WEBHOOK_OFFLOAD_BYTES"] = threshold
+
+        async def measure():
+            if threshold != "0":
+                await offload.warm_offload_pool()
+            return await run(raw, args.bodies, args.concurrency)
+
+        elapsed, lags = asyncio.run(measure())
+        offload.shutdown_offload_pool()
+        p99 = lags[min(len(lags) - 1, int(len(lags) * 0.99))]
+        print(
+            f"{mode:>8} {args.bodies / elapsed:>9.1f} {statistics.median(lags) * 1000:>13.2f} "
+            f"{p99 * 1000:>13.2f} {lags[-1] * 1000:>13.2f}"
+        )
+
+if __name__ == "__main__":
+    main()
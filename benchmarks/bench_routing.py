@@ -0,0 +1,46 @@
+"""
+Micro-benchmark for repository-to-project routing
+
+Builds a routing table with many exact repositories, organization prefixes,
+issue-key prefixes and a few branch globs, then times RoutingTable.match for
+events that hit each kind of route and for events that match nothing.
+
+Usage:
+    python -m benchmarks.bench_routing [--repositories N] [--orgs N]
+"""
+import argparse
+
+from app.utils.routing import RoutingTable
+from benchmarks.timing import time_per_call
+
+def build_routes(repositories: int, orgs: int):
+    routes = [{"repository": "*", "branch": "release/*", "team_id": "team-release"}]
+    routes += [{"issue_prefix": f"K{i}", "project_id": f"proj-key-{i}"} for i in range(200)]
+    routes += [{"repository": f"org{i % orgs}/repo{i}", "project_id": f"proj-{i}", "team_id": f"team-{i % orgs}"} for i in range(repositories)]
+    routes += [{"repository": f"org{i}/*", "team_id": f"team-{i}"} for i in range(orgs)]
+    routes += [{"repository": "*-archive", "project_id": "proj-archive"}]
+    return routes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repositories", type=int, default=5000, help="Exact repository routes")
+    parser.add_argument("--orgs", type=int, default=100, help="Organization prefix routes")
+    args = parser.parse_args()
+
+    table = RoutingTable(build_routes(args.repositories, args.orgs))
+    cases = [
+        ("exact repository", ("org7/repo4007", "feature/ABC-1", "ABC-1")),
+        ("org prefix", ("org7/unlisted", "main", None)),
+        ("issue prefix", ("elsewhere/repo", "main", "K42-7")),
+        ("branch glob", ("org7/repo7", "release/1.2", None)),
+        ("no match", ("nobody/nothing", "main", "ZZZ-1")),
+    ]
+    print(f"{len(table)} routes")
+    print(f"{'case':>18} {'per match (us)':>15}  route")
+    for name, event in cases:
+        route = table.match(*event)
+        per_call = time_per_call(lambda: table.match(*event))
+        print(f"{name:>18} {per_call * 1e6:>15.2f}  {route}")
+
+if __name__ == "__main__":
+    main()
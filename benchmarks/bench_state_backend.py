@@ -0,0 +1,87 @@
+"""
+Benchmark of the per-process and SQLite state backends
+
+Part 1 measures single-process operation latency for each backend.
+Part 2 simulates N uvicorn workers serving a Zipf-distributed key space with
+read-through caching (a miss stands for an upstream Linear call) and reports
+the combined hit rate: per-process caches warm up separately, so their hit
+rate falls as the worker count grows, while the shared backend does not.
+
+Usage:
+    python -m benchmarks.bench_state_backend [--workers 1,2,4,8] [--requests 5000]
+"""
+import os
+import random
+import argparse
+import tempfile
+import multiprocessing
+
+from app.utils.state import MemoryStateBackend, SQLiteStateBackend
+from benchmarks.timing import time_per_call
+
+def _operation_costs(backend) -> dict:
+    backend.set("existing", {"id": "proj-1", "state": "in_progress"})
+    counter = iter(range(10 ** 9))
+    operations = {
+        "get": lambda: backend.get("existing"),
+        "set": lambda: backend.set("written", {"id": "proj-1"}),
+        "add (dedup)": lambda: backend.add(f"delivery:{next(counter)}", 1, ttl=60),
+        "incr (budget)": lambda: backend.incr("budget", 1, ttl=60),
+    }
+    costs = {}
+    for name, operation in operations.items():
+        costs[name] = time_per_call(operation, repeat=3)
+    return costs
+
+def _worker(kind: str, path: str, requests: int, keys: int, seed: int, results) -> None:
+    backend = MemoryStateBackend() if kind == "memory" else SQLiteStateBackend(path)
+    rng = random.Random(seed)
+    weights = [1.0 / rank for rank in range(1, keys + 1)]
+    hits = 0
+    for key in rng.choices(range(keys), weights, k=requests):
+        if backend.get(f"project:{key}") is not None:
+            hits += 1
+        else:
+            backend.set(f"project:{key}", {"id": key})
+    results.put(hits)
+
+def _hit_rate(kind: str, workers: int, requests: int, keys: int) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "state.sqlite3")
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(kind, path, requests // workers, keys, seed, results))
+            for seed in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        hits = sum(results.get() for _ in processes)
+        for process in processes:
+            process.join()
+    return hits / (requests // workers * workers)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts")
+    parser.add_argument("--requests", type=int, default=20000, help="Total requests across all workers")
+    parser.add_argument("--keys", type=int, default=2000, help="Distinct cache keys")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "memory": MemoryStateBackend(),
+            "sqlite": SQLiteStateBackend(os.path.join(directory, "state.sqlite3")),
+        }
+        print(f"{'operation':>14} " + " ".join(f"{name + ' (us)':>12}" for name in backends))
+        costs = {name: _operation_costs(backend) for name, backend in backends.items()}
+        for operation in costs["memory"]:
+            print(f"{operation:>14} " + " ".join(f"{costs[name][operation] * 1e6:>12.2f}" for name in backends))
+
+    print(f"\n{'workers':>8} {'memory hit rate':>16} {'sqlite hit rate':>16}")
+    for workers in [int(value) for value in args.workers.split(",")]:
+        memory = _hit_rate("memory", workers, args.requests, args.keys)
+        shared = _hit_rate("sqlite", workers, args.requests, args.keys)
+        print(f"{workers:>8} {memory:>16.1%} {shared:>16.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Micro-benchmark for GitHub webhook signature verification
+
+Compares the per-request cost of verify_github_webhook, which reads the
+secret from the environment and rebuilds the HMAC key schedule on every call,
+with WebhookVerifier, which clones a precomputed keyed HMAC state.
+
+Usage:
+    python -m benchmarks.bench_webhook_verify [--secrets N]
+"""
+import os
+import hmac
+import hashlib
+import argparse
+
+from app.utils.github import verify_github_webhook, WebhookVerifier
+from benchmarks.timing import time_per_call
+
+PAYLOAD_SIZES = [256, 4 * 1024, 64 * 1024, 1024 * 1024, 10 * 1024 * 1024]
+
+def _format_size(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size // (1024 * 1024)} MiB"
+    if size >= 1024:
+        return f"{size // 1024} KiB"
+    return f"{size} B"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--secrets", type=int, default=2, help="Active secrets in the verifier (rotation in progress)")
+    args = parser.parse_args()
+
+    secret = "benchmark_secret"
+    os.environ["GITHUB_WEBHOOK_SECRET"] = secret
+    # The matching secret is listed last; after the first success it is tried first
+    secrets = [f"retired_secret_{i}" for i in range(args.secrets - 1)] + [secret]
+    verifier = WebhookVerifier(secrets=secrets)
+
+    print(f"{'payload':>10} {'per-call env (us)':>18} {'verifier (us)':>14} {'speedup':>8}")
+    for size in PAYLOAD_SIZES:
+        payload = os.urandom(size)
+        signature = "sha256=" + hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
+        assert verify_github_webhook(signature, payload) and verifier.verify(signature, payload)
+
+        baseline = time_per_call(lambda: verify_github_webhook(signature, payload))
+        precomputed = time_per_call(lambda: verifier.verify(signature, payload))
+        print(f"{_format_size(size):>10} {baseline * 1e6:>18.2f} {precomputed * 1e6:>14.2f} {baseline / precomputed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,579 @@
+"""
+Soak test: long-running traffic against app.main:app with leak and drift detection
+
+Serves the application with uvicorn in a child process, so that its memory,
+descriptors and event loop are not shared with the load generator or the fake
+Linear GraphQL endpoint, which both run here. The app is driven at a fixed
+open-loop rate with GitHub webhooks (the samples used by tests/test_webhook.py
+plus randomized push/pull_request/workflow_run payloads), Linear issue
+webhooks and project/readiness reads. Every --sample-interval it records, for
+the app process:
+
+- RSS and its slope over the run
+- tracemalloc top allocators by growth since the end of warm-up
+- open sockets and file descriptors
+- event-loop lag (how late a 10 ms sleep wakes up)
+- request latency percentiles and error rate
+
+Samples taken during --warmup only establish the baseline. The run fails
+(exit code 1) when RSS growth, RSS slope, socket growth, latency drift, loop
+lag or error rate exceed their thresholds. The slope is only judged once the
+measured part of the run spans --min-slope-duration and --min-slope-samples;
+over a short run a few MB of allocator noise extrapolates to hundreds of MB
+per hour. Compress hours of traffic by raising --rate, or run for hours with
+--duration.
+
+Usage:
+    python -m benchmarks.soak --duration 3600 --rate 20 --report soak.json
+    python -m benchmarks.soak --payloads deliveries.jsonl  # replay_events.py archive format
+"""
+import os
+import gc
+import sys
+import json
+import time
+import uuid
+import hmac
+import random
+import signal
+import socket
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import uvicorn
+
+from app.utils.webhook_test import (
+    SAMPLE_PUSH_EVENT,
+    SAMPLE_PR_EVENT,
+    SAMPLE_WORKFLOW_EVENT,
+    IssueKeySampler,
+    build_push_event,
+    build_pull_request_event,
+    build_workflow_run_event
+)
+
+GITHUB_SECRET = "soak-github-secret"
+LINEAR_SECRET = "soak-linear-secret"
+PROJECT_IDS = [f"soak-proj-{i}" for i in range(20)]
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+def _project_node(project_id: str) -> Dict[str, Any]:
+    return {
+        "id": project_id,
+        "name": f"Project {project_id}",
+        "description": "Soak test project",
+        "state": "in_progress",
+        "createdAt": "2024-02-20T12:00:00Z",
+        "updatedAt": _now(),
+        "targetDate": None,
+        "progress": 50.0
+    }
+
+class FakeLinear:
+    """Minimal ASGI stand-in for the Linear GraphQL API"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests = 0
+
+    def _respond(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        if "issueCreate" in query:
+            issue_id = uuid.uuid4().hex
+            return {"data": {"issueCreate": {"success": True, "issue": {
+                "id": issue_id,
+                "identifier": f"SOAK-{self.requests}",
+                "title": variables.get("title", ""),
+                "description": variables.get("description"),
+                "state": {"name": "Todo", "type": "unstarted"},
+                "project": {"id": variables["projectId"]} if variables.get("projectId") else None,
+                "assignee": None,
+                "createdAt": _now(),
+                "updatedAt": _now()
+            }}}}
+        if "projectUpdate" in query:
+            return {"data": {"projectUpdate": {"success": True, "project": _project_node(variables.get("projectId", PROJECT_IDS[0]))}}}
+        if "projects" in query:
+            return {"data": {"projects": {"nodes": [_project_node(project_id) for project_id in PROJECT_IDS]}}}
+        return {"data": {"project": _project_node(variables.get("id", PROJECT_IDS[0]))}}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        request = json.loads(body or b"{}")
+        response = json.dumps(self._respond(request.get("query", ""), request.get("variables") or {})).encode()
+        await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": response})
+
+class TrafficSource:
+    """Signed requests drawn from the test samples, randomized builders and an optional archive"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.rng = random.Random(args.seed)
+        self.issue_keys = IssueKeySampler(prefixes=["SOAK", "ABC"], keys_per_prefix=200)
+        self.archive: List[Tuple[str, Dict[str, Any]]] = []
+        if args.payloads:
+            with open(args.payloads, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        headers = {key.lower(): value for key, value in (record.get("headers") or {}).items()}
+                        payload = record.get("payload", record.get("body"))
+                        self.archive.append((record.get("event") or headers.get("x-github-event"), json.loads(payload) if isinstance(payload, str) else payload))
+        self.samples = [("push", SAMPLE_PUSH_EVENT), ("pull_request", SAMPLE_PR_EVENT), ("workflow_run", SAMPLE_WORKFLOW_EVENT)]
+
+    def _github(self, event: str, payload: Dict[str, Any]) -> Tuple[str, str, Dict[str, str], Optional[bytes]]:
+        body = json.dumps(payload).encode()
+        signature = "sha256=" + hmac.new(GITHUB_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        headers = {
+            "Content-Type": "application/json",
+            "X-GitHub-Event": event,
+            "X-GitHub-Delivery": str(uuid.uuid4()),
+            "X-Hub-Signature-256": signature
+        }
+        return "POST", "/api/github/webhook", headers, body
+
+    def _linear_issue(self) -> Tuple[str, str, Dict[str, str], Optional[bytes]]:
+        key = self.issue_keys.sample(self.rng) or "SOAK-1"
+        payload = {
+            "action": self.rng.choice(["create", "update", "update", "remove"]),
+            "type": "Issue",
+            "webhookTimestamp": int(time.time() * 1000),
+            "data": {
+                "id": f"issue-{key}",
+                "identifier": key,
+                "title": f"Issue {key}",
+                "state": {"name": "In Progress", "type": self.rng.choice(["started", "completed"])},
+                "projectId": self.rng.choice(PROJECT_IDS),
+                "createdAt": "2024-02-20T12:00:00Z",
+                "updatedAt": _now()
+            }
+        }
+        body = json.dumps(payload).encode()
+        signature = hmac.new(LINEAR_SECRET.encode(), body, hashlib.sha256).hexdigest()
+        return "POST", "/api/linear/webhook", {"Linear-Signature": signature, "Linear-Event": "Issue"}, body
+
+    def next(self) -> Tuple[str, str, Dict[str, str], Optional[bytes]]:
+        """Return (method, path, headers, body) for the next request"""
+        roll = self.rng.random()
+        if roll < 0.05:
+            return self._github(*self.rng.choice(self.samples))
+        if roll < 0.35 and self.archive:
+            return self._github(*self.rng.choice(self.archive))
+        if roll < 0.65:
+            kind = self.rng.choice(["push", "pull_request", "workflow_run"])
+            builder = {"push": build_push_event, "pull_request": build_pull_request_event, "workflow_run": build_workflow_run_event}[kind]
+            return self._github(kind, builder(self.rng, self.issue_keys))
+        if roll < 0.8:
+            return self._linear_issue()
+        if roll < 0.9:
+            return "GET", "/api/linear/projects", {}, None
+        return "GET", f"/api/linear/projects/{self.rng.choice(PROJECT_IDS)}/readiness", {}, None
+
+def rss_bytes(pid: int) -> int:
+    """Resident set size of a process"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return 0
+
+def open_descriptors(pid: int) -> Tuple[int, int]:
+    """(sockets, all file descriptors) open in a process"""
+    sockets = total = 0
+    try:
+        for fd in os.listdir(f"/proc/{pid}/fd"):
+            total += 1
+            try:
+                if os.readlink(f"/proc/{pid}/fd/{fd}").startswith("socket:"):
+                    sockets += 1
+            except OSError:
+                pass
+    except OSError:
+        pass
+    return sockets, total
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def slope_per_hour(points: List[Tuple[float, float]]) -> float:
+    """Least-squares slope of (seconds, value) points, per hour"""
+    if len(points) < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / len(points)
+    mean_v = sum(v for _, v in points) / len(points)
+    denominator = sum((t - mean_t) ** 2 for t, _ in points)
+    if not denominator:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / denominator * 3600
+
+def bind(port: int = 0) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", port))
+    return sock
+
+def serve_app(args: argparse.Namespace) -> int:
+    """Child process: serve app.main:app on an inherited socket
+
+    SIGUSR1 collects garbage and writes the event-loop lag p99 since the
+    previous signal to <state-dir>/lag-<n>.json; SIGUSR2 dumps a tracemalloc
+    snapshot to <state-dir>/snapshot-<n>. Files are renamed into place, so the
+    harness can poll for them.
+    """
+    from app.main import app
+
+    tracemalloc.start(args.traceback_frames)
+    lags: List[float] = []
+    sequence = {"lag": 0, "snapshot": 0}
+
+    def publish(name: str, write) -> None:
+        path = os.path.join(args.state_dir, name)
+        write(path + ".tmp")
+        os.replace(path + ".tmp", path)
+
+    def on_lag(signum, frame):
+        gc.collect()
+        window = sorted(lags)
+        lags.clear()
+        sequence["lag"] += 1
+
+        def write(path):
+            with open(path, "w", encoding='utf-8') as f:
+                json.dump({"loop_lag_p99_ms": round(percentile(window, 0.99) * 1000, 2)}, f)
+        publish(f"lag-{sequence['lag']}.json", write)
+
+    def on_snapshot(signum, frame):
+        gc.collect()
+        sequence["snapshot"] += 1
+        publish(f"snapshot-{sequence['snapshot']}", tracemalloc.take_snapshot().dump)
+
+    signal.signal(signal.SIGUSR1, on_lag)
+    signal.signal(signal.SIGUSR2, on_snapshot)
+
+    async def probe_loop_lag():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - start - 0.01)
+
+    async def serve():
+        lag_task = asyncio.create_task(probe_loop_lag())
+        server = uvicorn.Server(uvicorn.Config(app, log_level="error", access_log=False))
+        try:
+            await server.serve(sockets=[socket.socket(fileno=args.serve_fd)])
+        finally:
+            lag_task.cancel()
+
+    asyncio.run(serve())
+    return 0
+
+class AppProcess:
+    """The app under test, served by `python -m benchmarks.soak --serve-fd` in a child process"""
+
+    def __init__(self, args: argparse.Namespace, sock: socket.socket, env: Dict[str, str]):
+        self.state_dir = tempfile.mkdtemp(prefix="soak-")
+        self.lag_samples = 0
+        self.snapshots = 0
+        command = [
+            sys.executable, "-m", "benchmarks.soak",
+            "--serve-fd", str(sock.fileno()),
+            "--state-dir", self.state_dir,
+            "--traceback-frames", str(args.traceback_frames)
+        ]
+        self.process = subprocess.Popen(command, env=env, pass_fds=[sock.fileno()])
+        self.pid = self.process.pid
+
+    async def _request(self, signum: int, name: str, timeout: float = 60.0) -> str:
+        path = os.path.join(self.state_dir, name)
+        self.process.send_signal(signum)
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(path):
+            if self.process.poll() is not None:
+                raise RuntimeError(f"App process exited with {self.process.returncode}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"App process did not write {name}")
+            await asyncio.sleep(0.01)
+        return path
+
+    async def loop_lag_p99_ms(self) -> float:
+        """Collect garbage in the app and return its loop lag p99 since the last call"""
+        self.lag_samples += 1
+        path = await self._request(signal.SIGUSR1, f"lag-{self.lag_samples}.json")
+        with open(path, encoding='utf-8') as f:
+            value = json.load(f)["loop_lag_p99_ms"]
+        os.remove(path)
+        return value
+
+    async def snapshot(self) -> tracemalloc.Snapshot:
+        self.snapshots += 1
+        path = await self._request(signal.SIGUSR2, f"snapshot-{self.snapshots}")
+        snapshot = tracemalloc.Snapshot.load(path)
+        os.remove(path)
+        return snapshot
+
+    def stop(self) -> None:
+        self.process.send_signal(signal.SIGINT)
+        try:
+            self.process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        for name in os.listdir(self.state_dir):
+            os.remove(os.path.join(self.state_dir, name))
+        os.rmdir(self.state_dir)
+
+async def wait_until_serving(base_url: str, app: AppProcess, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url, timeout=1.0) as client:
+        while True:
+            if app.process.poll() is not None:
+                raise RuntimeError(f"App process exited with {app.process.returncode}")
+            try:
+                await client.get("/")
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+async def soak(args: argparse.Namespace) -> int:
+    linear_sock, app_sock = bind(), bind()
+    app_sock.listen(2048)
+    env = dict(os.environ)
+    env.update({
+        "LINEAR_API_KEY": "soak-key",
+        "LINEAR_API_URL": f"http://127.0.0.1:{linear_sock.getsockname()[1]}/graphql",
+        "GITHUB_WEBHOOK_SECRET": GITHUB_SECRET,
+        "LINEAR_WEBHOOK_SECRET": LINEAR_SECRET,
+        "LOG_LEVEL": os.getenv("LOG_LEVEL", "ERROR"),
+        "LOG_SAMPLE_BURST": os.getenv("LOG_SAMPLE_BURST", "1"),
+        # Dedup keys are bounded by their TTL; keep it short so that state
+        # reaches its steady size within the run instead of reading as a leak
+        "GITHUB_DELIVERY_DEDUP_SECONDS": os.getenv("GITHUB_DELIVERY_DEDUP_SECONDS", "300"),
+    })
+
+    fake_linear = FakeLinear(args.linear_latency)
+    linear_server = uvicorn.Server(uvicorn.Config(fake_linear, log_level="error", access_log=False, lifespan="off"))
+    linear_server.install_signal_handlers = lambda: None
+    linear_task = asyncio.create_task(linear_server.serve(sockets=[linear_sock]))
+    while not linear_server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{app_sock.getsockname()[1]}"
+    app = AppProcess(args, app_sock, env)
+    app_sock.close()
+    try:
+        await wait_until_serving(base_url, app)
+        return await drive(args, base_url, app, fake_linear)
+    finally:
+        app.stop()
+        linear_server.should_exit = True
+        await linear_task
+
+async def drive(args: argparse.Namespace, base_url: str, app: AppProcess, fake_linear: FakeLinear) -> int:
+    source = TrafficSource(args)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    in_flight = 0
+    dropped = 0
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def send(scheduled: float, method: str, path: str, headers: Dict[str, str], body: Optional[bytes]):
+            nonlocal in_flight
+            try:
+                response = await client.request(method, path, headers=headers, content=body)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            except httpx.HTTPError:
+                statuses[0] = statuses.get(0, 0) + 1
+            finally:
+                latencies.append(time.perf_counter() - scheduled)
+                in_flight -= 1
+
+        samples: List[Dict[str, Any]] = []
+        baseline: Optional[Dict[str, Any]] = None
+        baseline_snapshot = None
+        tasks = set()
+        start = time.perf_counter()
+        next_sample = start + args.sample_interval
+        interval = 1.0 / args.rate
+        i = 0
+
+        print(f"{'elapsed':>8} {'rss MB':>8} {'sockets':>8} {'fds':>6} {'req/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'lag p99':>8} {'errors':>7}")
+        while True:
+            scheduled = start + i * interval
+            now = time.perf_counter()
+            if scheduled - start >= args.duration:
+                break
+            if scheduled > now:
+                await asyncio.sleep(min(scheduled, next_sample) - now)
+            now = time.perf_counter()
+            if now >= next_sample:
+                next_sample += args.sample_interval
+                # The app collects garbage before answering, so RSS is read after it
+                loop_lag_p99_ms = await app.loop_lag_p99_ms()
+                window = sorted(latencies)
+                # 4xx are expected answers (e.g. readiness of a project with no events yet)
+                errors = sum(count for status, count in statuses.items() if status >= 500 or status == 0)
+                sockets, fds = open_descriptors(app.pid)
+                sample = {
+                    "elapsed": round(now - start, 1),
+                    "rss_mb": round(rss_bytes(app.pid) / 2 ** 20, 2),
+                    "sockets": sockets,
+                    "fds": fds,
+                    "requests": len(window),
+                    "rate": round(len(window) / args.sample_interval, 1),
+                    "p50_ms": round(percentile(window, 0.5) * 1000, 2),
+                    "p99_ms": round(percentile(window, 0.99) * 1000, 2),
+                    "loop_lag_p99_ms": loop_lag_p99_ms,
+                    "errors": errors,
+                    "statuses": dict(statuses),
+                    "dropped": dropped
+                }
+                latencies.clear()
+                statuses.clear()
+                dropped = 0
+                samples.append(sample)
+                print(
+                    f"{sample['elapsed']:>8.0f} {sample['rss_mb']:>8.1f} {sockets:>8} {fds:>6} {sample['rate']:>7.1f} "
+                    f"{sample['p50_ms']:>8.1f} {sample['p99_ms']:>8.1f} {sample['loop_lag_p99_ms']:>8.1f} {errors:>7}"
+                )
+                if baseline is None and sample["elapsed"] >= args.warmup:
+                    baseline = sample
+                    baseline_snapshot = await app.snapshot()
+                continue
+            if scheduled > now:
+                continue
+            i += 1
+            if in_flight >= args.max_in_flight:
+                dropped += 1
+                continue
+            in_flight += 1
+            task = asyncio.create_task(send(scheduled, *source.next()))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks)
+        final_snapshot = await app.snapshot()
+
+    return report(args, samples, baseline, baseline_snapshot, final_snapshot, fake_linear.requests)
+
+def report(args, samples, baseline, baseline_snapshot, final_snapshot, linear_requests: int) -> int:
+    measured = [sample for sample in samples if baseline is not None and sample["elapsed"] >= baseline["elapsed"]]
+    if baseline is None or len(measured) < 2:
+        print("\nNot enough samples after warm-up; increase --duration or lower --warmup/--sample-interval")
+        return 1
+    last = measured[-1]
+    total_requests = sum(sample["requests"] for sample in measured[1:])
+    total_errors = sum(sample["errors"] + sample["dropped"] for sample in measured[1:])
+    # A limit of None reports the value without judging it
+    slope_judged = last["elapsed"] - baseline["elapsed"] >= args.min_slope_duration and len(measured) >= args.min_slope_samples
+    checks = {
+        "rss_growth_mb": (last["rss_mb"] - baseline["rss_mb"], args.max_rss_growth_mb),
+        "rss_slope_mb_per_hour": (
+            slope_per_hour([(s["elapsed"], s["rss_mb"]) for s in measured]),
+            args.max_rss_slope_mb_per_hour if slope_judged else None
+        ),
+        "socket_growth": (last["sockets"] - baseline["sockets"], args.max_socket_growth),
+        "latency_p99_drift": (last["p99_ms"] / baseline["p99_ms"] if baseline["p99_ms"] else 1.0, args.max_latency_drift),
+        "loop_lag_p99_ms": (max(sample["loop_lag_p99_ms"] for sample in measured), args.max_loop_lag_ms),
+        "error_rate": (total_errors / total_requests if total_requests else 0.0, args.max_error_rate),
+    }
+
+    top_growth = []
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, os.path.abspath(__file__))
+    ]
+    for stat in final_snapshot.filter_traces(filters).compare_to(baseline_snapshot.filter_traces(filters), "lineno")[:args.top]:
+        frame = stat.traceback[0]
+        top_growth.append({"location": f"{frame.filename}:{frame.lineno}", "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff})
+
+    print(f"\nFake Linear served {linear_requests} requests")
+    print("Top allocators by growth since warm-up:")
+    for entry in top_growth:
+        print(f"  {entry['size_diff_kb']:>+10.1f} KiB {entry['count_diff']:>+8} blocks  {entry['location']}")
+
+    failed = False
+    print(f"\n{'check':>24} {'value':>10} {'limit':>10}")
+    for name, (value, limit) in checks.items():
+        if limit is None:
+            print(f"{name:>24} {value:>10.3f} {'-':>10}  skipped")
+            continue
+        ok = value <= limit
+        failed = failed or not ok
+        print(f"{name:>24} {value:>10.3f} {limit:>10.3f}  {'ok' if ok else 'FAIL'}")
+    if not slope_judged:
+        print(
+            f"\nRSS slope not judged: needs {args.min_slope_duration:.0f}s and {args.min_slope_samples} samples after warm-up, "
+            f"got {last['elapsed'] - baseline['elapsed']:.0f}s and {len(measured)}"
+        )
+    print("\nSoak " + ("FAILED" if failed else "passed"))
+
+    if args.report:
+        with open(args.report, "w", encoding='utf-8') as f:
+            json.dump({
+                "samples": samples,
+                "checks": {name: {"value": value, "limit": limit} for name, (value, limit) in checks.items()},
+                "top_growth": top_growth,
+                "passed": not failed
+            }, f, indent=2)
+    return 1 if failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=600.0, help="Seconds to run")
+    parser.add_argument("--rate", type=float, default=20.0, help="Requests per second (open loop)")
+    parser.add_argument("--warmup", type=float, default=60.0, help="Seconds before the baseline sample")
+    parser.add_argument("--sample-interval", type=float, default=30.0, help="Seconds between samples")
+    parser.add_argument("--connections", type=int, default=50, help="Client connections to the app")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Outstanding requests before sends are dropped")
+    parser.add_argument("--linear-latency", type=float, default=0.02, help="Seconds the fake Linear API takes per call")
+    parser.add_argument("--payloads", help="Optional JSONL archive of GitHub deliveries to mix in")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    parser.add_argument("--traceback-frames", type=int, default=1, help="Frames kept per tracemalloc allocation")
+    parser.add_argument("--top", type=int, default=10, help="Allocators to report")
+    parser.add_argument("--report", help="Write samples and check results to this JSON file")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50.0, help="Allowed RSS growth after warm-up")
+    parser.add_argument("--max-rss-slope-mb-per-hour", type=float, default=20.0, help="Allowed RSS trend")
+    parser.add_argument("--min-slope-duration", type=float, default=1800.0, help="Seconds after warm-up before the RSS trend is judged")
+    parser.add_argument("--min-slope-samples", type=int, default=10, help="Samples after warm-up before the RSS trend is judged")
+    parser.add_argument("--max-socket-growth", type=int, default=10, help="Allowed growth in open sockets")
+    parser.add_argument("--max-latency-drift", type=float, default=2.0, help="Allowed ratio of final to baseline p99 latency")
+    parser.add_argument("--max-loop-lag-ms", type=float, default=100.0, help="Allowed p99 event-loop lag in any sample")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="Allowed share of 5xx, failed or dropped requests")
+    parser.add_argument("--serve-fd", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--state-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve_fd is not None:
+        sys.exit(serve_app(args))
+    sys.exit(asyncio.run(soak(args)))
+
+if __name__ == "__main__":
+    main()
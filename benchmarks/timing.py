@@ -0,0 +1,23 @@
+"""
+Timing helper shared by the micro-benchmarks
+"""
+import timeit
+from typing import Callable
+
+def time_per_call(func: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Best-of-repeat seconds per call of func
+
+    timeit picks a loop count that runs for at least 0.2 s, then the fastest
+    of repeat such loops is kept, as slower ones only measure interference.
+
+    Args:
+        func: The call to time
+        repeat: Number of timed loops
+
+    Returns:
+        float: Seconds per call
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
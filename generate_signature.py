@@ -41,35 +41,43 @@ payload = {
     }
 }
 
-# Generate signatures for both compact and pretty formatting
-secret_bytes = WEBHOOK_SECRET.encode('utf-8')
+def sign_body(body: bytes, secret: str = WEBHOOK_SECRET) -> str:
+    """Return the X-Hub-Signature-256 value for a raw webhook body"""
+    return "sha256=" + hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
 
-# Compact signature (what the endpoint will try first)
-compact_payload = json.dumps(payload, separators=(',', ':'))
-compact_signature = hmac.new(secret_bytes, compact_payload.encode('utf-8'), hashlib.sha256).hexdigest()
+def main():
+    # The endpoint verifies the signature against the exact bytes it receives,
+    # so sign the body exactly as it will be pasted
 
-# Pretty signature (fallback)
-pretty_payload = json.dumps(payload, indent=2)
-pretty_signature = hmac.new(secret_bytes, pretty_payload.encode('utf-8'), hashlib.sha256).hexdigest()
+    # Pretty body (what Swagger UI users paste below)
+    pretty_payload = json.dumps(payload, indent=2)
+    pretty_signature = sign_body(pretty_payload.encode('utf-8'))
 
-print("\nSwagger UI Testing Instructions:")
-print("--------------------------------")
-print("\n1. Go to http://127.0.0.1:8000/docs")
-print("2. Find and expand 'POST /api/github/webhook'")
-print("3. Click 'Try it out'")
+    # Compact body (for curl or Postman raw bodies)
+    compact_payload = json.dumps(payload, separators=(',', ':'))
+    compact_signature = sign_body(compact_payload.encode('utf-8'))
 
-print("\n4. Enter these headers:")
-print("-" * 30)
-print("X-Hub-Signature-256:", f"sha256={compact_signature}")
-print("X-GitHub-Event: push")
+    print("\nSwagger UI Testing Instructions:")
+    print("--------------------------------")
+    print("\n1. Go to http://127.0.0.1:8000/docs")
+    print("2. Find and expand 'POST /api/github/webhook'")
+    print("3. Click 'Try it out'")
 
-print("\n5. In the Request body field, paste this JSON:")
-print("-" * 30)
-print(json.dumps(payload, indent=2))
+    print("\n4. Enter these headers:")
+    print("-" * 30)
+    print("X-Hub-Signature-256:", pretty_signature)
+    print("X-GitHub-Event: push")
 
-print("\nAlternative signatures (if the first doesn't work):")
-print(f"Compact format signature: sha256={compact_signature}")
-print(f"Pretty format signature:  sha256={pretty_signature}")
+    print("\n5. In the Request body field, paste this JSON exactly:")
+    print("-" * 30)
+    print(pretty_payload)
 
-print("\nNow the endpoint will try both signature formats automatically!")
-print("Just use the compact signature above and paste the JSON as shown.") 
\ No newline at end of file
+    print("\nFor a compact body, send this JSON instead:")
+    print(compact_payload)
+    print(f"Compact format signature: {compact_signature}")
+
+    print("\nThe signature only matches the exact bytes it was computed over;")
+    print("any whitespace change in the body will be rejected with 401.")
+
+if __name__ == "__main__":
+    main()
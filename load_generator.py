@@ -0,0 +1,182 @@
+"""
+Open-loop load generator for the GitHub webhook endpoint
+
+Builds realistic push, pull_request and workflow_run payloads, signs them the
+same way generate_signature.py does, and fires them at a fixed arrival rate
+regardless of how fast the target answers. Latency is measured from each
+request's scheduled send time, so queueing inside the generator or the target
+is not hidden (no coordinated omission).
+
+Usage:
+    python load_generator.py --rate 500 --duration 60 --connections 200 \\
+        --mix push=0.6,pull_request=0.3,workflow_run=0.1 --commits 1-20
+"""
+import os
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from collections import Counter
+from typing import Dict, List, Tuple
+
+import httpx
+
+from generate_signature import WEBHOOK_SECRET, sign_body
+from app.utils.webhook_test import (
+    IssueKeySampler,
+    build_push_event,
+    build_pull_request_event,
+    build_workflow_run_event
+)
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """Parse an event mix such as push=0.6,pull_request=0.3,workflow_run=0.1"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"push", "pull_request", "workflow_run"}
+    if unknown:
+        raise argparse.ArgumentTypeError(f"Unknown event types: {', '.join(sorted(unknown))}")
+    return mix
+
+def parse_range(value: str) -> Tuple[int, int]:
+    """Parse N or LOW-HIGH"""
+    low, _, high = value.partition("-")
+    return int(low), int(high or low)
+
+def build_corpus(args: argparse.Namespace) -> List[Tuple[str, bytes, str]]:
+    """Pre-build and sign a pool of payloads so generation stays off the send path"""
+    rng = random.Random(args.seed)
+    issue_keys = IssueKeySampler(
+        prefixes=args.issue_prefixes.split(","),
+        keys_per_prefix=args.issue_keys,
+        skew=args.issue_skew,
+        key_probability=args.key_probability
+    )
+    events = list(args.mix)
+    weights = [args.mix[event] for event in events]
+    corpus = []
+    for _ in range(args.corpus_size):
+        event = rng.choices(events, weights)[0]
+        if event == "push":
+            payload = build_push_event(rng, issue_keys, commits=rng.randint(*args.commits), repositories=args.repositories)
+        elif event == "pull_request":
+            payload = build_pull_request_event(rng, issue_keys, repositories=args.repositories)
+        else:
+            payload = build_workflow_run_event(rng, issue_keys, repositories=args.repositories)
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        corpus.append((event, body, sign_body(body, args.secret)))
+    return corpus
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+async def run(args: argparse.Namespace) -> int:
+    corpus = build_corpus(args)
+    total = int(args.rate * args.duration)
+    interval = 1.0 / args.rate
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    errors: Counter = Counter()
+    per_event: Counter = Counter()
+    sent = 0
+    dropped = 0
+    in_flight = 0
+    tasks = set()
+
+    limits = httpx.Limits(max_connections=args.connections, max_keepalive_connections=args.connections)
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+
+        async def send(scheduled: float, event: str, body: bytes, signature: str):
+            nonlocal in_flight
+            try:
+                response = await client.post(
+                    args.url,
+                    content=body,
+                    headers={
+                        "Content-Type": "application/json",
+                        "X-GitHub-Event": event,
+                        "X-GitHub-Delivery": str(uuid.uuid4()),
+                        "X-Hub-Signature-256": signature
+                    }
+                )
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                errors[type(e).__name__] += 1
+            finally:
+                latencies.append(time.perf_counter() - scheduled)
+                in_flight -= 1
+
+        start = time.perf_counter()
+        for i in range(total):
+            scheduled = start + i * interval
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            if in_flight >= args.max_in_flight:
+                # The target (or this generator) cannot keep up; record rather than queue without bound
+                dropped += 1
+                continue
+            event, body, signature = corpus[i % len(corpus)]
+            per_event[event] += 1
+            sent += 1
+            in_flight += 1
+            task = asyncio.create_task(send(scheduled, event, body, signature))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        send_elapsed = time.perf_counter() - start
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - start
+
+    completed = len(latencies)
+    ok = sum(count for status, count in statuses.items() if 200 <= status < 300)
+    failed = completed - ok
+    latencies.sort()
+    print(f"\nTarget:            {args.url}")
+    print(f"Offered rate:      {args.rate:.1f} req/s for {args.duration:.0f}s ({total} requests)")
+    print(f"Achieved send:     {sent / max(send_elapsed, total * interval):.1f} req/s")
+    print(f"Throughput (2xx):  {ok / elapsed:.1f} req/s")
+    print(f"Completed:         {completed}  dropped (max in-flight): {dropped}")
+    print(f"Error rate:        {failed / completed * 100 if completed else 0:.2f}%")
+    print(f"Events sent:       {dict(per_event)}")
+    print(f"Status codes:      {dict(sorted(statuses.items()))}")
+    if errors:
+        print(f"Transport errors:  {dict(errors)}")
+    print("Latency (ms):      " + "  ".join(
+        f"p{label}={percentile(latencies, fraction) * 1000:.1f}"
+        for label, fraction in [("50", 0.5), ("90", 0.9), ("99", 0.99), ("99.9", 0.999)]
+    ) + f"  max={latencies[-1] * 1000 if latencies else float('nan'):.1f}")
+    return 0 if failed == 0 and dropped == 0 else 1
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/api/github/webhook", help="Webhook endpoint")
+    parser.add_argument("--secret", default=os.getenv("GITHUB_WEBHOOK_SECRET", WEBHOOK_SECRET), help="Webhook secret")
+    parser.add_argument("--rate", type=float, default=100.0, help="Requests per second (open loop)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to send for")
+    parser.add_argument("--connections", type=int, default=100, help="Maximum concurrent connections")
+    parser.add_argument("--max-in-flight", type=int, default=10000, help="Outstanding requests before sends are dropped")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--mix", type=parse_mix, default="push=0.6,pull_request=0.3,workflow_run=0.1", help="Event type weights")
+    parser.add_argument("--commits", type=parse_range, default="1-10", help="Commits per push, N or LOW-HIGH")
+    parser.add_argument("--repositories", type=int, default=50, help="Distinct repositories")
+    parser.add_argument("--issue-prefixes", default="ABC,XYZ", help="Comma-separated issue key prefixes")
+    parser.add_argument("--issue-keys", type=int, default=500, help="Distinct issue numbers per prefix")
+    parser.add_argument("--issue-skew", type=float, default=1.1, help="Zipf exponent of issue key popularity (0 = uniform)")
+    parser.add_argument("--key-probability", type=float, default=0.8, help="Fraction of texts referencing an issue")
+    parser.add_argument("--corpus-size", type=int, default=2000, help="Distinct pre-signed payloads to cycle through")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(run(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Replay archived GitHub webhook deliveries through the event handlers
+
+Streams a JSONL archive (one delivery per line) and dispatches each delivery
+directly to handle_push_event / handle_pull_request_event /
+handle_workflow_run_event, bypassing HTTP and signature checks. Each delivery
+goes to the Linear workspace configured for its repository in
+LINEAR_WORKSPACES_FILE (else the default workspace), or to the one named by
+--workspace. Deliveries run concurrently over one pooled Linear connection set. Progress is
+checkpointed after every batch, so an interrupted run resumes where it
+stopped; deliveries that fail are appended to a failures file in the same
+format, ready to be replayed again. The checkpoint also records how much of
+the failures file it covers, so failures of a batch that was interrupted
+before its checkpoint are not written twice.
+
+Each line is either {"event": "push", "delivery_id": "...", "payload": {...}}
+or {"headers": {"X-GitHub-Event": "push", ...}, "body": {...} or "<json>"}.
+
+Usage:
+    python replay_events.py deliveries.jsonl --concurrency 64 --batch-size 2000
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from app.clients.linear import LinearClient, MOCK_ISSUE_ID
+from app.clients.registry import Workspace, get_workspace_registry
+from app.routers.github import dispatch_event
+from app.utils.deadline import deadline
+from app.utils.history import repository_of
+from app.models.github import PushEvent, PullRequestEvent, WorkflowRunEvent
+
+logger = logging.getLogger("replay_events")
+
+EVENT_MODELS = {
+    "push": PushEvent,
+    "pull_request": PullRequestEvent,
+    "workflow_run": WorkflowRunEvent
+}
+
+def parse_delivery(line: bytes) -> Tuple[str, Optional[str], Dict[str, Any]]:
+    """Return (event type, delivery id, payload) for one archive line"""
+    record = json.loads(line)
+    headers = {key.lower(): value for key, value in (record.get("headers") or {}).items()}
+    event_type = record.get("event") or headers.get("x-github-event")
+    delivery_id = record.get("delivery_id") or headers.get("x-github-delivery")
+    payload = record.get("payload", record.get("body"))
+    if isinstance(payload, str):
+        payload = json.loads(payload)
+    if not event_type or not isinstance(payload, dict):
+        raise ValueError("Line has no event type or payload")
+    return event_type, delivery_id, payload
+
+def result_error(result: Dict[str, Any]) -> Optional[str]:
+    """Return an error description if a handler result reports a failed Linear update"""
+    if "error" in result:
+        return str(result["error"])
+    failed = [update for update in result.get("updates", []) if update.get("status") == "error"]
+    if failed:
+        return "; ".join(str(update.get("error")) for update in failed)
+    # create_or_update_issue falls back to a mock issue when Linear rejects the call
+    issue_ids = [result.get("issue_id")] + [update.get("issue_id") for update in result.get("updates", [])]
+    if MOCK_ISSUE_ID in issue_ids:
+        return "Linear API call failed"
+    return None
+
+def failure_record(line: bytes, error: str) -> bytes:
+    """Serialize a failed delivery, with its error, as a replayable archive line"""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        record = {"raw": line.decode('utf-8', 'replace')}
+    record["replay_error"] = error
+    return json.dumps(record).encode('utf-8') + b"\n"
+
+class Checkpoint:
+    """Byte offsets of the first unprocessed line and of the failures file's end, persisted atomically"""
+
+    def __init__(self, path: str, archive: str):
+        self.path = path
+        self.archive = os.path.abspath(archive)
+        self.offset = 0
+        self.processed = 0
+        self.failed = 0
+        # Size of the failures file when the checkpoint was saved; None until known
+        self.failures_offset: Optional[int] = None
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get("archive") != self.archive:
+            raise SystemExit(f"Checkpoint {self.path} belongs to {state.get('archive')}, not {self.archive}")
+        self.offset = state["offset"]
+        self.processed = state["processed"]
+        self.failed = state["failed"]
+        self.failures_offset = state.get("failures_offset")
+
+    def save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding='utf-8') as f:
+            json.dump({
+                "archive": self.archive,
+                "offset": self.offset,
+                "processed": self.processed,
+                "failed": self.failed,
+                "failures_offset": self.failures_offset
+            }, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+def read_batch(archive, batch_size: int) -> List[bytes]:
+    lines = []
+    while len(lines) < batch_size:
+        line = archive.readline()
+        if not line:
+            break
+        if line.strip():
+            lines.append(line)
+    return lines
+
+async def replay(args: argparse.Namespace) -> int:
+    checkpoint = Checkpoint(args.checkpoint or f"{args.archive}.checkpoint", args.archive)
+    if not args.restart:
+        checkpoint.load()
+    total_bytes = os.path.getsize(args.archive)
+    if checkpoint.offset:
+        logger.info("Resuming at byte %d (%d deliveries already processed)", checkpoint.offset, checkpoint.processed)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    started = time.monotonic()
+    started_processed = checkpoint.processed
+    started_offset = checkpoint.offset
+    last_report = started
+
+    registry = get_workspace_registry()
+    workspace = None
+    if args.workspace:
+        workspace = registry.get(args.workspace)
+        if workspace is None:
+            raise SystemExit(f"Unknown workspace {args.workspace}")
+
+    async with httpx.AsyncClient(limits=limits) as http_client:
+        # Built on first use, so replaying one tenant's deliveries needs no other keys
+        clients: Dict[str, LinearClient] = {}
+
+        def client_for(workspace: Workspace) -> LinearClient:
+            if workspace.name not in clients:
+                clients[workspace.name] = LinearClient(
+                    http_client=http_client, api_key=workspace.api_key, api_url=workspace.api_url, workspace=workspace
+                )
+            return clients[workspace.name]
+
+        async def run_one(line: bytes) -> Optional[str]:
+            async with semaphore:
+                try:
+                    event_type, _, payload = parse_delivery(line)
+                    if args.dry_run:
+                        model = EVENT_MODELS.get(event_type)
+                        if model is not None:
+                            model(**payload)
+                        return None
+                    client = client_for(workspace or registry.resolve(repository=repository_of(payload)))
+                    # Linear timeouts and retries are sized to fit this budget
+                    with deadline(args.timeout):
+                        return result_error(await dispatch_event(event_type, payload, client))
+                except Exception as e:
+                    return f"{type(e).__name__}: {str(e)}"
+
+        with open(args.archive, "rb") as archive, open(args.failures, "ab") as failures:
+            archive.seek(checkpoint.offset)
+            if checkpoint.failures_offset is None:
+                checkpoint.failures_offset = os.fstat(failures.fileno()).st_size
+            else:
+                # Lines past the checkpoint belong to a batch that is about to be replayed again
+                failures.truncate(checkpoint.failures_offset)
+                # truncate() leaves the stream position where it was
+                failures.seek(0, os.SEEK_END)
+            while True:
+                batch = read_batch(archive, args.batch_size)
+                if not batch:
+                    break
+                errors = await asyncio.gather(*(run_one(line) for line in batch))
+                for line, error in zip(batch, errors):
+                    if error is not None:
+                        checkpoint.failed += 1
+                        failures.write(failure_record(line, error))
+                failures.flush()
+                os.fsync(failures.fileno())
+                checkpoint.processed += len(batch)
+                checkpoint.offset = archive.tell()
+                checkpoint.failures_offset = os.fstat(failures.fileno()).st_size
+                checkpoint.save()
+
+                now = time.monotonic()
+                if now - last_report >= args.progress_interval:
+                    last_report = now
+                    elapsed = now - started
+                    rate = (checkpoint.processed - started_processed) / elapsed
+                    byte_rate = (checkpoint.offset - started_offset) / elapsed
+                    eta = (total_bytes - checkpoint.offset) / byte_rate if byte_rate else float("nan")
+                    logger.info(
+                        "%d processed (%.1f%%), %d failed, %.0f events/s, ETA %.0fs",
+                        checkpoint.processed, checkpoint.offset / total_bytes * 100, checkpoint.failed, rate, eta
+                    )
+
+    elapsed = time.monotonic() - started
+    replayed = checkpoint.processed - started_processed
+    logger.info(
+        "Done: %d deliveries replayed in %.1fs (%.0f events/s), %d failed in total; failures in %s",
+        replayed, elapsed, replayed / elapsed if elapsed else 0.0, checkpoint.failed, args.failures
+    )
+    return 1 if checkpoint.failed else 0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archive", help="JSONL archive of webhook deliveries")
+    parser.add_argument("--concurrency", type=int, default=32, help="Deliveries processed concurrently")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Deliveries per checkpointed batch")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <archive>.checkpoint)")
+    parser.add_argument("--failures", help="Where failed deliveries are appended (default: <archive>.failures.jsonl)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and start from the beginning")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and validate deliveries without calling Linear")
+    parser.add_argument("--workspace", help="Replay every delivery into this workspace instead of resolving it by repository")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds allowed per delivery, Linear retries included")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress reports")
+    args = parser.parse_args()
+    args.failures = args.failures or f"{args.archive}.failures.jsonl"
+
+    load_dotenv()
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    # Handler-level logging is per delivery; keep the replay output readable
+    logging.getLogger("app").setLevel(logging.WARNING)
+    sys.exit(asyncio.run(replay(args)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import hmac
+import hashlib
+import pytest
+from fastapi.testclient import TestClient
+
+import app.utils.github as github_utils
+import app.utils.state as state
+from app.main import app
+from app.utils.github import WebhookVerifier
+from app.utils.state import MemoryStateBackend
+
+SECRET = "test_secret"
+
+def sign(body: bytes, secret: str = SECRET) -> str:
+    """X-Hub-Signature-256 header value of a GitHub webhook body"""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client for the app with GitHub webhooks signed by SECRET and a fresh in-memory state backend"""
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    monkeypatch.setattr(github_utils, "_verifier", WebhookVerifier(secrets=[SECRET]))
+    monkeypatch.setattr(state, "_backend", MemoryStateBackend())
+    return TestClient(app)
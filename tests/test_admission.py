@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+import app.utils.admission as admission
+from app.utils.admission import AdaptiveLimiter, event_priority
+from conftest import sign
+
+def test_lower_priorities_are_refused_first():
+    """Test that each priority may only fill its share of the limit"""
+    limiter = AdaptiveLimiter(initial_limit=10, target_latency=1.0)
+    tickets = [limiter.try_acquire("normal") for _ in range(8)]
+    assert all(tickets)
+    assert limiter.try_acquire(event_priority("workflow_run", "completed")) is None
+    assert limiter.try_acquire(event_priority("push")) is None
+    assert limiter.try_acquire(event_priority("pull_request")) is not None
+
+    # A workflow run only found to be "requested" after parsing is shed
+    tickets[0].priority = "low"
+    assert tickets[0].reprioritize("background") is False
+    assert limiter.in_flight == 8
+
+def test_limit_adapts_to_latency(monkeypatch):
+    """Test additive increase on fast completions and multiplicative decrease on slow ones"""
+    clock = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: clock[0])
+    limiter = AdaptiveLimiter(initial_limit=10, min_limit=2, target_latency=1.0)
+
+    for _ in range(10):
+        ticket = limiter.try_acquire("high")
+        clock[0] += 0.1
+        ticket.release()
+    assert 10.9 < limiter.limit < 11.1
+
+    before = limiter.limit
+    slow = [limiter.try_acquire("high") for _ in range(3)]
+    clock[0] += 5
+    for ticket in slow:
+        ticket.release()
+    # A burst of slow completions is one decrease
+    assert limiter.limit == pytest.approx(before * AdaptiveLimiter.DECREASE_FACTOR)
+    assert limiter.retry_after() >= 1
+
+def test_overloaded_webhook_gets_fast_503(client, monkeypatch):
+    """Test that a delivery over the limit is refused with Retry-After"""
+    limiter = AdaptiveLimiter(initial_limit=5, target_latency=1.0)
+    limiter.in_flight = 4
+    monkeypatch.setattr(admission, "_limiter", limiter)
+
+    body = json.dumps({"zen": "Approachable is better than simple."}).encode()
+    headers = {"X-Hub-Signature-256": sign(body)}
+    response = client.post("/api/github/webhook", content=body, headers={**headers, "X-GitHub-Event": "ping"})
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) >= 1
+
+    response = client.post("/api/github/webhook", content=body, headers={**headers, "X-GitHub-Event": "pull_request"})
+    assert response.status_code != 503
+    assert limiter.in_flight == 4
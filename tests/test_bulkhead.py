@@ -0,0 +1,126 @@
+import json
+import time
+import asyncio
+import httpx
+import pytest
+
+import app.utils.bulkhead as bulkhead_module
+from app.clients.linear import LinearClient
+from app.utils.bulkhead import Bulkhead, bulkhead_var, get_bulkhead
+from app.utils.deadline import deadline
+from app.utils.metrics import metrics
+from conftest import sign
+
+@pytest.fixture(autouse=True)
+def fresh_bulkheads(monkeypatch):
+    monkeypatch.setattr(bulkhead_module, "_bulkheads", {})
+    metrics.reset()
+
+@pytest.mark.asyncio
+async def test_queue_is_bounded_and_served_in_order():
+    """Test that waiters are served first come first served and the queue overflow is refused"""
+    bulkhead = Bulkhead("test", concurrency=1, queue_size=2, linear_calls=1, queue_timeout=1.0)
+    assert await bulkhead.acquire()
+    order = []
+
+    async def queued(name):
+        assert await bulkhead.acquire()
+        order.append(name)
+        bulkhead.release()
+
+    waiters = [asyncio.create_task(queued(name)) for name in ("first", "second")]
+    await asyncio.sleep(0)
+    assert bulkhead.queued == 2
+    assert not await bulkhead.acquire()
+    assert metrics.get("bulkhead_test_rejected_total") == 1
+
+    bulkhead.release()
+    await asyncio.gather(*waiters)
+    assert order == ["first", "second"]
+    assert bulkhead.stats() == {"in_flight": 0, "queued": 0, "linear_in_flight": 0, "utilization": 0.0}
+
+@pytest.mark.asyncio
+async def test_queued_request_times_out():
+    """Test that a request waiting longer than the queue timeout is refused and leaves the queue"""
+    bulkhead = Bulkhead("test", concurrency=1, queue_size=5, linear_calls=1, queue_timeout=0.05)
+    assert await bulkhead.acquire()
+    assert not await bulkhead.acquire()
+    assert bulkhead.queued == 0
+    bulkhead.release()
+    assert bulkhead.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_bounded_by_the_deadline():
+    """Test that a queued request gives up when its deadline passes, before the queue timeout"""
+    bulkhead = Bulkhead("test", concurrency=1, queue_size=5, linear_calls=1, queue_timeout=30.0)
+    assert await bulkhead.acquire()
+    with deadline(0.05):
+        assert not await asyncio.wait_for(bulkhead.acquire(), 1.0)
+    assert bulkhead.queued == 0
+    assert metrics.get("bulkhead_test_rejected_total") == 1
+
+@pytest.mark.asyncio
+async def test_event_types_are_isolated(monkeypatch):
+    """Test that a full workflow_run bulkhead does not affect pull requests"""
+    monkeypatch.setenv("BULKHEAD_WORKFLOW_RUN_CONCURRENCY", "1")
+    monkeypatch.setenv("BULKHEAD_WORKFLOW_RUN_QUEUE", "0")
+    workflow_runs = get_bulkhead("workflow_run")
+    assert await workflow_runs.acquire()
+    assert not await workflow_runs.acquire()
+    assert metrics.get("bulkhead_workflow_run_utilization") == 1.0
+
+    pull_requests = get_bulkhead("pull_request")
+    assert await pull_requests.acquire()
+    assert get_bulkhead("ping") is get_bulkhead("issues")
+
+@pytest.mark.asyncio
+async def test_linear_calls_are_limited_per_bulkhead(monkeypatch):
+    """Test that requests in a bulkhead never have more Linear calls in flight than its budget"""
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    in_flight = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return httpx.Response(200, json={"data": {"viewer": {"id": "user_1"}}})
+
+    client = LinearClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    bulkhead_var.set(Bulkhead("test", concurrency=10, queue_size=10, linear_calls=2, queue_timeout=1.0))
+    await asyncio.gather(*(client.warm_up() for _ in range(6)))
+    assert peak == 2
+
+def test_webhook_refused_when_bulkhead_full(client, monkeypatch):
+    """Test that a delivery for a full bulkhead gets 503 with Retry-After"""
+    monkeypatch.setenv("BULKHEAD_WORKFLOW_RUN_CONCURRENCY", "0")
+    monkeypatch.setenv("BULKHEAD_WORKFLOW_RUN_QUEUE", "0")
+
+    body = json.dumps({"action": "completed"}).encode()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "workflow_run"}
+    )
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert metrics.get("bulkhead_workflow_run_rejected_total") == 1
+
+def test_webhook_queue_wait_counts_against_its_deadline(client, monkeypatch):
+    """Test that a queued delivery is refused once the webhook deadline passes, not after the queue timeout"""
+    monkeypatch.setenv("BULKHEAD_WORKFLOW_RUN_CONCURRENCY", "0")
+    monkeypatch.setenv("BULKHEAD_QUEUE_TIMEOUT_SECONDS", "30")
+    monkeypatch.setenv("GITHUB_WEBHOOK_DEADLINE_SECONDS", "0.05")
+
+    body = json.dumps({"action": "completed"}).encode()
+    start = time.monotonic()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "workflow_run"}
+    )
+    assert response.status_code == 503
+    assert time.monotonic() - start < 5
+    assert metrics.get("bulkhead_workflow_run_rejected_total") == 1
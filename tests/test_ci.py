@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.models.github import WorkflowRun
+from app.utils.ci import CIAggregator
+from app.utils.state import MemoryStateBackend
+
+BASE = datetime(2024, 2, 20, 12, 0, tzinfo=timezone.utc)
+
+def run(workflow_id: int, status: str, conclusion: Optional[str] = None, sha: str = "abc123", minutes: int = 0) -> WorkflowRun:
+    return WorkflowRun(
+        id=workflow_id * 1000 + minutes,
+        name=f"workflow-{workflow_id}",
+        status=status,
+        conclusion=conclusion,
+        workflow_id=workflow_id,
+        head_branch="ABC-123-feature",
+        head_sha=sha,
+        run_number=1,
+        event="push",
+        url="https://api.github.com/runs/1",
+        created_at=BASE,
+        updated_at=BASE + timedelta(minutes=minutes)
+    )
+
+def test_commit_status_combines_workflows():
+    """Test that the combined status only changes when the aggregate moves"""
+    aggregator = CIAggregator(backend=MemoryStateBackend())
+
+    def record(workflow_run: WorkflowRun):
+        commit, changed = aggregator.record("org/repo", workflow_run)
+        if changed:
+            aggregator.mark_reported(commit)
+        return commit, changed
+
+    commit, changed = record(run(1, "in_progress"))
+    assert changed and (commit.status, commit.progress) == ("in_progress", 0.0)
+
+    # A second workflow starting leaves the aggregate where it was
+    commit, changed = record(run(2, "in_progress"))
+    assert not changed
+
+    commit, changed = record(run(1, "completed", "success", minutes=5))
+    assert changed and (commit.status, commit.progress) == ("in_progress", 50.0)
+
+    commit, changed = record(run(2, "completed", "failure", minutes=6))
+    assert changed and commit.status == "blocked"
+
+    # A late delivery of an older run is ignored
+    commit, changed = record(run(2, "in_progress", minutes=1))
+    assert not changed and commit.status == "blocked"
+
+    commit, changed = record(run(2, "completed", "success", minutes=10))
+    assert changed and (commit.status, commit.progress) == ("completed", 100.0)
+
+def test_workers_share_commit_status():
+    """Test that runs of one commit handled by different workers are combined"""
+    backend = MemoryStateBackend()
+    worker_a, worker_b = CIAggregator(backend=backend), CIAggregator(backend=backend)
+    commit, _ = worker_a.record("org/repo", run(1, "completed", "failure"))
+    worker_a.mark_reported(commit)
+    commit, changed = worker_b.record("org/repo", run(2, "completed", "success", minutes=1))
+    assert not changed and commit.status == "blocked" and commit.progress == 100.0
+    assert worker_b.get("org/repo", "abc123").names == {1: "workflow-1", 2: "workflow-2"}
+
+def test_unreported_status_stays_changed():
+    """Test that a status whose Linear update failed is reported again by the next event"""
+    aggregator = CIAggregator(backend=MemoryStateBackend())
+    commit, changed = aggregator.record("org/repo", run(1, "in_progress"))
+    assert changed
+    # The Linear update failed, so mark_reported() was not called; a redelivery retries it
+    commit, changed = aggregator.record("org/repo", run(1, "in_progress"))
+    assert changed
+    aggregator.mark_reported(commit)
+    assert aggregator.record("org/repo", run(1, "in_progress"))[1] is False
+    assert aggregator.get("org/repo", "other") is None
+
+def test_oldest_commits_are_evicted_past_max_commits():
+    """Test that recording more commits than the cap deletes the oldest ones"""
+    aggregator = CIAggregator(backend=MemoryStateBackend(), max_commits=2)
+    for sha in ("sha-1", "sha-2", "sha-3"):
+        aggregator.record("org/repo", run(1, "in_progress", sha=sha))
+    # Another run of a tracked commit does not push it out again
+    aggregator.record("org/repo", run(2, "in_progress", sha="sha-2", minutes=1))
+    assert aggregator.get("org/repo", "sha-1") is None
+    assert aggregator.get("org/repo", "sha-2") is not None
+    assert aggregator.get("org/repo", "sha-3") is not None
@@ -0,0 +1,66 @@
+import pytest
+from datetime import datetime, timezone
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models.linear import LinearProject
+from app.utils.cache import linear_cache
+from app.utils.http import _body_cache
+
+def make_project(project_id: str, hour: int = 12) -> LinearProject:
+    return LinearProject(
+        id=project_id,
+        name=f"Project {project_id}",
+        state="in_progress",
+        created_at=datetime(2024, 2, 20, 12, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 2, 20, hour, tzinfo=timezone.utc),
+        progress=50.0
+    )
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    linear_cache.clear()
+    _body_cache.clear()
+    linear_cache.set_projects([make_project("proj-1"), make_project("proj-2")], linear_cache.version)
+    yield TestClient(app)
+    linear_cache.clear()
+
+def test_list_projects_if_none_match(client):
+    """Test that an unchanged project list is answered with 304"""
+    response = client.get("/api/linear/projects", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 2
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"] == "Tue, 20 Feb 2024 12:00:00 GMT"
+
+    response = client.get("/api/linear/projects", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    linear_cache.put_project(make_project("proj-2", hour=13))
+    response = client.get("/api/linear/projects", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+def test_get_project_if_modified_since(client):
+    """Test Last-Modified based revalidation of a single project"""
+    headers = {"If-Modified-Since": "Tue, 20 Feb 2024 12:00:00 GMT"}
+    assert client.get("/api/linear/projects/proj-1", headers=headers).status_code == 304
+
+    headers = {"If-Modified-Since": "Tue, 20 Feb 2024 11:59:59 GMT"}
+    assert client.get("/api/linear/projects/proj-1", headers=headers).status_code == 200
+
+def test_large_list_is_gzip_compressed(client, monkeypatch):
+    """Test that list bodies above the threshold are compressed"""
+    monkeypatch.setenv("RESPONSE_COMPRESS_MIN_BYTES", "0")
+    response = client.get("/api/linear/projects", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.json()["data"][0]["id"] in {"proj-1", "proj-2"}
+
+    etag = response.headers["ETag"]
+    assert etag.endswith('-gzip"')
+    response = client.get("/api/linear/projects", headers={"If-None-Match": etag, "Accept-Encoding": "gzip"})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
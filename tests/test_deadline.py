@@ -0,0 +1,113 @@
+import hmac
+import json
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app.utils.github as github_utils
+import app.utils.state as state
+from app.main import app
+from app.clients.linear import LinearClient
+from app.routers import linear as linear_router
+from app.utils.cache import linear_cache
+from app.utils.deadline import DeadlineExceeded, deadline, remaining
+from app.utils.github import WebhookVerifier
+from app.utils.metrics import metrics
+from app.utils.state import MemoryStateBackend
+from app.utils.webhook_test import SAMPLE_PR_EVENT
+
+PROJECTS = {"data": {"projects": {"nodes": []}}}
+SECRET = "test_secret"
+
+def linear_client(handler) -> LinearClient:
+    return LinearClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+@pytest.fixture(autouse=True)
+def env(monkeypatch):
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    metrics.reset()
+
+def test_nested_deadline_only_shortens():
+    """Test that an inner block cannot extend the outer deadline"""
+    assert remaining() is None
+    with deadline(1.0):
+        with deadline(60.0):
+            assert remaining() <= 1.0
+        with deadline(0.1):
+            assert remaining() <= 0.1
+    assert remaining() is None
+
+@pytest.mark.asyncio
+async def test_slow_linear_call_is_cut_off_at_deadline():
+    """Test that a hung Linear call ends at the deadline and is counted separately"""
+    async def handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=PROJECTS)
+
+    client = linear_client(handler)
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.05):
+            await client.get_projects()
+    assert metrics.get("linear_deadline_exceeded_total") == 1
+    assert metrics.get("linear_errors_total") == 0
+
+@pytest.mark.asyncio
+async def test_only_safe_requests_are_retried(monkeypatch):
+    """Test that queries are retried on 503 but mutations are not"""
+    monkeypatch.setenv("LINEAR_MAX_RETRIES", "2")
+    calls = []
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json=PROJECTS)
+
+    client = linear_client(handler)
+    assert await client.get_projects() == []
+    assert len(calls) == 2
+    assert metrics.get("linear_retries_total") == 1
+
+    calls.clear()
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.update_project("proj-1", state="in_progress", progress=10)
+    assert len(calls) == 1
+
+def test_endpoint_returns_504_when_deadline_passes(monkeypatch):
+    """Test that an interactive read past its budget answers 504"""
+    monkeypatch.setenv("LINEAR_INTERACTIVE_DEADLINE_SECONDS", "0.05")
+
+    async def handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, json=PROJECTS)
+
+    linear_cache.clear()
+    app.dependency_overrides[linear_router.get_linear_client] = lambda: linear_client(handler)
+    try:
+        response = TestClient(app).get("/api/linear/projects")
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 504
+    assert TestClient(app).get("/metrics").json()["linear_deadline_exceeded_total"] == 1
+
+def test_webhook_deadline_reaches_the_router(monkeypatch):
+    """Test that a handler running out of time answers 504 and lets the redelivery through"""
+    async def out_of_time(self, query, variables, raise_on_errors, is_mutation):
+        raise DeadlineExceeded("Request deadline exceeded waiting for Linear")
+
+    monkeypatch.setattr(LinearClient, "_send_query", out_of_time)
+    monkeypatch.setattr(github_utils, "_verifier", WebhookVerifier(secrets=[SECRET]))
+    monkeypatch.setattr(state, "_backend", MemoryStateBackend())
+    body = json.dumps(SAMPLE_PR_EVENT).encode()
+    headers = {
+        "X-Hub-Signature-256": "sha256=" + hmac.new(SECRET.encode(), body, hashlib.sha256).hexdigest(),
+        "X-GitHub-Event": "pull_request",
+        "X-GitHub-Delivery": "delivery-deadline-1"
+    }
+    client = TestClient(app)
+    for _ in range(2):
+        assert client.post("/api/github/webhook", content=body, headers=headers).status_code == 504
+    assert metrics.get("webhook_deadline_exceeded_total") == 2
@@ -1,6 +1,11 @@
 import os
+import hmac
+import hashlib
 import pytest
-from app.utils.github import verify_github_webhook, extract_linear_issue_id, parse_workflow_status
+from app.utils.github import verify_github_webhook, extract_linear_issue_id, parse_workflow_status, WebhookVerifier
+
+def sign(secret: str, payload: bytes) -> str:
+    return "sha256=" + hmac.new(secret.encode(), payload, hashlib.sha256).hexdigest()
 
 def test_extract_linear_issue_id():
     """Test Linear issue ID extraction from text"""
@@ -58,4 +63,36 @@ def test_verify_github_webhook(monkeypatch):
     # Test missing secret
     monkeypatch.delenv("GITHUB_WEBHOOK_SECRET")
     with pytest.raises(ValueError):
-        verify_github_webhook(valid_signature, payload) 
\ No newline at end of file
+        verify_github_webhook(valid_signature, payload) 
+
+def test_webhook_verifier_accepts_all_active_secrets():
+    """Test that the verifier accepts any of its active secrets"""
+    payload = b'{"test": "data"}'
+    verifier = WebhookVerifier(secrets=["old_secret", "new_secret"])
+
+    assert verifier.verify(sign("old_secret", payload), payload) is True
+    assert verifier.verify(sign("new_secret", payload), payload) is True
+    assert verifier.verify(sign("old_secret", payload), payload) is True
+    assert verifier.verify(sign("other_secret", payload), payload) is False
+    assert verifier.verify("invalid_format", payload) is False
+
+    with pytest.raises(ValueError):
+        WebhookVerifier(secrets=[]).verify(sign("old_secret", payload), payload)
+
+def test_webhook_verifier_reloads_rotated_secrets_file(tmp_path):
+    """Test that a rotated secrets file is picked up without rebuilding the verifier"""
+    payload = b'{"test": "data"}'
+    secrets_file = tmp_path / "secrets"
+    secrets_file.write_text("first_secret\n")
+    verifier = WebhookVerifier(secrets=[], secrets_file=str(secrets_file))
+    verifier.RELOAD_CHECK_INTERVAL = 0.0
+    assert verifier.verify(sign("first_secret", payload), payload) is True
+    assert verifier.verify(sign("second_secret", payload), payload) is False
+    assert verifier.reload_if_changed() is False
+
+    secrets_file.write_text("first_secret\nsecond_secret\n")
+    os.utime(secrets_file, (0, 0))
+    assert verifier.reload_if_changed() is True
+    assert verifier.reload_if_changed() is False
+    assert verifier.verify(sign("second_secret", payload), payload) is True
+    assert verifier.verify(sign("first_secret", payload), payload) is True
@@ -0,0 +1,146 @@
+import json
+import uuid
+import random
+import httpx
+import pytest
+from datetime import datetime, timedelta, timezone
+
+import app.utils.history as history_module
+from app.clients.linear import LinearClient
+from app.utils.history import EventHistory, EventTrace, trace_var
+from conftest import sign
+
+TOKEN = "admin_token"
+
+def make_trace(event_type="push", repository="org/app", issue_keys=(), updates=0, failures=0, status_code=200, delivery_id=None):
+    trace = EventTrace(delivery_id or str(uuid.uuid4()), event_type)
+    trace.repository = repository
+    trace.issue_keys = list(issue_keys)
+    trace.mark("wait")
+    trace.linear_updates, trace.linear_failures = updates, failures
+    trace.finish(status_code)
+    return trace
+
+def test_ring_buffer_keeps_newest_entries():
+    """Test that the buffer overwrites the oldest entries and returns newest first"""
+    history = EventHistory(capacity=3)
+    traces = [make_trace(repository=f"org/repo-{i}") for i in range(5)]
+    for trace in traces:
+        history.record(trace)
+
+    entries = history.query()
+    assert history.size == 3
+    assert [entry["repository"] for entry in entries] == ["org/repo-4", "org/repo-3", "org/repo-2"]
+    assert entries[0]["delivery_id"] == traces[4].delivery_id
+    assert set(entries[0]["timings_ms"]) == {"wait", "intake", "parse", "handle", "total"}
+
+def test_query_filters():
+    """Test filtering by every supported field"""
+    history = EventHistory(capacity=10)
+    history.record(make_trace("push", issue_keys=["ABC-1", "ABC-2"], updates=1, failures=1))
+    history.record(make_trace("pull_request", repository="org/web", issue_keys=["ABC-2"], updates=1))
+    history.record(make_trace("workflow_run", status_code=503, delivery_id="replay-7"))
+
+    assert [e["event_type"] for e in history.query(issue_key="ABC-2")] == ["pull_request", "push"]
+    assert history.query(issue_key="ABC-1")[0]["outcome"] == "partial"
+    assert history.query(repository="org/web")[0]["outcome"] == "updated"
+    assert history.query(outcome="rejected")[0]["delivery_id"] == "replay-7"
+    assert history.query(delivery_id="replay-7")[0]["status_code"] == 503
+    assert history.query(event_type="issues") == []
+    assert len(history.query(limit=2)) == 2
+    assert history.query(since=datetime.now(timezone.utc) + timedelta(minutes=1)) == []
+
+def test_delivery_id_lookup_follows_overwrites():
+    """Test that the delivery id index finds every live entry and forgets overwritten ones"""
+    history = EventHistory(capacity=50)
+    rng = random.Random(7)
+    recorded = []
+    for i in range(400):
+        if recorded and rng.random() < 0.2:
+            delivery_id = rng.choice(recorded[-60:])  # a redelivery, possibly already overwritten
+        elif rng.random() < 0.05:
+            delivery_id = f"replay-{i}"
+        else:
+            delivery_id = str(uuid.uuid4())
+        recorded.append(delivery_id)
+        history.record(make_trace(repository=f"org/repo-{i}", delivery_id=delivery_id))
+
+    live = recorded[-50:]
+    for delivery_id in set(recorded[-120:]):
+        expected = [f"org/repo-{i}" for i in range(len(recorded) - 1, len(recorded) - 51, -1) if recorded[i] == delivery_id]
+        assert [e["repository"] for e in history.query(delivery_id=delivery_id)] == expected
+        assert bool(expected) == (delivery_id in live)
+
+def test_scan_stops_at_scan_limit(monkeypatch):
+    """Test that filtered queries only search the newest EVENT_HISTORY_SCAN_LIMIT entries"""
+    monkeypatch.setenv("EVENT_HISTORY_SCAN_LIMIT", "3")
+    history = EventHistory(capacity=10)
+    old = make_trace(issue_keys=["ABC-1"])
+    history.record(old)
+    for _ in range(3):
+        history.record(make_trace())
+
+    assert history.query(issue_key="ABC-1") == []
+    assert history.query(delivery_id=old.delivery_id)[0]["issue_keys"] == ["ABC-1"]
+
+@pytest.mark.asyncio
+async def test_linear_outcome_is_counted_by_the_client(monkeypatch):
+    """Test that a Linear failure hidden behind the mock issue fallback is recorded as linear_error"""
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    monkeypatch.setenv("LINEAR_MAX_RETRIES", "0")
+    client = LinearClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(502))))
+    trace = EventTrace(str(uuid.uuid4()), "pull_request")
+    token = trace_var.set(trace)
+    try:
+        issue = await client.create_or_update_issue(title="Feature", description="")
+    finally:
+        trace_var.reset(token)
+    assert issue.id == "mock-issue-id"
+
+    trace.finish(200)
+    assert (trace.linear_updates, trace.linear_failures, trace.outcome) == (0, 1, "linear_error")
+
+def test_default_capacity_stays_compact():
+    """Test that a full default-sized buffer stays within a few tens of MB"""
+    history = EventHistory()
+    for i in range(history.capacity):
+        history.record(make_trace(issue_keys=[f"ABC-{i % 500}"]))
+    assert history.capacity == 200000
+    assert history.memory_bytes() < 30 * 1024 * 1024
+
+@pytest.fixture
+def client(client, monkeypatch):
+    monkeypatch.setattr(history_module, "_history", EventHistory(capacity=100))
+    return client
+
+def test_webhook_deliveries_are_recorded(client, monkeypatch):
+    """Test that processed and refused deliveries are queryable through the admin API"""
+    monkeypatch.setenv("ADMIN_API_TOKEN", TOKEN)
+    delivery_id = str(uuid.uuid4())
+    body = json.dumps({"zen": "Keep it logically awesome.", "repository": {"full_name": "org/app"}}).encode()
+    headers = {"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping", "X-GitHub-Delivery": delivery_id}
+    assert client.post("/api/github/webhook", content=body, headers=headers).status_code == 200
+    assert client.post("/api/github/webhook", content=body, headers=headers).status_code == 200
+    headers["X-Hub-Signature-256"] = sign(b"tampered")
+    assert client.post("/api/github/webhook", content=body, headers=headers).status_code == 401
+
+    response = client.get(
+        "/api/admin/events",
+        params={"delivery_id": delivery_id},
+        headers={"Authorization": f"Bearer {TOKEN}"}
+    )
+    assert response.status_code == 200
+    events = response.json()["data"]
+    assert [(e["outcome"], e["status_code"]) for e in events] == [("rejected", 401), ("duplicate", 200), ("skipped", 200)]
+    assert events[2]["repository"] == "org/app"
+    assert events[2]["timings_ms"]["total"] >= events[2]["timings_ms"]["parse"]
+
+def test_admin_api_requires_token(client, monkeypatch):
+    """Test that the admin API is off without ADMIN_API_TOKEN and checks the bearer token"""
+    monkeypatch.delenv("ADMIN_API_TOKEN", raising=False)
+    assert client.get("/api/admin/events").status_code == 403
+
+    monkeypatch.setenv("ADMIN_API_TOKEN", TOKEN)
+    assert client.get("/api/admin/events").status_code == 401
+    assert client.get("/api/admin/events", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get("/api/admin/events", headers={"Authorization": f"Bearer {TOKEN}"}).status_code == 200
@@ -2,7 +2,7 @@ import pytest
 from unittest.mock import AsyncMock, patch
 from datetime import datetime
 from app.clients.linear import LinearClient
-from app.models.linear import LinearProject, LinearIssue
+from app.models.linear import LinearProject, LinearIssue, BulkProjectUpdateItem
 
 @pytest.fixture
 def mock_response():
@@ -125,4 +125,42 @@ async def test_linear_client_initialization():
     """Test Linear client initialization with missing API key"""
     with patch.dict("os.environ", clear=True):
         with pytest.raises(ValueError):
-            LinearClient() 
\ No newline at end of file
+            LinearClient() 
+
+@pytest.mark.asyncio
+async def test_update_projects_in_aliased_chunks(monkeypatch, mock_project_response):
+    """Test that bulk updates are chunked into aliased mutations with per-item results"""
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    node = mock_project_response["data"]["project"]
+    queries = []
+
+    async def fake_execute(query, variables=None, raise_on_errors=True):
+        queries.append(query)
+        assert raise_on_errors is False
+        data = {}
+        errors = []
+        for key, project_id in variables.items():
+            if not key.startswith("id"):
+                continue
+            alias = f"u{key[2:]}"
+            if project_id == "missing":
+                data[alias] = None
+                errors.append({"message": "Entity not found", "path": [alias]})
+            else:
+                data[alias] = {"success": True, "project": dict(node, id=project_id)}
+        return {"data": data, "errors": errors}
+
+    client = LinearClient()
+    monkeypatch.setattr(client, "_execute_query", fake_execute)
+    updates = [
+        BulkProjectUpdateItem(project_id=project_id, state="completed", progress=100)
+        for project_id in ["proj-1", "proj-2", "missing", "proj-4", "proj-5"]
+    ]
+    results = await client.update_projects(updates, chunk_size=2, concurrency=2)
+
+    assert len(queries) == 3
+    assert "u1: projectUpdate(id: $id1, input: $input1)" in queries[0]
+    assert [result.project_id for result in results] == ["proj-1", "proj-2", "missing", "proj-4", "proj-5"]
+    assert [result.success for result in results] == [True, True, False, True, True]
+    assert results[2].error == "Entity not found"
+    assert results[4].data.id == "proj-5"
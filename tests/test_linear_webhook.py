@@ -0,0 +1,112 @@
+import hmac
+import hashlib
+import json
+import time
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.clients.linear import project_from_node
+from app.utils.cache import linear_cache
+
+def sign(body: bytes, secret: str = "linear_secret") -> str:
+    return hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+def project_node(**overrides):
+    node = {
+        "id": "proj-1",
+        "name": "Test Project",
+        "description": "A test project",
+        "state": "in_progress",
+        "createdAt": "2024-02-20T12:00:00Z",
+        "updatedAt": "2024-02-20T13:00:00Z",
+        "targetDate": None,
+        "progress": 50.0
+    }
+    node.update(overrides)
+    return node
+
+def post_event(client, payload, secret="linear_secret"):
+    payload.setdefault("webhookTimestamp", int(time.time() * 1000))
+    body = json.dumps(payload).encode()
+    return client.post(
+        "/api/linear/webhook",
+        content=body,
+        headers={"Linear-Signature": sign(body, secret), "Linear-Event": payload["type"]}
+    )
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setenv("LINEAR_WEBHOOK_SECRET", "linear_secret")
+    linear_cache.clear()
+    yield TestClient(app)
+    linear_cache.clear()
+
+def test_project_events_update_cache(client):
+    """Test that project webhooks create, update and remove cached projects"""
+    response = post_event(client, {"action": "create", "type": "Project", "data": project_node()})
+    assert response.status_code == 200
+    assert linear_cache.get_project("proj-1").progress == 50.0
+
+    post_event(client, {"action": "update", "type": "Project", "data": project_node(progress=75.0, updatedAt="2024-02-21T00:00:00Z")})
+    assert linear_cache.get_project("proj-1").progress == 75.0
+
+    post_event(client, {"action": "remove", "type": "Project", "data": project_node()})
+    assert linear_cache.get_project("proj-1") is None
+
+def test_unparseable_project_is_invalidated(client):
+    """Test that a project Linear reports in an unknown state is dropped"""
+    post_event(client, {"action": "create", "type": "Project", "data": project_node()})
+    response = post_event(client, {"action": "update", "type": "Project", "data": project_node(state="started")})
+    assert response.json()["message"] == "Project invalidated"
+    assert linear_cache.get_project("proj-1") is None
+
+def test_issue_events_index_issue_keys(client):
+    """Test that issue webhooks make issue keys resolvable to projects"""
+    issue = {
+        "id": "issue-1",
+        "identifier": "ABC-123",
+        "title": "Test Issue",
+        "state": {"name": "In Progress", "type": "started"},
+        "projectId": "proj-1",
+        "createdAt": "2024-02-20T12:00:00Z",
+        "updatedAt": "2024-02-20T12:00:00Z"
+    }
+    post_event(client, {"action": "create", "type": "Issue", "data": issue})
+    assert linear_cache.get_issue("issue-1").state_type == "started"
+    assert linear_cache.project_for_issue_key("ABC-123") == "proj-1"
+
+def test_rejects_bad_signature_and_stale_timestamp(client):
+    """Test signature and replay protection"""
+    response = post_event(client, {"action": "create", "type": "Project", "data": project_node()}, secret="wrong")
+    assert response.status_code == 401
+
+    stale = {"action": "create", "type": "Project", "data": project_node(), "webhookTimestamp": 0}
+    assert post_event(client, stale).status_code == 401
+    assert linear_cache.get_project("proj-1") is None
+
+def test_rejects_malformed_payloads(client):
+    """Test that bodies that are not the expected shape get 400 rather than a server error"""
+    def post_raw(payload):
+        body = json.dumps(payload).encode()
+        return client.post("/api/linear/webhook", content=body, headers={"Linear-Signature": sign(body)}).status_code
+
+    assert post_raw([{"type": "Project"}]) == 400
+    assert post_raw({"type": "Project", "data": project_node(), "webhookTimestamp": "yesterday"}) == 400
+    assert post_raw({"type": "Project", "data": [project_node()], "webhookTimestamp": int(time.time() * 1000)}) == 400
+
+def test_missing_secret_is_rejected(client, monkeypatch):
+    """Test that a deployment without LINEAR_WEBHOOK_SECRET refuses webhooks instead of failing"""
+    monkeypatch.delenv("LINEAR_WEBHOOK_SECRET")
+    response = post_event(client, {"action": "create", "type": "Project", "data": project_node()})
+    assert response.status_code == 401
+    assert linear_cache.get_project("proj-1") is None
+
+def test_fill_is_discarded_after_concurrent_update():
+    """Test that a read-through fill cannot overwrite newer webhook state"""
+    linear_cache.clear()
+    version = linear_cache.version
+    linear_cache.put_project(project_from_node(project_node(progress=90.0)))
+    assert linear_cache.set_projects([project_from_node(project_node())], version) is False
+    assert linear_cache.get_project("proj-1").progress == 90.0
+    linear_cache.clear()
@@ -0,0 +1,98 @@
+import json
+import queue
+import atexit
+import logging
+import threading
+
+from fastapi.testclient import TestClient
+
+import app.utils.log as log
+from app.main import app
+from app.utils.log import (
+    ContextFilter,
+    DroppingQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    configure_logging,
+    delivery_id_var,
+    request_id_var
+)
+
+def make_record(msg: str, *args, level: int = logging.ERROR) -> logging.LogRecord:
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+def test_repetitive_errors_are_sampled():
+    """Test that each message template passes burst records per window"""
+    sampler = SamplingFilter(burst=2, window=60)
+    passed = [sampler.filter(make_record("Error updating Linear issue %s", f"ABC-{i}")) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert sampler.filter(make_record("Another error %s", 1))
+    assert sampler.filter(make_record("Routine %s", 1, level=logging.INFO))
+
+    sampler.window = 0
+    record = make_record("Error updating Linear issue %s", "ABC-9")
+    assert sampler.filter(record)
+    assert record.suppressed == 3
+
+def test_json_output_carries_correlation_ids():
+    """Test that request and delivery ids are attached to structured records"""
+    request_token = request_id_var.set("req-1")
+    delivery_token = delivery_id_var.set("delivery-1")
+    try:
+        record = make_record("Error processing webhook: %s", "boom")
+        ContextFilter().filter(record)
+    finally:
+        request_id_var.reset(request_token)
+        delivery_id_var.reset(delivery_token)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Error processing webhook: boom"
+    assert entry["request_id"] == "req-1"
+    assert entry["delivery_id"] == "delivery-1"
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that the caller never waits for the log writer"""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.dropped == 1
+    assert handler.queue.get_nowait().msg == "first"
+
+def test_queued_record_is_a_copy():
+    """Test that merging the arguments leaves the caller's record untouched"""
+    handler = DroppingQueueHandler(queue.Queue())
+    record = make_record("Error updating Linear issue %s", "ABC-1")
+    handler.handle(record)
+    assert (record.msg, record.args) == ("Error updating Linear issue %s", ("ABC-1",))
+    queued = handler.queue.get_nowait()
+    assert queued is not record
+    assert (queued.msg, queued.args) == ("Error updating Linear issue ABC-1", None)
+
+def test_sampling_counts_are_exact_across_threads():
+    """Test that concurrent threads never let more than burst records through"""
+    sampler = SamplingFilter(burst=100, window=60)
+    passed = []
+
+    def log_many():
+        passed.extend(sampler.filter(make_record("Error %s", i)) for i in range(1000))
+
+    threads = [threading.Thread(target=log_many) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(passed) == 100
+
+def test_reconfiguring_registers_shutdown_once(monkeypatch):
+    """Test that repeated configure_logging() calls do not stack atexit hooks"""
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(log, "_atexit_registered", False)
+    configure_logging()
+    configure_logging()
+    assert registered == [log.shutdown_logging]
+
+def test_request_id_is_echoed():
+    """Test that responses carry the request id used in logs"""
+    client = TestClient(app)
+    assert client.get("/health", headers={"X-Request-ID": "abc"}).headers["x-request-id"] == "abc"
+    assert client.get("/health").headers["x-request-id"]
@@ -0,0 +1,111 @@
+import copy
+import json
+import asyncio
+import pytest
+from concurrent.futures.process import BrokenProcessPool
+
+import app.utils.offload as offload
+from app.models.github import PushEvent
+from app.utils.metrics import metrics
+from app.utils.webhook_test import SAMPLE_PUSH_EVENT
+from conftest import sign
+
+@pytest.fixture
+def client(client, monkeypatch):
+    monkeypatch.setenv("WEBHOOK_OFFLOAD_BYTES", "1024")
+    monkeypatch.setenv("WEBHOOK_OFFLOAD_WORKERS", "1")
+    metrics.reset()
+    yield client
+    offload.shutdown_offload_pool()
+
+def large_push_body() -> bytes:
+    payload = copy.deepcopy(SAMPLE_PUSH_EVENT)
+    for commit in payload["commits"]:
+        commit["message"] = "Tidy up"
+        # Fields the model does not keep, as in real push payloads
+        commit["modified"] = [f"src/module_{i}.py" for i in range(200)]
+    return json.dumps(payload).encode()
+
+def test_parse_payload_validates_event():
+    """Test that a worker returns the validated model and the action"""
+    parsed = offload.parse_payload("push", json.dumps(SAMPLE_PUSH_EVENT).encode())
+    assert isinstance(parsed.payload, PushEvent)
+    assert parsed.error is None
+
+    parsed = offload.parse_payload("pull_request", json.dumps({"action": "opened"}).encode())
+    assert parsed.action == "opened"
+    assert parsed.payload is None and "validation error" in parsed.error
+
+    with pytest.raises(ValueError, match="Invalid JSON payload"):
+        offload.parse_payload("push", b"{not json")
+
+def test_large_webhook_is_parsed_in_pool(client):
+    """Test that bodies over the threshold go through the pool and are handled as usual"""
+    body = large_push_body()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "push"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"message": "Push event processed", "updates": []}
+    assert metrics.get("webhook_offloaded_total") == 1
+
+def test_small_webhook_is_parsed_inline(client):
+    """Test that bodies under the threshold never touch the pool"""
+    body = json.dumps({"zen": "Keep it logically awesome."}).encode()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping"}
+    )
+    assert response.status_code == 200
+    assert metrics.get("webhook_offloaded_total") == 0
+    assert offload._pool is None
+
+def test_invalid_large_webhook_is_rejected(client):
+    """Test that malformed JSON from the pool still answers 400"""
+    body = b"{" + b" " * 2048
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "push"}
+    )
+    assert response.status_code == 400
+
+def test_broken_pool_falls_back_to_a_thread(client, monkeypatch):
+    """Test that a broken pool is replaced and the body is parsed off the event loop"""
+    threads = []
+
+    class BrokenPool:
+        def submit(self, fn, *args):
+            raise BrokenProcessPool("worker died")
+
+        def shutdown(self, wait=True, cancel_futures=False):
+            pass
+
+    def to_thread(fn, *args):
+        threads.append(fn)
+        return asyncio.sleep(0, fn(*args))
+
+    monkeypatch.setattr(offload, "_pool", BrokenPool())
+    monkeypatch.setattr(offload.asyncio, "to_thread", to_thread)
+    body = large_push_body()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "push"}
+    )
+    assert response.status_code == 200
+    assert threads == [offload.parse_payload]
+    assert metrics.get("webhook_offload_failures_total") == 1
+    assert offload._pool is None
+
+def test_pool_is_small_by_default(monkeypatch):
+    """Test that each server process gets a couple of parsing workers, not one per CPU"""
+    monkeypatch.delenv("WEBHOOK_OFFLOAD_WORKERS", raising=False)
+    monkeypatch.setattr(offload.os, "cpu_count", lambda: 64)
+    try:
+        assert offload.get_offload_pool()._max_workers == 2
+    finally:
+        offload.shutdown_offload_pool()
@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.utils.state as state
+from app.main import app
+from app.models.linear import LinearIssue
+from app.utils.readiness import ReadinessTracker
+from app.utils.state import MemoryStateBackend
+
+def issue(issue_id: str, state_type: str, project_id: str = "proj-1") -> LinearIssue:
+    now = datetime.now(timezone.utc)
+    return LinearIssue(
+        id=issue_id,
+        identifier=f"ABC-{issue_id}",
+        title="Issue",
+        state=state_type.title(),
+        state_type=state_type,
+        project_id=project_id,
+        created_at=now,
+        updated_at=now
+    )
+
+def test_readiness_is_maintained_incrementally():
+    """Test that issues, pull requests and CI runs each move the rollup"""
+    tracker = ReadinessTracker(backend=MemoryStateBackend())
+    assert tracker.get("proj-1") is None
+
+    tracker.apply_issue(issue("1", "started"))
+    tracker.apply_issue(issue("2", "unstarted"))
+    tracker.apply_pull_request("proj-1", "org/repo", 7, "open")
+    tracker.apply_workflow_run("proj-1", "ABC-1-fix", "blocked", None, "abc123", datetime(2024, 2, 20, tzinfo=timezone.utc))
+    readiness = tracker.get("proj-1")
+    assert readiness.ready is False
+    assert readiness.blockers == ["2 open issues", "1 open pull request", "CI blocked on ABC-1-fix"]
+
+    tracker.apply_issue(issue("1", "completed"))
+    tracker.apply_issue(issue("2", "started", project_id="proj-2"))
+    tracker.apply_pull_request("proj-1", "org/repo", 7, "merged")
+    tracker.apply_workflow_run("proj-1", "ABC-1-fix", "completed", 100.0, "abc123", datetime(2024, 2, 21, tzinfo=timezone.utc))
+    # An older run delivered late must not overwrite the newer result
+    tracker.apply_workflow_run("proj-1", "ABC-1-fix", "blocked", None, "abc123", datetime(2024, 2, 19, tzinfo=timezone.utc))
+    readiness = tracker.get("proj-1")
+    assert readiness.ready is True
+    assert readiness.open_issues == 0
+    assert readiness.merged_pull_requests == 1
+    assert tracker.get("proj-2").open_issues == 1
+
+    tracker.remove_issue("2")
+    assert tracker.get("proj-2").ready is True
+
+def test_closing_a_pull_request_drops_its_branch_ci():
+    """Test that a merged or closed pull request's head branch leaves the CI map"""
+    tracker = ReadinessTracker(backend=MemoryStateBackend())
+    tracker.apply_workflow_run("proj-1", "ABC-1-fix", "blocked", None, "abc123", datetime(2024, 2, 20, tzinfo=timezone.utc))
+    tracker.apply_workflow_run("proj-1", "ABC-2-feature", "in_progress", 50.0, "def456", datetime(2024, 2, 20, tzinfo=timezone.utc))
+    tracker.apply_pull_request("proj-1", "org/repo", 7, "open", branch="ABC-1-fix")
+    assert [ci.branch for ci in tracker.get("proj-1").ci] == ["ABC-1-fix", "ABC-2-feature"]
+
+    tracker.apply_pull_request("proj-1", "org/repo", 7, "closed", branch="ABC-1-fix")
+    readiness = tracker.get("proj-1")
+    assert [ci.branch for ci in readiness.ci] == ["ABC-2-feature"]
+    assert readiness.blockers == ["CI in_progress on ABC-2-feature"]
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(state, "_backend", MemoryStateBackend())
+    return TestClient(app)
+
+def test_readiness_endpoint(client, monkeypatch):
+    """Test that the readiness endpoint serves the tracked rollup"""
+    import app.routers.linear as linear_router
+    tracker = ReadinessTracker(backend=MemoryStateBackend())
+    monkeypatch.setattr(linear_router, "readiness_tracker", tracker)
+
+    assert client.get("/api/linear/projects/proj-1/readiness").status_code == 404
+
+    tracker.apply_issue(issue("1", "started"))
+    response = client.get("/api/linear/projects/proj-1/readiness")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["ready"] is False
+    assert data["open_issues"] == 1
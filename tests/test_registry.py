@@ -0,0 +1,214 @@
+import hmac
+import json
+import hashlib
+import time
+import httpx
+import pytest
+
+import app.clients.registry as registry_module
+import app.utils.state as state
+from app.clients.linear import issue_from_node
+from app.clients.registry import RateBudget, WorkspaceRegistry
+from app.utils.bulkhead import Bulkhead, bulkhead_var
+from app.utils.cache import linear_cache
+from app.utils.deadline import DeadlineExceeded, deadline
+from app.utils.github import WebhookVerifier
+from app.utils.state import MemoryStateBackend
+from app.utils.webhook_test import SAMPLE_PR_EVENT
+from conftest import SECRET, sign
+
+ACME_SECRET = "acme_secret"
+ACME_LINEAR_SECRET = "acme_linear_secret"
+
+WORKSPACES = [
+    {
+        "name": "acme",
+        "api_key": "acme_key",
+        "api_url": "https://linear.test/acme",
+        "team_id": "acme_team",
+        "repositories": ["acme/*", "shared/tools"],
+        "webhook_secrets": [ACME_SECRET],
+        "linear_webhook_secret": ACME_LINEAR_SECRET,
+        "rate_limit_per_hour": 3600
+    },
+    {"name": "globex", "api_key_env": "GLOBEX_LINEAR_KEY", "repositories": ["org/test-repo"]},
+    {"name": "broken", "repositories": ["broken/*"]}
+]
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setenv("GLOBEX_LINEAR_KEY", "globex_key")
+    registry = WorkspaceRegistry(workspaces=WORKSPACES)
+    monkeypatch.setattr(registry_module, "_registry", registry)
+    return registry
+
+def test_deliveries_resolve_to_workspaces(registry):
+    """Test that deliveries that name no workspace go by repository, then to the default"""
+    assert len(registry) == 3  # default, acme, globex; broken has no API key
+    assert registry.resolve(repository="acme/api").name == "acme"
+    assert registry.resolve(repository="shared/tools").name == "acme"
+    assert registry.resolve(repository="org/test-repo").name == "globex"
+    assert registry.resolve(repository="other/repo").is_default
+    assert registry.get("globex").api_key == "globex_key"
+
+def test_tenant_secrets_stay_with_their_workspace(registry):
+    """Test that only a tenant's own verifier knows its webhook secrets"""
+    body = b'{"zen": "Keep it simple."}'
+    assert registry.get("acme").verifier().verify(sign(body, ACME_SECRET), body)
+    assert not registry.get("acme").verifier().verify(sign(body, SECRET), body)
+    assert registry.get("globex").verifier() is None
+    assert not WebhookVerifier(secrets=[SECRET]).verify(sign(body, ACME_SECRET), body)
+
+def test_workspaces_have_separate_pools_and_caches(registry):
+    """Test that tenants get their own connection pool and cache namespace"""
+    acme, globex = registry.get("acme"), registry.get("globex")
+    assert acme.http_client() is not globex.http_client()
+    assert acme.cache is not globex.cache
+    assert registry.default.cache is linear_cache
+
+def test_tenant_cache_does_not_share_default_keys(monkeypatch):
+    """Test that clearing the default cache leaves a tenant named like a cache key alone"""
+    monkeypatch.setattr(state, "_backend", MemoryStateBackend())
+    issue = WorkspaceRegistry(workspaces=[{"name": "issue", "api_key": "issue_key"}]).get("issue")
+    issue.cache.put_issue(issue_from_node({
+        "id": "issue-1",
+        "identifier": "ABC-1",
+        "title": "Tenant issue",
+        "state": {"name": "In Progress", "type": "started"},
+        "project": {"id": "proj-1"},
+        "createdAt": "2024-02-20T00:00:00Z",
+        "updatedAt": "2024-02-20T00:00:00Z"
+    }))
+    linear_cache.clear()
+    assert issue.cache.project_for_issue_key("ABC-1") == "proj-1"
+
+@pytest.mark.asyncio
+async def test_rate_budget_fails_fast_past_deadline():
+    """Test that an exhausted budget refuses requests whose deadline is too close"""
+    budget = RateBudget(per_hour=36000)
+    for _ in range(int(budget.capacity)):
+        assert await budget.acquire() == 0.0
+    with deadline(0.01):
+        with pytest.raises(DeadlineExceeded):
+            await budget.acquire()
+    assert 0 < await budget.acquire() <= 0.11
+
+@pytest.mark.asyncio
+async def test_rate_wait_does_not_hold_a_linear_slot(registry, monkeypatch):
+    """Test that a request waiting for its workspace's rate budget holds no bulkhead Linear slot"""
+    acme = registry.get("acme")
+    acme._http_client = httpx.AsyncClient(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, json={"data": {"viewer": {"id": "user_1"}}})
+    ))
+    bulkhead = Bulkhead("test", concurrency=1, queue_size=1, linear_calls=1, queue_timeout=1.0)
+    slots_held = []
+
+    async def before_request():
+        slots_held.append(bulkhead.stats()["linear_in_flight"])
+
+    monkeypatch.setattr(acme, "before_request", before_request)
+    token = bulkhead_var.set(bulkhead)
+    try:
+        await acme.client().warm_up()
+    finally:
+        bulkhead_var.reset(token)
+    assert slots_held == [0]
+
+def test_tenant_delivery_uses_tenant_workspace(registry, client, monkeypatch):
+    """Test that a delivery to a tenant's webhook URL goes to that tenant's Linear workspace"""
+    requests = []
+
+    def handler(request):
+        requests.append((str(request.url), request.headers["Authorization"], json.loads(request.content)["variables"]))
+        return httpx.Response(200, json={"data": {"issueCreate": {"success": True, "issue": {
+            "id": "issue-1", "identifier": "XYZ-789", "title": "Feature", "description": None,
+            "state": {"name": "In Progress", "type": "started"}, "project": None, "assignee": None,
+            "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z"
+        }}}})
+
+    acme = registry.get("acme")
+    acme._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # Only tenants are configured; the default workspace has no API key
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+
+    body = json.dumps(SAMPLE_PR_EVENT).encode()
+    response = client.post(
+        "/api/github/webhook",
+        params={"workspace": "acme"},
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body, ACME_SECRET), "X-GitHub-Event": "pull_request"}
+    )
+    assert response.status_code == 200
+    assert response.json()["issue_id"] == "issue-1"
+    assert requests == [("https://linear.test/acme", "acme_key", requests[0][2])]
+    assert requests[0][2]["teamId"] == "acme_team"
+
+    stats = registry.stats()
+    assert stats["acme"]["requests_total"] == 1
+    assert stats["acme"]["latency_ms"]["p50"] is not None
+    assert stats["default"]["requests_total"] == 0
+
+def test_webhook_secrets_are_checked_per_workspace(registry, client, monkeypatch):
+    """Test that tenant and deployment secrets are not accepted on each other's webhook URLs"""
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+    body = json.dumps({"zen": "Keep it simple."}).encode()
+
+    def deliver(secret, **params):
+        return client.post(
+            "/api/github/webhook",
+            params=params,
+            content=body,
+            headers={"X-Hub-Signature-256": sign(body, secret), "X-GitHub-Event": "ping"}
+        ).status_code
+
+    assert deliver(ACME_SECRET) == 401
+    assert deliver(SECRET, workspace="acme") == 401
+    assert deliver(ACME_SECRET, workspace="acme") == 200
+    # A workspace without secrets of its own uses the deployment's
+    assert deliver(SECRET, workspace="globex") == 200
+    assert deliver(SECRET, workspace="initech") == 404
+
+def test_linear_webhooks_are_checked_per_workspace(registry, client, monkeypatch):
+    """Test that a tenant's Linear webhook is verified with its own secret and updates its own cache"""
+    monkeypatch.setenv("LINEAR_WEBHOOK_SECRET", "linear_secret")
+    body = json.dumps({
+        "action": "create",
+        "type": "Project",
+        "webhookTimestamp": int(time.time() * 1000),
+        "data": {
+            "id": "proj-1",
+            "name": "Acme Project",
+            "state": "in_progress",
+            "createdAt": "2024-02-20T12:00:00Z",
+            "updatedAt": "2024-02-20T13:00:00Z"
+        }
+    }).encode()
+
+    def deliver(secret, **params):
+        signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return client.post("/api/linear/webhook", params=params, content=body, headers={"Linear-Signature": signature}).status_code
+
+    assert deliver(ACME_LINEAR_SECRET) == 401
+    assert deliver("linear_secret", workspace="acme") == 401
+    assert deliver(ACME_LINEAR_SECRET, workspace="initech") == 404
+    assert deliver(ACME_LINEAR_SECRET, workspace="acme") == 200
+    assert registry.get("acme").cache.get_project("proj-1").name == "Acme Project"
+    assert linear_cache.get_project("proj-1") is None
+
+def test_ping_needs_no_default_api_key(registry, client, monkeypatch):
+    """Test that an event that never reaches Linear is answered without a default workspace key"""
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+
+    body = json.dumps({"zen": "Design for failure."}).encode()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping"}
+    )
+    assert response.status_code == 200
+
+def test_unknown_workspace_is_404(registry, client, monkeypatch):
+    """Test that the project endpoints reject a workspace that is not configured"""
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+    response = client.get("/api/linear/projects", params={"workspace": "initech"})
+    assert response.status_code == 404
@@ -0,0 +1,142 @@
+import json
+import argparse
+import pytest
+
+import app.clients.registry as registry_module
+from replay_events import Checkpoint, parse_delivery, replay
+from app.clients.linear import LinearClient
+from app.clients.registry import WorkspaceRegistry
+from app.utils.webhook_test import SAMPLE_PUSH_EVENT, SAMPLE_PR_EVENT
+
+GOOD = json.dumps({"event": "push", "delivery_id": "good", "payload": SAMPLE_PUSH_EVENT}) + "\n"
+BAD = json.dumps({"event": "push", "delivery_id": "bad", "payload": {"ref": 1}}) + "\n"
+
+def replay_args(tmp_path, archive, **overrides) -> argparse.Namespace:
+    args = dict(
+        archive=str(archive),
+        concurrency=4,
+        batch_size=1,
+        checkpoint=str(tmp_path / "replay.checkpoint"),
+        failures=str(tmp_path / "failures.jsonl"),
+        restart=False,
+        dry_run=True,
+        workspace=None,
+        timeout=5.0,
+        progress_interval=60.0
+    )
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+def test_parse_delivery_formats():
+    """Test that both archive line formats are understood and bad lines are rejected"""
+    line = json.dumps({"event": "push", "delivery_id": "d-1", "payload": SAMPLE_PUSH_EVENT})
+    assert parse_delivery(line.encode()) == ("push", "d-1", SAMPLE_PUSH_EVENT)
+
+    line = json.dumps({
+        "headers": {"X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "d-2"},
+        "body": json.dumps(SAMPLE_PR_EVENT)
+    })
+    assert parse_delivery(line.encode()) == ("pull_request", "d-2", SAMPLE_PR_EVENT)
+
+    with pytest.raises(ValueError):
+        parse_delivery(json.dumps({"payload": SAMPLE_PUSH_EVENT}).encode())
+    with pytest.raises(ValueError):
+        parse_delivery(b"not json")
+
+def test_checkpoint_round_trip(tmp_path):
+    """Test that a saved checkpoint is loaded back and tied to its archive"""
+    path = str(tmp_path / "replay.checkpoint")
+    checkpoint = Checkpoint(path, "archive.jsonl")
+    checkpoint.offset, checkpoint.processed, checkpoint.failed, checkpoint.failures_offset = 120, 3, 1, 40
+    checkpoint.save()
+
+    loaded = Checkpoint(path, "archive.jsonl")
+    loaded.load()
+    assert (loaded.offset, loaded.processed, loaded.failed, loaded.failures_offset) == (120, 3, 1, 40)
+    with pytest.raises(SystemExit):
+        Checkpoint(path, "other.jsonl").load()
+
+@pytest.mark.asyncio
+async def test_failures_are_recorded_and_run_resumes_from_offset(tmp_path):
+    """Test that failed deliveries are written once and a resumed run skips checkpointed lines"""
+    archive = tmp_path / "deliveries.jsonl"
+    archive.write_text(GOOD + BAD)
+    args = replay_args(tmp_path, archive)
+
+    assert await replay(args) == 1
+    failures = (tmp_path / "failures.jsonl").read_text().splitlines()
+    assert len(failures) == 1
+    assert json.loads(failures[0])["delivery_id"] == "bad"
+    assert "replay_error" in json.loads(failures[0])
+
+    # Only the appended lines are replayed on the next run
+    with open(archive, "a") as f:
+        f.write(GOOD + BAD)
+    assert await replay(args) == 1
+    checkpoint = Checkpoint(args.checkpoint, args.archive)
+    checkpoint.load()
+    assert (checkpoint.processed, checkpoint.failed) == (4, 2)
+    assert len((tmp_path / "failures.jsonl").read_text().splitlines()) == 2
+
+@pytest.mark.asyncio
+async def test_interrupted_batch_does_not_duplicate_failures(tmp_path):
+    """Test that failures written after the last checkpoint are dropped before the batch is replayed"""
+    archive = tmp_path / "deliveries.jsonl"
+    archive.write_text(GOOD + BAD)
+    args = replay_args(tmp_path, archive)
+
+    checkpoint = Checkpoint(args.checkpoint, args.archive)
+    checkpoint.failures_offset = 0
+    checkpoint.save()
+    # A crash after the failure was written but before the checkpoint was saved
+    (tmp_path / "failures.jsonl").write_text(BAD)
+
+    assert await replay(args) == 1
+    assert len((tmp_path / "failures.jsonl").read_text().splitlines()) == 1
+
+@pytest.mark.asyncio
+async def test_repeated_resumes_keep_failures_file_intact(tmp_path):
+    """Test that a resumed batch without failures records the truncated size, so the next resume stays valid"""
+    archive = tmp_path / "deliveries.jsonl"
+    archive.write_text(GOOD)
+    args = replay_args(tmp_path, archive)
+
+    checkpoint = Checkpoint(args.checkpoint, args.archive)
+    checkpoint.failures_offset = 0
+    checkpoint.save()
+    # A crash left a failure behind that the resume drops; the batch itself writes nothing
+    (tmp_path / "failures.jsonl").write_text(BAD)
+    assert await replay(args) == 0
+    checkpoint.load()
+    assert checkpoint.failures_offset == (tmp_path / "failures.jsonl").stat().st_size == 0
+
+    with open(archive, "a") as f:
+        f.write(BAD)
+    assert await replay(args) == 1
+    content = (tmp_path / "failures.jsonl").read_bytes()
+    assert b"\0" not in content
+    assert [json.loads(line)["delivery_id"] for line in content.splitlines()] == ["bad"]
+
+@pytest.mark.asyncio
+async def test_deliveries_replay_into_their_repository_workspace(tmp_path, monkeypatch):
+    """Test that each delivery is replayed with the client of the workspace its repository maps to"""
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+    monkeypatch.setattr(registry_module, "_registry", WorkspaceRegistry(workspaces=[
+        {"name": "acme", "api_key": "acme_key", "team_id": "acme_team", "repositories": ["org/test-repo"]}
+    ]))
+    calls = []
+
+    async def send(self, query, variables, raise_on_errors, is_mutation):
+        calls.append((self.workspace.name, self.api_key, variables.get("teamId")))
+        return {"data": {"issueCreate": {"success": True, "issue": {
+            "id": "issue-1", "identifier": "ABC-123", "title": "Feature", "description": None,
+            "state": {"name": "In Progress", "type": "started"}, "project": None, "assignee": None,
+            "createdAt": "2024-01-01T00:00:00Z", "updatedAt": "2024-01-01T00:00:00Z"
+        }}}}
+
+    monkeypatch.setattr(LinearClient, "_send_query", send)
+    archive = tmp_path / "deliveries.jsonl"
+    archive.write_text(GOOD)
+
+    assert await replay(replay_args(tmp_path, archive, dry_run=False)) == 0
+    assert calls == [("acme", "acme_key", "acme_team")]
@@ -0,0 +1,36 @@
+import os
+import json
+
+from app.utils.routing import ProjectRouter, Route, RoutingTable
+
+def test_first_matching_route_wins():
+    """Test exact, prefix, glob, branch and issue-prefix routes in file order"""
+    table = RoutingTable([
+        {"repository": "org/*", "branch": "release/*", "project_id": "proj-release"},
+        {"repository": "org/api", "project_id": "proj-api", "team_id": "team-api"},
+        {"issue_prefix": "WEB", "project_id": "proj-web"},
+        {"repository": "org/*", "team_id": "team-org"},
+        {"repository": "*-docs", "project_id": "proj-docs"}
+    ])
+    assert table.match("org/api", "release/1.0", "ABC-1") == Route(project_id="proj-release")
+    assert table.match("org/api", "main", "WEB-1") == Route(project_id="proj-api", team_id="team-api")
+    assert table.match("org/site", "main", "WEB-2") == Route(project_id="proj-web")
+    assert table.match("org/site", "main", "ABC-3") == Route(team_id="team-org")
+    assert table.match("other/user-docs", "main") == Route(project_id="proj-docs")
+    assert table.match("other/repo", "main", "ABC-4") is None
+
+def test_routes_file_is_hot_reloaded(tmp_path):
+    """Test that edits to the routes file are picked up and bad files are ignored"""
+    routes_file = tmp_path / "routes.json"
+    routes_file.write_text(json.dumps({"routes": [{"repository": "org/api", "project_id": "proj-1"}]}))
+    router = ProjectRouter(routes_file=str(routes_file))
+    router.RELOAD_CHECK_INTERVAL = 0
+    assert router.match("org/api").project_id == "proj-1"
+
+    routes_file.write_text(json.dumps([{"repository": "org/api", "project_id": "proj-2"}]))
+    os.utime(routes_file, (1, 1))
+    assert router.match("org/api").project_id == "proj-2"
+
+    routes_file.write_text("{not json")
+    os.utime(routes_file, (2, 2))
+    assert router.match("org/api").project_id == "proj-2"
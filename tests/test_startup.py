@@ -0,0 +1,94 @@
+import asyncio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.clients import linear as linear_client_module
+from app.utils import offload
+from app.utils import startup as startup_module
+from app.utils.metrics import metrics
+
+@pytest.fixture
+def fresh_startup(monkeypatch):
+    state = startup_module.StartupState()
+    state.mark_imported()
+    monkeypatch.setattr(startup_module, "startup", state)
+    monkeypatch.setattr("app.main.startup", state)
+    metrics.reset()
+    return state
+
+@pytest.mark.asyncio
+async def test_warm_up_opens_linear_connection(monkeypatch, fresh_startup):
+    """Test that warm-up runs every step, queries Linear once and reports timings"""
+    queries = []
+
+    def handler(request):
+        queries.append(request.content)
+        return httpx.Response(200, json={"data": {"viewer": {"id": "user_1"}}})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    monkeypatch.setattr(linear_client_module, "open_shared_http_client", lambda: http_client)
+
+    await startup_module.warm_up()
+
+    assert fresh_startup.ready
+    assert fresh_startup.errors == {}
+    assert set(fresh_startup.steps) == {"workspaces", "webhook_verifier", "project_routes", "state_backend", "event_history", "validators", "linear_connection"}
+    assert len(queries) == 1 and b"viewer" in queries[0]
+    # The parsing pool waits for the first oversized body
+    assert offload._pool is None
+    report = fresh_startup.as_dict()
+    assert report["warmup_seconds"] <= report["total_seconds"]
+    assert metrics.get("startup_total_seconds") == report["total_seconds"]
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_step_still_becomes_ready(monkeypatch, fresh_startup):
+    """Test that a failing step is recorded without keeping the process unready"""
+    monkeypatch.delenv("LINEAR_API_KEY", raising=False)
+
+    await startup_module.warm_up()
+
+    assert fresh_startup.ready
+    assert list(fresh_startup.errors) == ["linear_connection"]
+    assert fresh_startup.as_dict()["errors"]["linear_connection"].startswith("ValueError")
+
+def test_ready_endpoint_waits_for_warm_up(fresh_startup):
+    """Test that /ready is 503 while warming up and 200 with timings afterwards"""
+    client = TestClient(app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "warming_up"
+
+    fresh_startup.warmup_started = fresh_startup.imported
+    fresh_startup.ready_at = fresh_startup.imported
+    response = client.get("/ready")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert "import_seconds" in body and "total_seconds" in body
+
+def test_shutdown_waits_for_cancelled_warm_up(monkeypatch, fresh_startup):
+    """Test that shutdown lets an unfinished warm-up unwind before closing the shared client"""
+    events = []
+
+    async def slow_warm_up():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            await asyncio.sleep(0)
+            events.append("warm_up_cancelled")
+            raise
+
+    async def close_shared_http_client():
+        events.append("client_closed")
+
+    monkeypatch.setattr("app.main.warm_up", slow_warm_up)
+    monkeypatch.setattr("app.main.close_shared_http_client", close_shared_http_client)
+
+    with TestClient(app):
+        pass
+
+    assert events == ["warm_up_cancelled", "client_closed"]
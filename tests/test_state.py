@@ -0,0 +1,164 @@
+import time
+import sqlite3
+import multiprocessing
+import httpx
+import pytest
+from datetime import datetime, timezone
+
+import app.utils.state as state
+from app.clients.linear import LinearClient
+from app.models.linear import LinearProject
+from app.utils.cache import LinearCache
+from app.utils.deadline import DeadlineExceeded, deadline
+from app.utils.state import MemoryStateBackend, SQLiteStateBackend, consume_budget
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStateBackend()
+    return SQLiteStateBackend(str(tmp_path / "state.sqlite3"))
+
+def _increment(path: str, times: int) -> None:
+    backend = SQLiteStateBackend(path)
+    for _ in range(times):
+        backend.incr("counter")
+
+def test_backend_operations(backend):
+    """Test get/set/add/incr/update/delete semantics shared by all backends"""
+    backend.set("a", {"x": 1})
+    assert backend.get("a") == {"x": 1}
+    assert backend.add("a", 2) is False
+    assert backend.add("b", 2) is True
+    assert backend.incr("n") == 1
+    assert backend.incr("n", 5) == 6
+    assert backend.update("a", lambda value: {"x": value["x"] + 1}) == {"x": 2}
+    backend.delete("a")
+    assert backend.get("a") is None
+    backend.set("prefix:1", 1)
+    backend.set("prefix:2", 2)
+    backend.set("PREFIX:3", 3)
+    assert backend.get_prefix("prefix:") == {"prefix:1": 1, "prefix:2": 2}
+    backend.delete_prefix("prefix:")
+    assert backend.get("PREFIX:3") == 3
+    assert backend.get("prefix:1") is None and backend.get("b") == 2
+
+def test_backend_ttl(backend, monkeypatch):
+    """Test that entries expire after their ttl"""
+    now = [1000.0]
+    monkeypatch.setattr(state.time, "time", lambda: now[0])
+    backend.set("short", 1, ttl=10)
+    assert backend.add("dedup", 1, ttl=10) is True
+    now[0] += 11
+    assert backend.get("short") is None
+    assert backend.add("dedup", 1, ttl=10) is True
+
+def test_memory_backend_purges_unread_expired_entries(monkeypatch):
+    """Test that expired keys that are never read again do not accumulate"""
+    now = [1000.0]
+    monkeypatch.setattr(state.time, "time", lambda: now[0])
+    backend = MemoryStateBackend()
+    for i in range(10):
+        backend.add(f"delivery:{i}", 1, ttl=10)
+    now[0] += 11
+    for i in range(MemoryStateBackend.PURGE_EVERY):
+        backend.set(f"live:{i}", i)
+    assert not any(key.startswith("delivery:") for key in backend._data)
+
+def test_consume_budget(backend):
+    """Test fixed-window budgets"""
+    assert all(consume_budget(backend, "linear", limit=3, window=60) for _ in range(3))
+    assert consume_budget(backend, "linear", limit=3, window=60) is False
+
+@pytest.mark.asyncio
+async def test_linear_client_takes_the_shared_budget(monkeypatch):
+    """Test that Linear requests stop at LINEAR_REQUEST_BUDGET until the window ends"""
+    monkeypatch.setenv("LINEAR_API_KEY", "test_key")
+    monkeypatch.setenv("LINEAR_REQUEST_BUDGET", "2")
+    monkeypatch.setattr(state, "_backend", MemoryStateBackend())
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"data": {"projects": {"nodes": []}}})
+
+    client = LinearClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    for _ in range(2):
+        assert await client.get_projects() == []
+    with pytest.raises(DeadlineExceeded):
+        with deadline(1.0):
+            await client.get_projects()
+    assert len(calls) == 2
+
+def test_sqlite_lock_does_not_stall_the_caller(tmp_path):
+    """Test that a write blocked by another worker's lock gives up after the busy timeout"""
+    path = str(tmp_path / "state.sqlite3")
+    backend = SQLiteStateBackend(path, busy_timeout=0.05)
+    backend.set("counter", 0)
+    other = sqlite3.connect(path, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        with pytest.raises(sqlite3.OperationalError):
+            backend.incr("counter")
+        assert time.monotonic() - started < 1.0
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+    assert backend.incr("counter") == 1
+
+def test_sqlite_incr_is_atomic_across_processes(tmp_path):
+    """Test that concurrent workers never lose counter updates"""
+    path = str(tmp_path / "state.sqlite3")
+    SQLiteStateBackend(path).set("counter", 0)
+    workers = [multiprocessing.Process(target=_increment, args=(path, 200)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert SQLiteStateBackend(path).get("counter") == 800
+
+def test_cache_is_shared_through_sqlite(tmp_path):
+    """Test that a webhook applied by one worker's cache is seen by another's"""
+    path = str(tmp_path / "state.sqlite3")
+    worker_a = LinearCache(backend=SQLiteStateBackend(path))
+    worker_b = LinearCache(backend=SQLiteStateBackend(path))
+    project = LinearProject(
+        id="proj-1",
+        name="Test Project",
+        state="in_progress",
+        created_at=datetime(2024, 2, 20, tzinfo=timezone.utc),
+        updated_at=datetime(2024, 2, 20, tzinfo=timezone.utc)
+    )
+    worker_a.set_projects([project], worker_a.version)
+    assert [p.id for p in worker_b.get_projects()] == ["proj-1"]
+
+    version = worker_b.version
+    worker_a.put_project(project.model_copy(update={"progress": 80.0, "updated_at": datetime(2024, 2, 21, tzinfo=timezone.utc)}))
+    assert worker_b.fill_project(project, version) is False
+    assert worker_b.get_project("proj-1").progress == 80.0
+
+def test_cache_stores_each_project_under_its_own_key(backend):
+    """Test that a webhook rewrites one project's key and a removal blocks a stale fill"""
+    cache = LinearCache(backend=backend)
+    projects = [
+        LinearProject(
+            id=f"proj-{i}",
+            name=f"Project {i}",
+            state="in_progress",
+            created_at=datetime(2024, 2, 20, tzinfo=timezone.utc),
+            updated_at=datetime(2024, 2, 20, tzinfo=timezone.utc)
+        )
+        for i in range(3)
+    ]
+    assert cache.get_projects() is None
+    cache.set_projects(projects, cache.version)
+    assert sorted(backend.get_prefix("linear:project:")) == ["linear:project:proj-0", "linear:project:proj-1", "linear:project:proj-2"]
+
+    version = cache.version
+    cache.remove_project("proj-1")
+    assert cache.fill_project(projects[1], version) is False
+    assert [p.id for p in cache.get_projects()] == ["proj-0", "proj-2"]
+
+    backend.delete("linear:project:proj-2")
+    assert cache.get_projects() is None
+    assert cache.get_project("proj-0").id == "proj-0"
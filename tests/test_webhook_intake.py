@@ -0,0 +1,117 @@
+import json
+import sqlite3
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.clients.linear import LinearClient
+from app.utils.github import WebhookVerifier
+from app.utils.cache import LinearCache
+from app.utils.intake import read_webhook_body
+from app.utils.webhook_test import SAMPLE_PR_EVENT
+from conftest import SECRET, sign
+
+def make_request(chunks, headers=None) -> Request:
+    messages = [{"type": "http.request", "body": chunk, "more_body": True} for chunk in chunks]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+
+    async def receive():
+        return messages.pop(0)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/github/webhook",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    return Request(scope, receive)
+
+def test_webhook_verifies_raw_body(client):
+    """Test that the signature is checked against the exact bytes received"""
+    body = json.dumps({"zen": "Keep it logically awesome."}, indent=4).encode()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"message": "Event type ping not handled"}
+
+    response = client.post(
+        "/api/github/webhook",
+        content=body + b" ",
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping"}
+    )
+    assert response.status_code == 401
+
+def test_webhook_rejects_oversized_body(client, monkeypatch):
+    """Test that bodies over the configured maximum are rejected with 413"""
+    monkeypatch.setenv("GITHUB_WEBHOOK_MAX_BYTES", "64")
+    body = json.dumps({"padding": "x" * 100}).encode()
+    response = client.post(
+        "/api/github/webhook",
+        content=body,
+        headers={"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping"}
+    )
+    assert response.status_code == 413
+
+@pytest.mark.asyncio
+async def test_stream_is_aborted_without_content_length():
+    """Test that a chunked body is cut off once it crosses the limit"""
+    chunks = [b"x" * 40] * 10
+    with pytest.raises(HTTPException) as exc_info:
+        await read_webhook_body(make_request(chunks), sign(b"".join(chunks)), WebhookVerifier(secrets=[SECRET]), max_bytes=100)
+    assert exc_info.value.status_code == 413
+
+@pytest.mark.asyncio
+async def test_large_body_spills_to_disk():
+    """Test that bodies past the spool threshold are kept in a temporary file"""
+    payload = json.dumps({"commits": ["y" * 50] * 20}).encode()
+    chunks = [payload[i:i + 100] for i in range(0, len(payload), 100)]
+    body = await read_webhook_body(make_request(chunks), sign(payload), WebhookVerifier(secrets=[SECRET]), spool_bytes=256)
+    try:
+        assert body.spilled is True
+        assert body.size == len(payload)
+        assert body.json()["commits"][0] == "y" * 50
+    finally:
+        body.close()
+
+def test_redelivery_is_deduplicated(client):
+    """Test that a delivery id is only processed once"""
+    body = json.dumps({"zen": "Design for failure."}).encode()
+    headers = {"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "ping", "X-GitHub-Delivery": "delivery-dedup-1"}
+    assert client.post("/api/github/webhook", content=body, headers=headers).json()["message"] == "Event type ping not handled"
+    assert client.post("/api/github/webhook", content=body, headers=headers).json()["message"] == "Duplicate delivery ignored"
+
+def test_redelivery_of_failed_linear_update_is_processed(client, monkeypatch):
+    """Test that a delivery whose Linear update failed is not dropped as a duplicate when redelivered"""
+    calls = []
+
+    async def failing_send(self, query, variables, raise_on_errors, is_mutation):
+        calls.append(query)
+        raise ValueError("Linear is down")
+
+    monkeypatch.setattr(LinearClient, "_send_query", failing_send)
+    body = json.dumps(SAMPLE_PR_EVENT).encode()
+    headers = {"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "delivery-dedup-2"}
+    for _ in range(2):
+        response = client.post("/api/github/webhook", content=body, headers=headers)
+        assert response.status_code == 200
+        assert response.json()["message"] == "Pull request event processed"
+    assert len(calls) == 2
+
+def test_redelivery_after_state_backend_error_is_processed(client, monkeypatch):
+    """Test that a delivery whose handler swallowed a state backend error is retried when redelivered"""
+    calls = []
+
+    def locked(self, issue_key):
+        calls.append(issue_key)
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(LinearCache, "project_for_issue_key", locked)
+    body = json.dumps(SAMPLE_PR_EVENT).encode()
+    headers = {"X-Hub-Signature-256": sign(body), "X-GitHub-Event": "pull_request", "X-GitHub-Delivery": "delivery-dedup-3"}
+    for _ in range(2):
+        response = client.post("/api/github/webhook", content=body, headers=headers)
+        assert response.json()["error"] == "database is locked"
+    assert len(calls) == 2